@@ -1,17 +1,34 @@
 import sys
-from flask import Flask, request, redirect, flash, abort, render_template
-import time, logging, os
+from flask import Flask, request, redirect, flash, abort, render_template, before_render_template, template_rendered, g, session, send_from_directory, url_for
+import time, logging, os, mimetypes, hmac
 from mysql_connections.mysql_Root import Root
 from mysql_connections.mysql_view_user import View_User
-from utility_classes.custom_logger import log
+from mysql_connections.catalog_snapshot import CatalogSnapshot
+from mysql_connections.catalog_file import SharedCatalogSnapshot
+from utility_classes.custom_logger import log, start_queued_logging, dropped_records, use_json_logging, request_id_from
+from utility_classes.category_cache import CategoryCache
+from utility_classes.page_cache import PageCache, CachedPage
+from utility_classes.conditional import template_hash, page_etag, last_modified
+from utility_classes.cache_policy import CachePolicy, Policy
+from utility_classes.static_manifest import StaticManifest
+from utility_classes.image_derivatives import DerivativeStore
+from utility_classes.image_backfill import backfill_images_command
+from utility_classes.image_proxy import ProxyCache
+from utility_classes.compression import ENCODINGS, COMPRESSIBLE_TYPES, SUFFIXES, compress, compressed_variants, negotiate, precompress_folder
+from utility_classes.slug import slugify
+from utility_classes import query_tracker, metrics
+from mysql_connections.mysql_pool import pool_stats
 from routes.route_category import category_routes
 from routes.route_project import project_routes
 from routes.route_image import image_routes
+from routes.route_image_derivative import derivative_routes
+from routes.route_image_proxy import proxy_routes
 from routes.route_admin_dashboard import admin_dashboard_routes
 from routes.route_admin_login import auth_routes
 from dotenv import load_dotenv
 from data_classes.category import Category
 from werkzeug.routing import BaseConverter
+from werkzeug.http import is_resource_modified
 
 
 load = load_dotenv(override=True)
@@ -30,18 +47,22 @@ def create_app():
     app.register_blueprint(category_routes, url_prefix='/portfolio')
     app.register_blueprint(project_routes, url_prefix='/portfolio')
     app.register_blueprint(image_routes, url_prefix='/portfolio')
+    app.register_blueprint(derivative_routes, url_prefix='/images')
+    app.register_blueprint(proxy_routes, url_prefix='/media')
     app.register_blueprint(admin_dashboard_routes, url_prefix='/admin')
     app.register_blueprint(auth_routes, url_prefix='/admin' )
 
+    app.cli.add_command(backfill_images_command) #flask --app app backfill-images
+
     return app
 
-class HyphenConverter(BaseConverter): #Converts space characters to hyphens and hymens to spaces in urls.
+class HyphenConverter(BaseConverter): #Converts titles and slugs in urls to slugs, old Title_With_Underscores links still resolve.
     def to_python(self, value):
-        value = value.replace('_', ' ')
+        value = slugify(value)
         return value
     
     def to_url(self, value):
-        value = value.replace(' ', '_')
+        value = slugify(value)
         return value
 
 app = create_app()
@@ -93,6 +114,49 @@ def category_list():
     logger.debug(f"Category list: {cat_list}")
     return (cat_list)
 
+category_cache = CategoryCache(category_list, app.config['CATEGORY_CACHE_TTL'])
+app.extensions['category_cache'] = category_cache #Routes reach the cache through current_app
+
+if app.config['CATALOG_SNAPSHOT_FILE']: #One catalog file per node, mapped by every worker
+    catalog_snapshot = SharedCatalogSnapshot(View_User, app.config['CATALOG_SNAPSHOT_FILE'], app.config['CATALOG_CHECK_INTERVAL'], app.config['CATALOG_MAX_AGE'])
+else:
+    catalog_snapshot = CatalogSnapshot(View_User, app.config['CATALOG_CHECK_INTERVAL'], app.config['CATALOG_MAX_AGE'])
+catalog_snapshot.on_refresh(category_cache.invalidate) #New content means a new nav bar
+app.extensions['catalog_snapshot'] = catalog_snapshot
+
+#Metrics, per worker values are written to METRICS_DIR and added together when /metrics is scraped
+#Nothing is written while /metrics is off, so METRICS_DIR costs nothing until METRICS_ENABLED is set
+if app.config['METRICS_ENABLED']:
+    if not app.config['METRICS_TOKEN']:
+        log("METRICS").warning("/metrics is enabled without METRICS_TOKEN, keep it off the public network")
+    metrics.registry.configure(app.config['METRICS_DIR'], app.config['METRICS_FLUSH_INTERVAL'])
+pool_connections = metrics.registry.gauge("portfolio_db_pool_connections", "Pooled MySQL connections by state.", ("pool", "state"))
+pool_checkouts = metrics.registry.counter("portfolio_db_pool_checkouts_total", "Connection checkouts by whether an idle connection was reused.", ("pool", "result"))
+cache_requests = metrics.registry.counter("portfolio_cache_requests_total", "Cache lookups by cache and result.", ("cache", "result"))
+catalog_loads = metrics.registry.counter("portfolio_catalog_loads_total", "Catalog snapshot reloads from the database.")
+page_cache_bytes = metrics.registry.gauge("portfolio_page_cache_bytes", "Bytes of rendered pages held by the page cache.")
+log_dropped = metrics.registry.counter("portfolio_log_records_dropped_total", "Log records dropped because the log queue was full.")
+
+def collect_metrics(): #Copies the totals kept by the pools and caches into the registry before each snapshot
+    for pool in pool_stats():
+        for state in ("idle", "in_use"):
+            pool_connections.set(pool[state], pool=pool["name"], state=state)
+        pool_checkouts.set(pool["hits"], pool=pool["name"], result="hit")
+        pool_checkouts.set(pool["misses"], pool=pool["name"], result="miss")
+    cache_requests.set(category_cache.hits, cache="category", result="hit")
+    cache_requests.set(category_cache.misses, cache="category", result="miss")
+    cache_requests.set(image_store.hits, cache="image", result="hit")
+    cache_requests.set(image_store.misses, cache="image", result="miss")
+    cache_requests.set(image_proxy.hits, cache="proxy", result="hit")
+    cache_requests.set(image_proxy.misses, cache="proxy", result="miss")
+    cache_requests.set(page_cache.hits, cache="page", result="hit")
+    cache_requests.set(page_cache.misses, cache="page", result="miss")
+    page_cache_bytes.set(page_cache.size)
+    catalog_loads.set(catalog_snapshot.loads)
+    log_dropped.set(dropped_records())
+
+metrics.registry.on_collect(collect_metrics)
+
 with app.app_context():
     logging.basicConfig(
     level=logging.DEBUG,
@@ -101,6 +165,10 @@ with app.app_context():
     ],
     format='%(asctime)s %(levelname)-8s| %(message)s'
 )
+    if app.config['LOG_FORMAT'] == "json": #One JSON object per record for the log pipeline
+        use_json_logging()
+    if app.config['LOG_QUEUE']: #Keeps stdout writes off the request threads
+        start_queued_logging(app.config['LOG_QUEUE_SIZE'], app.config['LOG_QUEUE_POLICY'] == "block", app.config['LOG_QUEUE_BLOCK_TIMEOUT'])
     logger = log("MAIN")
 
     logger.info("---- APP STARTING ----")
@@ -109,29 +177,133 @@ with app.app_context():
     if env != "Test":
         app.logger.debug('NOT IN TEST')
         database_setup()
+        if app.config['CATALOG_SNAPSHOT']:
+            View_User.snapshot = catalog_snapshot #Serves View_User reads from memory
+
+#Public pages are cached and validated by content version, which only exists when the catalog snapshot serves reads
+page_cache = PageCache(app.config['PAGE_CACHE_MAX_BYTES'])
+catalog_snapshot.on_refresh(page_cache.clear)
+app.extensions['page_cache'] = page_cache
+PUBLIC_PAGE_ENDPOINTS = {'category.display_category_projects', 'project.display_project_images', 'image.display_image'}
+static_encodings = precompress_folder(app.static_folder) if app.config['COMPRESS'] else {} #.gz and .br siblings, written once by the preloading master
+static_manifest = StaticManifest(app.static_folder) #Hashed once per deploy, url_for('static') adds ?v=<hash>
+app.url_defaults(static_manifest.url_defaults)
+PAGE_HASH = template_hash(os.path.join(app.root_path, app.template_folder)) + static_manifest.digest #New templates or static files mean new ETags
+
+#Resized copies of the portfolio images for the category grid and project pages, the image page keeps the original
+image_store = DerivativeStore(app.config['IMAGE_STORE_DIR'], None if app.config['IMAGE_DERIVATIVES'] else (), app.config['IMAGE_SOURCE_TIMEOUT'], app.config['IMAGE_SOURCE_MAX_BYTES'], app.config['IMAGE_DERIVATIVE_WORKERS'])
+app.extensions['image_store'] = image_store
+
+#Local copies of the third party hosted images, so pages do not wait on their servers
+image_proxy = ProxyCache(app.config['IMAGE_PROXY_DIR'], app.config['IMAGE_PROXY_MAX_BYTES'] if app.config['IMAGE_PROXY'] else 0, app.config['IMAGE_SOURCE_TIMEOUT'], app.config['IMAGE_SOURCE_MAX_BYTES'])
+app.extensions['image_proxy'] = image_proxy
+
+#Cache-Control per endpoint or blueprint, public pages may be kept by a fronting cache, admin pages never
+cache_policy = CachePolicy(Policy(app.config['CACHE_CONTROL_ERRORS']), Policy(app.config['CACHE_CONTROL_PRIVATE'], ('Cookie',)))
+cache_policy.add(('category', 'project', 'image'), app.config['CACHE_CONTROL_PAGES'], ('Cookie',))
+cache_policy.add(('static',), app.config['CACHE_CONTROL_STATIC'])
+cache_policy.add(('derivative', 'proxy'), app.config['CACHE_CONTROL_STATIC'])
+cache_policy.add(('static:hashed', 'derivative.display_image_derivative:hashed'), app.config['CACHE_CONTROL_STATIC_HASHED']) #URLs carrying the current hash of their content
+cache_policy.add(('dashboard', 'auth', 'admin'), app.config['CACHE_CONTROL_ADMIN'])
+cache_policy.add(('metrics_page',), 'no-store') #Scrapes always read the current totals
+for name, cache_control in app.config['CACHE_CONTROL_RULES'].items(): #Per endpoint or blueprint overrides
+    cache_policy.add((name,), cache_control)
+
+before_render_template.connect(query_tracker.start_render, app) #Times template rendering for Server-Timing
+template_rendered.connect(query_tracker.finish_render, app)
 
 @app.context_processor
 def get_navbar():
     logger.info("Getting categories for nav bar")
-    categories = category_list()
+    categories = category_cache.get()
     return dict(categories = categories)
 
 @app.before_request
 def log_request():
+    g.request_id = request_id_from(request.headers.get('X-Request-ID')) #Ties every log record of the request together
     logger.request(request.method, request.url, request.headers)
     start_time = time.time()
     request.environ["start_time"] = start_time
 
+@app.before_request
+def redirect_to_canonical_url(): #Titles and old Title_With_Underscores links resolve, but each page has one URL and one page cache entry
+    if request.method not in ('GET', 'HEAD') or request.endpoint not in PUBLIC_PAGE_ENDPOINTS:
+        return None
+    canonical = url_for(request.endpoint, **request.view_args)
+    if canonical == request.script_root + request.path:
+        return None
+    query = request.query_string.decode('latin-1')
+    return redirect(f"{canonical}?{query}" if query else canonical, 301)
+
+def content_version():
+    if View_User.snapshot is not catalog_snapshot:
+        return None
+    return catalog_snapshot.get().version
+
+def public_page():
+    if request.method not in ('GET', 'HEAD') or request.endpoint not in PUBLIC_PAGE_ENDPOINTS:
+        return False
+    if session.get('logged_in') or session.get('_flashes'): #Pages for admins or carrying a flash from the last request are rendered fresh
+        return False
+    return True
+
+def sets_cookie(response):
+    #The session cookie is written after the after_request hooks, so a changed session counts as well
+    return 'Set-Cookie' in response.headers or app.session_interface.should_set_cookie(app, session)
+
+@app.before_request
+def serve_cached_page():
+    if not public_page():
+        return None
+    g.public_page = True
+    try:
+        version = content_version()
+    except Exception as e:
+        logger.error(f"Could not read content version, page rendered without cache or validators: {e}")
+        return None
+    if version is None:
+        return None
+
+    etag, modified = g.validators = (page_etag(version, PAGE_HASH, request.path), last_modified(version))
+    if not is_resource_modified(request.environ, etag=etag, last_modified=modified): #The visitor already has this page
+        return app.response_class(status=304)
+
+    if not page_cache.enabled:
+        return None
+    page = page_cache.get(request.path, version)
+    if page is None:
+        g.page_cache_store = (request.path, version) #Rendered at this version, stored by store_cached_page
+        return None
+    g.page_cache_hit = True
+    encoding = negotiate(request.accept_encodings, [encoding for encoding, _ in page.encoded]) if app.config['COMPRESS'] else None
+    if encoding is None:
+        return app.response_class(page.body, status=page.status, headers=list(page.headers))
+    response = app.response_class(dict(page.encoded)[encoding], status=page.status, headers=list(page.headers)) #Compressed when it was stored
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.before_request
+def serve_precompressed_static():
+    if request.endpoint != 'static' or not app.config['COMPRESS']:
+        return None
+    filename = request.view_args.get('filename')
+    encoding = negotiate(request.accept_encodings, static_encodings.get(filename, ()))
+    if encoding is None:
+        return None
+    response = send_from_directory(app.static_folder, filename + SUFFIXES[encoding], mimetype=mimetypes.guess_type(filename)[0])
+    response.headers['Content-Encoding'] = encoding
+    return response
+
 @app.route('/')
 def index():
     logger.visit("Home")
-    categories = category_list()    
+    categories = category_cache.get()
     if len(categories) == 0: #Checks if there is any categories in the database, throws 404 error if not
         app.logger.error("Trying to access categories when none exists")
         flash("No categories exists", "error")
         abort(404)
     main_category = min(categories, key=lambda cat: cat.category_order)
-    url = main_category.category_title
+    url = main_category.category_slug
     logger.redirect(f"/portfolio/{url}")
     return redirect(f'/portfolio/{url}')
 
@@ -148,13 +320,101 @@ def error_route():
     abort(500)
 
 
+@app.route('/metrics')
+def metrics_page():
+    if not app.config['METRICS_ENABLED']:
+        abort(404)
+    token = app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"): #Hidden like a disabled endpoint
+        abort(404)
+    return metrics.registry.render(), 200, {'Content-Type': metrics.CONTENT_TYPE}
+
+
 @app.after_request
 def log_response(response):
     start_time = request.environ.get("start_time", time.time())
     elapsed = time.time() - start_time
-    logger.response(response.status, elapsed)
+    stats = query_tracker.current_stats()
+    logger.response(response.status, elapsed, stats)
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    if app.config['METRICS_ENABLED']:
+        metrics.request_duration.observe(elapsed, endpoint=request.endpoint or "none", status=response.status_code)
+        metrics.registry.flush()
+    if app.config['SERVER_TIMING']:
+        response.headers['Server-Timing'] = stats.server_timing(elapsed)
+    query_tracker.finish_request(request.path, stats)
+    problems = stats.problems(app.config['QUERY_BUDGET'])
+    if problems:
+        if app.config['QUERY_BUDGET_ENFORCE']: #Fails the request in tests so regressions are caught in CI
+            raise query_tracker.QueryBudgetExceeded(f"{request.path}: " + "; ".join(problems))
+        logger.warning(f"Query budget exceeded on {request.path}: " + "; ".join(problems))
+    return response
+
+@app.after_request
+def compress_response(response): #Registered before store_cached_page so it runs after it, pages are cached uncompressed
+    if not app.config['COMPRESS'] or request.endpoint == 'metrics_page':
+        return response
+    if request.endpoint == 'static':
+        if response.status_code in (200, 304) and request.view_args.get('filename') in static_encodings:
+            response.vary.add('Accept-Encoding')
+        return response
+    if response.status_code == 304 and g.get('validators') is not None: #Repeats the Vary and ETag of the page it stands for, pages are always over COMPRESS_MIN_SIZE
+        response.vary.add('Accept-Encoding')
+        if negotiate(request.accept_encodings, ENCODINGS) is None:
+            return response
+    elif response.status_code != 200:
+        return response
+    elif response.content_encoding is None: #Cached pages arrive already compressed
+        if response.direct_passthrough or response.mimetype not in COMPRESSIBLE_TYPES:
+            return response
+        body = response.get_data()
+        if len(body) < app.config['COMPRESS_MIN_SIZE']:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(request.accept_encodings, ENCODINGS)
+        if encoding is None:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True) #The compressed bytes are not the bytes the strong ETag names
+    return response
+
+@app.after_request
+def store_cached_page(response):
+    store = g.pop('page_cache_store', None)
+    if store is not None and response.status_code == 200 and not response.direct_passthrough and not sets_cookie(response):
+        key, version = store
+        body = response.get_data()
+        encoded = compressed_variants(body, app.config['COMPRESS_MIN_SIZE']) if app.config['COMPRESS'] else ()
+        page_cache.put(key, CachedPage(body, response.status_code, (('Content-Type', response.content_type),), version, encoded))
+    if g.get('page_cache_hit'):
+        response.headers['X-Cache'] = 'HIT'
+    elif store is not None:
+        response.headers['X-Cache'] = 'MISS'
+    validators = g.get('validators')
+    if validators is not None and response.status_code in (200, 304):
+        etag, modified = validators
+        response.set_etag(etag)
+        if modified is not None:
+            response.last_modified = modified
     return response
 
+@app.after_request
+def apply_cache_policy(response):
+    endpoint = request.endpoint
+    if endpoint == 'static' and static_manifest.is_current(request.view_args.get('filename'), request.args.get('v')):
+        g.fingerprinted = True
+    if g.get('fingerprinted'):
+        endpoint += ':hashed'
+    shared = endpoint not in PUBLIC_PAGE_ENDPOINTS or g.get('public_page', False) #Public pages rendered for an admin or with a flash stay private
+    if shared and sets_cookie(response): #A shared cache would hand one visitor's cookie to everyone
+        shared = False
+    return cache_policy.apply(response, endpoint, request.blueprint, shared)
+
 @app.errorhandler(404)
 def page_not_found(e):
     # This renders the base template with a custom error message for 404
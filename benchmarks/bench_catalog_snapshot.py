@@ -0,0 +1,132 @@
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("FLASK_ENVIRONMENT", "Test")
+os.environ.setdefault("FLASK_KEY", "benchmark")
+
+import logging
+from app import app
+from mysql_connections.catalog_snapshot import CatalogSnapshot
+from mysql_connections.mysql_view_user import View_User
+
+# Per request latency of the public pages with and without the in memory catalog.
+# MySQL is replaced by a stand in that sleeps for a simulated round trip and answers from sample rows,
+# so the numbers show how many round trips a page costs rather than real query times.
+# Run with: python benchmarks/bench_catalog_snapshot.py [round_trip_ms] [requests]
+
+CATEGORIES = [
+    {"category_id": i, "category_title": f"Category {i}", "category_order": i, "category_slug": f"category-{i}"}
+    for i in range(1, 4)
+]
+PROJECTS = [
+    {
+        "project_id": i,
+        "project_title": f"Project {i}",
+        "project_slug": f"project-{i}",
+        "project_date": f"2024-01-{i:02d}",
+        "project_desc": "desc",
+        "category_id": (i % 3) + 1,
+        "project_image_id": i * 5,
+    }
+    for i in range(1, 13)
+]
+IMAGES = [
+    {
+        "image_id": i,
+        "image_title": f"Image {i}",
+        "image_desc": None,
+        "image_URL": f"https://example.com/{i}.webp",
+        "image_weight": i % 5,
+        "project_id": (i - 1) // 5 + 1,
+    }
+    for i in range(1, 61)
+]
+
+
+def fake_db(round_trip):
+    """Returns fetch_all/fetch_one stand ins that sleep for round_trip seconds per query."""
+
+    def fetch_all(self, query, args=None):
+        time.sleep(round_trip)
+        if "VV.site_meta" in query:
+            return [{"meta_data": "1", "last_updated": "now"}]
+        if "LEFT JOIN `VV.image` AS image ON image.project_id" in query:
+            category = next(c for c in CATEGORIES if c["category_slug"] == args[0])
+            project = next(p for p in PROJECTS if p["project_slug"] == args[1])
+            return [
+                {**project, **category, **image}
+                for image in sorted(IMAGES, key=lambda i: i["image_weight"])
+                if image["project_id"] == project["project_id"]
+            ]
+        if "category_slug = %s" in query:
+            return [c for c in CATEGORIES if c["category_slug"] == args[0]] or None
+        if "left join `VV.image`" in query:
+            return [
+                {**p, **next(i for i in IMAGES if i["image_id"] == p["project_image_id"])}
+                for p in PROJECTS
+                if p["category_id"] == args[0]
+            ]
+        if "WHERE image_id" in query:
+            return [i for i in IMAGES if i["image_id"] == int(args[0])] or None
+        if "VV.category" in query:
+            return CATEGORIES
+        if "VV.project" in query:
+            return PROJECTS
+        return IMAGES
+
+    def fetch_one(self, query, args=None):
+        results = fetch_all(self, query, args)
+        return results[0] if results else None
+
+    return fetch_all, fetch_one
+
+
+def run(paths, requests):
+    client = app.test_client()
+    timings = []
+    for _ in range(requests):
+        for path in paths:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):  # Routes print debug output
+                response = client.get(path)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200, (path, response.status_code)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    print(
+        f"{name:<10} mean {statistics.mean(timings) * 1000:7.3f}ms  "
+        f"p50 {timings[len(timings) // 2] * 1000:7.3f}ms  "
+        f"p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    round_trip = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.001
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    logging.disable(logging.CRITICAL)
+    paths = [
+        "/portfolio/category-2",
+        "/portfolio/category-2/project-1",
+        "/portfolio/category-2/project-1/image_id_3",
+    ]
+    fetch_all, fetch_one = fake_db(round_trip)
+
+    print(f"Simulated round trip {round_trip * 1000:.1f}ms, {requests} requests per page")
+    with patch.object(View_User, "fetch_all", fetch_all), patch.object(
+        View_User, "fetch_one", fetch_one
+    ):
+        report("database", run(paths, requests))
+
+        snapshot = CatalogSnapshot(View_User, check_interval=5, max_age=300)
+        with patch.object(View_User, "snapshot", snapshot):
+            snapshot.get()  # Loaded once at startup
+            report("snapshot", run(paths, requests))
@@ -0,0 +1,63 @@
+import os
+import sys
+import tracemalloc
+from dataclasses import MISSING, field, fields, make_dataclass
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("FLASK_ENVIRONMENT", "Test")
+os.environ.setdefault("FLASK_KEY", "benchmark")
+
+from data_classes.category import Category
+from data_classes.image import Image
+from data_classes.project import Project
+
+# Memory held by catalog objects, the slotted frozen data classes against plain ones with a __dict__ per instance.
+# The plain classes are rebuilt from the same fields so both sides hold identical values.
+# Run with: python benchmarks/bench_dataclass_memory.py [objects]
+
+
+def plain(data_class):
+    """The same fields as a regular @dataclass, the way the data classes were before."""
+    return make_dataclass(
+        f"Plain{data_class.__name__}",
+        [
+            (f.name, f.type, field(default=f.default) if f.default is not MISSING else field())
+            for f in fields(data_class)
+        ],
+    )
+
+
+def build(count, category_class, image_class, project_class):
+    objects = []
+    for i in range(count):
+        image = image_class(image_weight=i % 5, project_id=i, image_id=i, image_title=f"Image {i}", image_url=f"https://example.com/{i}.webp")
+        objects.append(
+            project_class(
+                project_title=f"Project {i}",
+                project_image=image,
+                project_image_id=i,
+                project_id=i,
+                category_id=i % 5,
+                project_slug=f"project-{i}",
+            )
+        )
+        objects.append(category_class(category_title=f"Category {i}", category_id=i, category_order=i, category_slug=f"category-{i}"))
+    return objects
+
+
+def measure(count, *classes):
+    tracemalloc.start()
+    objects = build(count, *classes)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    before = measure(count, plain(Category), plain(Image), plain(Project))
+    after = measure(count, Category, Image, Project)
+    print(f"{count} projects, images and categories ({count * 3} objects)")
+    print(f"plain    {before / 1024 / 1024:7.1f}MB  {before / (count * 3):6.0f}B per object")
+    print(f"slotted  {after / 1024 / 1024:7.1f}MB  {after / (count * 3):6.0f}B per object  saved {(1 - after / before) * 100:4.1f}%")
@@ -0,0 +1,88 @@
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("FLASK_ENVIRONMENT", "Test")
+os.environ.setdefault("FLASK_KEY", "benchmark")
+
+from app import app
+from data_classes.category import Category
+from data_classes.image import Image
+from data_classes.project import Project
+
+# Time to turn a result set into data classes, one from_dict call per row against one from_rows call.
+# Run with: python benchmarks/bench_from_rows.py [rows] [repeats]
+
+
+def project_rows(count):
+    return [
+        {
+            "project_id": i,
+            "project_title": f"Project {i}",
+            "project_slug": f"project-{i}",
+            "project_date": "2024-01-01",
+            "project_desc": "A description long enough to look like a real one.",
+            "category_id": i % 5 + 1,
+            "project_image_id": i,
+            "image_id": i,
+            "image_title": f"Image {i}",
+            "image_desc": None,
+            "image_URL": f"https://example.com/{i}.webp",
+            "image_weight": 0,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def image_rows(count):
+    return [
+        {
+            "image_id": i,
+            "image_title": f"Image {i}",
+            "image_desc": None,
+            "image_URL": f"https://example.com/{i}.webp",
+            "image_weight": i % 5,
+            "project_id": i // 5 + 1,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def category_rows(count):
+    return [
+        {"category_id": i, "category_title": f"Category {i}", "category_order": i, "category_slug": f"category-{i}"}
+        for i in range(1, count + 1)
+    ]
+
+
+def best_of(repeats, build):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        build()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    logging.getLogger().handlers = [logging.StreamHandler(io.StringIO())]
+    app.logger.setLevel(logging.INFO)
+
+    print(f"{count} rows, best of {repeats} at INFO")
+    with app.app_context():
+        for data_class, rows in (
+            (Project, project_rows(count)),
+            (Image, image_rows(count)),
+            (Category, category_rows(count)),
+        ):
+            per_row = best_of(repeats, lambda: [data_class.from_dict(row) for row in rows])
+            bulk = best_of(repeats, lambda: data_class.from_rows(rows))
+            print(
+                f"{data_class.__name__:<9} from_dict {per_row * 1000:7.2f}ms  "
+                f"from_rows {bulk * 1000:7.2f}ms  {per_row / bulk:4.1f}x"
+            )
@@ -0,0 +1,101 @@
+import contextlib
+import io
+import logging
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("FLASK_ENVIRONMENT", "Test")
+os.environ.setdefault("FLASK_KEY", "benchmark")
+
+from app import app
+from data_classes.project import Project
+from mysql_connections.mysql_view_user import View_User
+from utility_classes.custom_logger import log
+
+# Cost of logging at INFO with lazy formatting against formatting every message up front, the way log used to.
+# Per row: Project.from_dict, which logs each row twice at DEBUG. Per request: a category page with 12 projects.
+# MySQL is replaced by a stand in that answers instantly, so the difference is all logging.
+# Run with: python benchmarks/bench_logging.py [rows] [requests]
+
+ROWS = [
+    {
+        "project_id": i,
+        "project_title": f"Project {i}",
+        "project_slug": f"project-{i}",
+        "project_date": f"2024-01-{i % 28 + 1:02d}",
+        "project_desc": "A description long enough to look like a real one. " * 3,
+        "category_id": 2,
+        "project_image_id": i,
+        "image_id": i,
+        "image_title": f"Image {i}",
+        "image_desc": None,
+        "image_URL": f"https://example.com/{i}.webp",
+        "image_weight": 0,
+        "project_id_image": i,
+    }
+    for i in range(1, 13)
+]
+CATEGORY = [{"category_id": 2, "category_title": "Design", "category_order": 1, "category_slug": "design"}]
+
+
+def eager_log(self, level, message, args):
+    """The old behaviour, every message is built before the level is checked."""
+    if callable(message):
+        message = message()
+    elif args:
+        message = message % args
+    if self.logger.isEnabledFor(level):
+        self.logger.log(level, f"{self.tag} {message}")
+
+
+def fetch_all(self, query, args=None):
+    self.logger.query(query, args, CATEGORY if "category_slug" in query else ROWS)
+    return CATEGORY if "category_slug" in query else ROWS
+
+
+def per_row(rows):
+    with app.app_context():
+        start = time.perf_counter()
+        for i in range(rows):
+            Project.from_dict(ROWS[i % len(ROWS)])
+        return (time.perf_counter() - start) / rows
+
+
+def per_request(requests):
+    client = app.test_client()
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # Routes print debug output
+            response = client.get("/portfolio/design", headers={"User-Agent": "bench", "Accept": "text/html"})
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    return statistics.mean(timings)
+
+
+def report(name, lazy, eager, unit, unit_name):
+    print(
+        f"{name:<12} eager {eager * unit:8.2f}{unit_name}  lazy {lazy * unit:8.2f}{unit_name}  "
+        f"saved {(1 - lazy / eager) * 100:5.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    logging.getLogger().handlers = [logging.StreamHandler(io.StringIO())]  # Emitted INFO records still pay for a handler
+    app.logger.setLevel(logging.INFO)
+    app.config["QUERY_BUDGET_ENFORCE"] = False
+
+    with patch.object(View_User, "fetch_all", fetch_all):
+        lazy_row, lazy_request = per_row(rows), per_request(requests)
+        with patch.object(log, "_log", eager_log):
+            eager_row, eager_request = per_row(rows), per_request(requests)
+
+    print(f"INFO level, {rows} rows, {requests} requests")
+    report("per row", lazy_row, eager_row, 1_000_000, "us")
+    report("per request", lazy_request, eager_request, 1000, "ms")
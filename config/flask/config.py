@@ -1,3 +1,4 @@
+import json
 import os
 from os import environ, path
 from dotenv import load_dotenv
@@ -14,6 +15,57 @@ class Config:
     FLASK_ENVIRONMENT = os.getenv("FLASK_ENVIRONMENT")
     DEBUG = FLASK_ENVIRONMENT == 'development'
 
+    #Logging
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower() #text or json
+    LOG_QUEUE = os.getenv("LOG_QUEUE", str(FLASK_ENVIRONMENT != "Test")).lower() == "true"
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "drop").lower() #drop or block
+    LOG_QUEUE_BLOCK_TIMEOUT = float(os.getenv("LOG_QUEUE_BLOCK_TIMEOUT", 1))
+
+    #Caching
+    CATEGORY_CACHE_TTL = float(os.getenv("CATEGORY_CACHE_TTL", 60))
+    CATALOG_SNAPSHOT = os.getenv("CATALOG_SNAPSHOT", "true").lower() == "true"
+    CATALOG_CHECK_INTERVAL = float(os.getenv("CATALOG_CHECK_INTERVAL", 5))
+    CATALOG_MAX_AGE = float(os.getenv("CATALOG_MAX_AGE", 300))
+    CATALOG_SNAPSHOT_FILE = os.getenv("CATALOG_SNAPSHOT_FILE")
+    PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", 32 * 1024 * 1024)) #0 disables the full page cache
+
+    #Compression
+    COMPRESS = os.getenv("COMPRESS", "true").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 500)) #Smaller bodies are sent uncompressed
+
+    #Image derivatives
+    IMAGE_DERIVATIVES = os.getenv("IMAGE_DERIVATIVES", "true").lower() == "true"
+    IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "/tmp/portfolio_images")
+    IMAGE_SOURCE_TIMEOUT = float(os.getenv("IMAGE_SOURCE_TIMEOUT", 10))
+    IMAGE_SOURCE_MAX_BYTES = int(os.getenv("IMAGE_SOURCE_MAX_BYTES", 20 * 1024 * 1024))
+    IMAGE_DERIVATIVE_WORKERS = int(os.getenv("IMAGE_DERIVATIVE_WORKERS", 1)) #Background resize threads per gunicorn worker
+
+    #Image proxy
+    IMAGE_PROXY = os.getenv("IMAGE_PROXY", "true").lower() == "true"
+    IMAGE_PROXY_DIR = os.getenv("IMAGE_PROXY_DIR", "/tmp/portfolio_proxy")
+    IMAGE_PROXY_MAX_BYTES = int(os.getenv("IMAGE_PROXY_MAX_BYTES", 256 * 1024 * 1024)) #Least recently served images are evicted past this
+
+    #Cache-Control headers
+    CACHE_CONTROL_PAGES = os.getenv("CACHE_CONTROL_PAGES", "public, max-age=60, stale-while-revalidate=600")
+    CACHE_CONTROL_STATIC = os.getenv("CACHE_CONTROL_STATIC", "public, max-age=86400")
+    CACHE_CONTROL_STATIC_HASHED = os.getenv("CACHE_CONTROL_STATIC_HASHED", "public, max-age=31536000, immutable")
+    CACHE_CONTROL_ADMIN = os.getenv("CACHE_CONTROL_ADMIN", "no-store")
+    CACHE_CONTROL_ERRORS = os.getenv("CACHE_CONTROL_ERRORS", "no-store")
+    CACHE_CONTROL_PRIVATE = os.getenv("CACHE_CONTROL_PRIVATE", "private, no-cache")
+    CACHE_CONTROL_RULES = json.loads(os.getenv("CACHE_CONTROL_RULES", "{}")) #{"endpoint or blueprint": "Cache-Control value"}
+
+    #Query budget and timing
+    QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", 10))
+    QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", str(FLASK_ENVIRONMENT == "Test")).lower() == "true"
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+    #Metrics
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN") #When set, scrapes must send Authorization: Bearer <token>
+    METRICS_DIR = os.getenv("METRICS_DIR")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 1))
+
     #Sever Connection
     MYSQL_HOST = os.getenv("MYSQL_HOST")
     MYSQL_PORT = os.getenv("MYSQL_PORT")
@@ -2,27 +2,41 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 from utility_classes.custom_logger import log
+from utility_classes.slug import slugify
+from data_classes.rows import FromRows
 
 # Data class that represents the columns from the category table.
 
 
-@dataclass
-class Category:
+@dataclass(slots=True, frozen=True)
+class Category(FromRows):
     category_title: str
     category_id: Optional[int] = None
     category_order: Optional[int] = None
+    category_slug: Optional[str] = None
+
+    def __post_init__(self):
+        if self.category_slug is None:  # Rows without a slug column and new categories
+            object.__setattr__(self, "category_slug", slugify(self.category_title))
+
+    @classmethod
+    def _from_row(cls, data: Dict[str, Any]) -> "Category":
+        return cls(
+            category_id=int(data["category_id"]),
+            category_title=str(data["category_title"]),
+            category_order=int(data["category_order"]),
+            category_slug=(
+                str(data["category_slug"]) if data.get("category_slug") else None
+            ),
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Category":
         logger = log("DATA")
-        logger.debug(f"Attempting to create Category: {data}")
+        logger.debug("Attempting to create Category: %s", data)
         try:
-            category = cls(
-                category_id=int(data["category_id"]),
-                category_title=str(data["category_title"]),
-                category_order=int(data["category_order"]),
-            )
-            logger.debug(f"Successfully created Category: {category}")
+            category = cls._from_row(data)
+            logger.debug("Successfully created Category: %s", category)
             return category
         except KeyError as e:
             logger.error(
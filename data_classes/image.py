@@ -1,12 +1,25 @@
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 from utility_classes.custom_logger import log
+from data_classes.rows import FromRows
 
 # Data class that represents the columns from the image table.
 
 
-@dataclass
-class Image:
+def _measurements(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reads the measured columns of a row, each None when it has not been measured or the query left it out."""
+    measured = {}
+    for key in ("image_width", "image_height", "image_bytes"):
+        value = data.get(key)
+        measured[key] = None if value is None else int(value)
+    for key in ("image_color", "image_placeholder"):
+        value = data.get(key)
+        measured[key] = None if value is None else str(value)
+    return measured
+
+
+@dataclass(slots=True, frozen=True)
+class Image(FromRows):
     image_weight: int
     project_id: int
     image_id: Optional[int] = None
@@ -15,21 +28,62 @@ class Image:
     image_url: str = (
         "https://static.wixstatic.com/media/0fee66_18f00ad0221142dfbd4c21f7e54d425f~mv2.png/v1/fill/w_549,h_289,al_c,q_85,usm_0.66_1.00_0.01,enc_avif,quality_auto/Kelsey_Spade_Header.png"
     )
+    # Measured from the original when it is first resized, None until then
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_color: Optional[str] = None
+    image_bytes: Optional[int] = None
+    image_placeholder: Optional[str] = None  # Tiny blurry copy as a data URI
+
+    @property
+    def orientation(self) -> str:
+        """Grid tile class of the image, the same wide/tall/big rules scripts.js applies once an image loads.
+        Empty when the size is unknown or the image is too small to span extra cells.
+        """
+        width, height = self.image_width, self.image_height
+        if width is None or height is None:
+            return ""
+        if width > height and width > 600:
+            return "wide"
+        if height > width and height > 600:
+            return "tall"
+        if height == width and height > 600:
+            return "big"
+        return ""
+
+    @classmethod
+    def _from_row(cls, data: Dict[str, Any]) -> "Image":
+        return cls(
+            image_id=int(data["image_id"]),
+            image_title=str(data["image_title"]),
+            image_desc=str(data["image_desc"]),
+            image_url=str(data["image_URL"]),
+            image_weight=int(data["image_weight"]),
+            project_id=int(data["project_id"]),
+            **_measurements(data),
+        )
+
+    @classmethod
+    def _from_project_row(cls, data: Dict[str, Any]) -> "Image":
+        if data.get("project_image_id") is None:
+            return cls(project_id=int(data["project_id"]), image_weight=0)
+        return cls(
+            image_id=int(data["project_image_id"]),
+            image_title=str(data.get("image_title")),
+            image_desc=str(data.get("image_desc")),
+            image_url=str(data.get("image_URL")),
+            image_weight=int(data.get("image_weight", 0)),
+            project_id=int(data["project_id"]),
+            **_measurements(data),
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Image":
         logger = log("DATA")
-        logger.debug(f"Attempting to create Image: {data}")
+        logger.debug("Attempting to create Image: %s", data)
         try:
-            image = cls(
-                image_id=int(data["image_id"]),
-                image_title=str(data["image_title"]),
-                image_desc=str(data["image_desc"]),
-                image_url=str(data["image_URL"]),
-                image_weight=int(data["image_weight"]),
-                project_id=int(data["project_id"]),
-            )
-            logger.debug(f"Successfully created Image: {image}")
+            image = cls._from_row(data)
+            logger.debug("Successfully created Image: %s", image)
             return image
         except KeyError as e:
             logger.error(
@@ -48,21 +102,12 @@ class Image:
     @classmethod
     def from_project_dict(cls, data: Dict[str, Any]) -> "Image":
         logger = log("DATA")
-        logger.debug(f"Attempting to create Image from Project data: {data}")
+        logger.debug("Attempting to create Image from Project data: %s", data)
         try:
             if data.get("project_image_id") is None:
                 logger.debug("Creating 'Null' project image with weight 0")
-                return cls(project_id=int(data["project_id"]), image_weight=0)
-
-            image = cls(
-                image_id=int(data["project_image_id"]),
-                image_title=str(data.get("image_title")),
-                image_desc=str(data.get("image_desc")),
-                image_url=str(data.get("image_URL")),
-                image_weight=int(data.get("image_weight", 0)),
-                project_id=int(data["project_id"]),
-            )
-            logger.debug(f"Successfully created Image from Project data: {image}")
+            image = cls._from_project_row(data)
+            logger.debug("Successfully created Image from Project data: %s", image)
             return image
 
         except KeyError as e:
@@ -3,13 +3,15 @@ from datetime import date
 from typing import Any, Dict, Optional
 
 from utility_classes.custom_logger import log
+from utility_classes.slug import slugify
 from data_classes.image import Image
+from data_classes.rows import FromRows
 
 # Data class that represents the columns from the project table.
 
 
-@dataclass
-class Project:
+@dataclass(slots=True, frozen=True)
+class Project(FromRows):
     project_title: str
     project_image: Optional[Image] = None
     project_image_id: Optional[int] = None
@@ -17,32 +19,44 @@ class Project:
     project_id: Optional[int] = None
     project_desc: Optional[str] = None
     category_id: Optional[int] = None
+    project_slug: Optional[str] = None
+
+    def __post_init__(self):
+        if self.project_slug is None:  # Rows without a slug column and new projects
+            object.__setattr__(self, "project_slug", slugify(self.project_title))
+
+    @classmethod
+    def _from_row(cls, data: Dict[str, Any], project_image: Optional[Image] = None) -> "Project":
+        if project_image is None and "image_URL" in data:  # Only create Image if related data exists
+            project_image = Image._from_project_row(data)
+        return cls(
+            project_title=str(data["project_title"]),
+            project_date=str(data["project_date"]),
+            project_desc=str(data["project_desc"]),
+            project_id=int(data["project_id"]),
+            project_image_id=(
+                int(data["project_image_id"]) if data.get("project_image_id") else None
+            ),
+            category_id=int(data["category_id"]),
+            project_image=project_image,
+            project_slug=(
+                str(data["project_slug"]) if data.get("project_slug") else None
+            ),
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Project":
         logger = log("DATA")
-        logger.debug(f"Attempting to create Project: {data}")
+        logger.debug("Attempting to create Project: %s", data)
         try:
             # Handle optional image creation
             project_image = None
             if "image_URL" in data:  # Only create Image if related data exists
                 project_image = Image.from_project_dict(data)
 
-            project = cls(
-                project_title=str(data["project_title"]),
-                project_date=str(data["project_date"]),
-                project_desc=str(data["project_desc"]),
-                project_id=int(data["project_id"]),
-                project_image_id=(
-                    int(data["project_image_id"])
-                    if data.get("project_image_id")
-                    else None
-                ),
-                category_id=int(data["category_id"]),
-                project_image=project_image,
-            )
+            project = cls._from_row(data, project_image)
 
-            logger.debug(f"Successfully created Project: {project}")
+            logger.debug("Successfully created Project: %s", project)
             return project
 
         except KeyError as e:
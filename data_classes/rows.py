@@ -0,0 +1,43 @@
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from utility_classes.custom_logger import log
+
+# Bulk row mapping shared by the data classes.
+
+
+class FromRows:
+    """Adds from_rows to a data class that defines from_dict and _from_row, the plain conversion of one row."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Optional[Iterable[Dict[str, Any]]],
+        on_error: Optional[Callable[[Dict[str, Any], Exception], None]] = None,
+    ) -> list:
+        """Builds objects from a whole result set with one logger and no per row messages.
+        A row that fails to convert is run through from_dict, so it is logged and raised exactly as before.
+
+        :param rows: Rows from fetch_all, None is treated as no rows.
+        :type rows: Iterable[Dict[str, Any]] or None
+        :param on_error: Called with the row and error for each row that can not be converted, the row is then skipped.
+            If None the error is raised.
+        :type on_error: Callable[[Dict[str, Any], Exception], None] or None
+        :return: An object for every row that converted, in row order.
+        :rtype: list
+        """
+        objects = []
+        from_row = cls._from_row
+        for row in rows or ():
+            try:
+                objects.append(from_row(row))
+            except Exception:
+                try:
+                    objects.append(cls.from_dict(row))
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(row, e)
+        log("DATA").debug("Created %s %s objects from rows", len(objects), cls.__name__)
+        return objects
@@ -3,28 +3,33 @@ from typing import Optional, Any, Dict
 from datetime import date
 from werkzeug.security import generate_password_hash
 from utility_classes.custom_logger import log
+from data_classes.rows import FromRows
 
 # Data class that represents the columns from the category table.
 
 
 @dataclass
-class User:
+class User(FromRows):
     user_id: int
     user_name: str
     user_password: str
     user_created_date: Optional[date] = None
 
+    @classmethod
+    def _from_row(cls, data: Dict[str, Any]) -> "User":
+        return cls(
+            user_id=int(data["user_id"]),
+            user_name=str(data["user_name"]),
+            user_password=str(data["user_password"]),
+        )
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "User":
         logger = log("DATA")
         logger.debug("Attempting to create User")
         try:
-            user = cls(
-                user_id=int(data["user_id"]),
-                user_name=str(data["user_name"]),
-                user_password=str(data["user_password"]),
-            )
-            logger.debug(f"Successfully created user: {user.user_name}")
+            user = cls._from_row(data)
+            logger.debug("Successfully created user: %s", user.user_name)
             return user
 
         except KeyError as e:
@@ -0,0 +1,472 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Optional, Tuple
+from data_classes.category import Category
+from data_classes.image import Image
+from data_classes.project import Project
+from mysql_connections.catalog_snapshot import Catalog, CatalogSnapshot
+from utility_classes.slug import slugify
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines, refreshes still work but are not coordinated between workers
+    fcntl = None
+
+# Binary catalog file shared by every gunicorn worker on a node.
+# One worker loads the catalog from MySQL and writes it to a temp file that is renamed over the old one.
+# Every worker maps the file read only and reads records straight out of the mapping,
+# so memory stays flat as workers are added and a refresh costs one database load per node.
+#
+# Layout (little endian):
+#   header    magic, written_at, category/project/image counts, version length
+#   version   JSON encoded version marker
+#   records   fixed size category, project and image records sorted by id
+#   indexes   uint32 record numbers sorted for each lookup
+#   strings   UTF-8 string heap, records hold (offset, length) pairs into it
+
+MAGIC = b"KSCAT004"
+HEADER = struct.Struct("<8sdIIII")
+CATEGORY = struct.Struct("<iiIIII")  # id, order, title, slug
+PROJECT = struct.Struct("<iiiIIIIIIII")  # id, category id, image id, title, slug, date, desc
+IMAGE = struct.Struct("<iiiiiiIIIIIIIIII")  # id, project id, weight, width, height, bytes, title, desc, url, color, placeholder
+INDEX = struct.Struct("<I")
+NULL_ID = -1
+NULL_LENGTH = 0xFFFFFFFF
+
+
+class CatalogFileError(Exception):
+    """Raised when a catalog file is missing, truncated or from another format version."""
+
+
+class _StringHeap:
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets: dict[str, int] = {}
+
+    def add(self, value) -> Tuple[int, int]:
+        if value is None:
+            return (0, NULL_LENGTH)
+        value = str(value)
+        encoded = value.encode("utf-8")
+        offset = self.offsets.get(value)
+        if offset is None:  # Dates and descriptions repeat across projects, store them once
+            offset = len(self.data)
+            self.offsets[value] = offset
+            self.data += encoded
+        return (offset, len(encoded))
+
+
+def _nullable_id(value) -> int:
+    return NULL_ID if value is None else int(value)
+
+
+def write_catalog_file(path: str, catalog: Catalog):
+    """Serializes a catalog and atomically replaces the file at path with it.
+
+    :param path: Location of the shared catalog file.
+    :type path: str
+    :param catalog: Catalog to write.
+    :type catalog: Catalog
+    """
+    strings = _StringHeap()
+    categories = catalog.categories
+    projects = catalog.projects
+    images = catalog.images
+
+    records = bytearray()
+    for category in categories:
+        records += CATEGORY.pack(
+            category.category_id,
+            _nullable_id(category.category_order),
+            *strings.add(category.category_title),
+            *strings.add(category.category_slug),
+        )
+    for project in projects:
+        records += PROJECT.pack(
+            project.project_id,
+            project.category_id,
+            _nullable_id(project.project_image_id),
+            *strings.add(project.project_title),
+            *strings.add(project.project_slug),
+            *strings.add(project.project_date),
+            *strings.add(project.project_desc),
+        )
+    for image in images:
+        records += IMAGE.pack(
+            image.image_id,
+            image.project_id,
+            image.image_weight,
+            _nullable_id(image.image_width),
+            _nullable_id(image.image_height),
+            _nullable_id(image.image_bytes),
+            *strings.add(image.image_title),
+            *strings.add(image.image_desc),
+            *strings.add(image.image_url),
+            *strings.add(image.image_color),
+            *strings.add(image.image_placeholder),
+        )
+
+    category_row = {category.category_id: row for row, category in enumerate(categories)}
+    project_row = {project.project_id: row for row, project in enumerate(projects)}
+    image_row = {image.image_id: row for row, image in enumerate(images)}
+    indexes = [
+        [category_row[c.category_id] for c in catalog.categories_ordered],
+        sorted(range(len(categories)), key=lambda row: (categories[row].category_slug, row)),
+        sorted(range(len(projects)), key=lambda row: (projects[row].category_id, row)),
+        [
+            project_row[p.project_id]
+            for category_id in sorted(catalog.projects_by_category_dated)
+            for p in catalog.projects_by_category_dated[category_id]
+        ],
+        sorted(
+            range(len(projects)),
+            key=lambda row: (projects[row].category_id, projects[row].project_slug, row),
+        ),
+        [
+            image_row[i.image_id]
+            for project_id in sorted(catalog.images_by_project)
+            for i in catalog.images_by_project[project_id]
+        ],
+    ]
+
+    version = json.dumps(catalog.version).encode("utf-8")
+    body = bytearray(
+        HEADER.pack(MAGIC, time.time(), len(categories), len(projects), len(images), len(version))
+    )
+    body += version
+    body += records
+    for index in indexes:
+        for row in index:
+            body += INDEX.pack(row)
+    body += strings.data
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(body)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)  # Readers see either the old or the new file, never half of one
+
+
+class MappedCatalog:
+    """Read only Catalog backed by a memory mapped catalog file.
+    Lookup methods mirror Catalog and build data class objects on demand."""
+
+    def __init__(self, path: str):
+        """Maps the catalog file at path.
+
+        :param path: Location of the shared catalog file.
+        :type path: str
+        :raises CatalogFileError: If the file is not a valid catalog file.
+        :raises OSError: If the file can not be opened.
+        """
+        with open(path, "rb") as file:
+            self.inode = os.fstat(file.fileno()).st_ino
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            raise CatalogFileError(f"Catalog file '{path}' is truncated")
+        magic, self.written_at, n_categories, n_projects, n_images, version_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise CatalogFileError(f"Catalog file '{path}' has unknown format {magic!r}")
+
+        offset = HEADER.size
+        version = json.loads(self._map[offset : offset + version_length])
+        self.version = tuple(version) if isinstance(version, list) else version
+        offset += version_length
+
+        self.n_categories, self.n_projects, self.n_images = n_categories, n_projects, n_images
+        self._categories = offset
+        self._projects = self._categories + n_categories * CATEGORY.size
+        self._images = self._projects + n_projects * PROJECT.size
+        offset = self._images + n_images * IMAGE.size
+        self._index = {}
+        for name, count in (
+            ("categories_ordered", n_categories),
+            ("category_by_slug", n_categories),
+            ("projects_by_category", n_projects),
+            ("projects_by_category_dated", n_projects),
+            ("project_by_slug", n_projects),
+            ("images_by_project", n_images),
+        ):
+            self._index[name] = (offset, count)
+            offset += count * INDEX.size
+        self._strings = offset
+        if len(self._map) < self._strings:
+            raise CatalogFileError(f"Catalog file '{path}' is truncated")
+
+    # ---- Raw record access ----
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == NULL_LENGTH:
+            return None
+        start = self._strings + offset
+        return self._map[start : start + length].decode("utf-8")
+
+    def _row(self, index: str, position: int) -> int:
+        offset, _ = self._index[index]
+        return INDEX.unpack_from(self._map, offset + position * INDEX.size)[0]
+
+    def _rows(self, index: str, start: int = 0, stop: Optional[int] = None) -> list[int]:
+        offset, count = self._index[index]
+        stop = count if stop is None else stop
+        return [row for (row,) in struct.iter_unpack("<I", self._map[offset + start * INDEX.size : offset + stop * INDEX.size])]
+
+    def _category_record(self, row: int):
+        return CATEGORY.unpack_from(self._map, self._categories + row * CATEGORY.size)
+
+    def _project_record(self, row: int):
+        return PROJECT.unpack_from(self._map, self._projects + row * PROJECT.size)
+
+    def _image_record(self, row: int):
+        return IMAGE.unpack_from(self._map, self._images + row * IMAGE.size)
+
+    def _find_id(self, record, count: int, id: int) -> Optional[int]:
+        row = bisect.bisect_left(range(count), id, key=lambda row: record(row)[0])
+        if row < count and record(row)[0] == id:
+            return row
+        return None
+
+    def _range(self, index: str, key, low, high) -> Tuple[int, int]:
+        _, count = self._index[index]
+        positions = range(count)
+        start = bisect.bisect_left(positions, low, key=lambda position: key(self._row(index, position)))
+        stop = bisect.bisect_right(positions, high, key=lambda position: key(self._row(index, position)))
+        return start, stop
+
+    # ---- Object construction ----
+
+    def _category(self, row: int) -> Category:
+        id, order, title_offset, title_length, slug_offset, slug_length = self._category_record(row)
+        return Category(
+            category_title=self._string(title_offset, title_length),
+            category_id=id,
+            category_order=None if order == NULL_ID else order,
+            category_slug=self._string(slug_offset, slug_length),
+        )
+
+    def _image(self, row: int) -> Image:
+        id, project_id, weight, width, height, size, *strings = self._image_record(row)
+        return Image(
+            image_weight=weight,
+            project_id=project_id,
+            image_id=id,
+            image_title=self._string(strings[0], strings[1]),
+            image_desc=self._string(strings[2], strings[3]),
+            image_url=self._string(strings[4], strings[5]),
+            image_width=None if width == NULL_ID else width,
+            image_height=None if height == NULL_ID else height,
+            image_bytes=None if size == NULL_ID else size,
+            image_color=self._string(strings[6], strings[7]),
+            image_placeholder=self._string(strings[8], strings[9]),
+        )
+
+    def _project(self, row: int) -> Project:
+        id, category_id, image_id, *strings = self._project_record(row)
+        project_image = None
+        if image_id != NULL_ID:
+            project_image = self.get_image(image_id)
+        return Project(
+            project_title=self._string(strings[0], strings[1]),
+            project_image=project_image or Image(project_id=id, image_weight=0),
+            project_image_id=None if image_id == NULL_ID else image_id,
+            project_date=self._string(strings[4], strings[5]),
+            project_id=id,
+            project_desc=self._string(strings[6], strings[7]),
+            category_id=category_id,
+            project_slug=self._string(strings[2], strings[3]),
+        )
+
+    def _category_row_by_slug(self, slug: str) -> Optional[int]:
+        slug = slugify(slug)
+
+        def category_slug(row):
+            record = self._category_record(row)
+            return self._string(record[4], record[5])
+
+        start, stop = self._range("category_by_slug", category_slug, slug, slug)
+        return self._row("category_by_slug", start) if start < stop else None
+
+    def _project_row_by_slug(self, category_id: int, slug: str) -> Optional[int]:
+        key = (category_id, slugify(slug))
+
+        def category_and_slug(row):
+            record = self._project_record(row)
+            return (record[1], self._string(record[5], record[6]))
+
+        start, stop = self._range("project_by_slug", category_and_slug, key, key)
+        return self._row("project_by_slug", start) if start < stop else None
+
+    # ---- Catalog lookups ----
+
+    def get_all_categories(self, ordered: bool = True) -> list[Category]:
+        if ordered:
+            return [self._category(row) for row in self._rows("categories_ordered")]
+        return [self._category(row) for row in range(self.n_categories)]
+
+    def get_category_by_slug(self, slug: str) -> Optional[Category]:
+        row = self._category_row_by_slug(slug)
+        return None if row is None else self._category(row)
+
+    def get_all_projects(self) -> list[Project]:
+        return [self._project(row) for row in range(self.n_projects)]
+
+    def get_projects_by_category(self, id: int, ordered: bool = True) -> list[Project]:
+        index = "projects_by_category_dated" if ordered else "projects_by_category"
+        start, stop = self._range(index, lambda row: self._project_record(row)[1], id, id)
+        return [self._project(row) for row in self._rows(index, start, stop)]
+
+    def get_projects_by_category_slug(
+        self, slug: str, ordered: bool = True
+    ) -> list[Project]:
+        category = self.get_category_by_slug(slug)
+        if category is None:
+            return []
+        return self.get_projects_by_category(category.category_id, ordered)
+
+    def get_project(self, id: int) -> Optional[Project]:
+        row = self._find_id(self._project_record, self.n_projects, int(id))
+        return None if row is None else self._project(row)
+
+    def get_project_by_slug(
+        self, project_slug: str, category_slug: str
+    ) -> Optional[Project]:
+        category = self.get_category_by_slug(category_slug)
+        if category is None:
+            return None
+        row = self._project_row_by_slug(category.category_id, project_slug)
+        return None if row is None else self._project(row)
+
+    def get_project_page(
+        self, category_slug: str, project_slug: str
+    ) -> Optional[Tuple[Project, Category, list[Image]]]:
+        category = self.get_category_by_slug(category_slug)
+        if category is None:
+            return None
+        row = self._project_row_by_slug(category.category_id, project_slug)
+        if row is None:
+            return None
+        project = self._project(row)
+        return (project, category, self.get_project_images(project.project_id))
+
+    def get_all_images(self) -> list[Image]:
+        return [self._image(row) for row in range(self.n_images)]
+
+    def get_project_images(self, id: int) -> list[Image]:
+        id = int(id)
+        start, stop = self._range("images_by_project", lambda row: self._image_record(row)[1], id, id)
+        return [self._image(row) for row in self._rows("images_by_project", start, stop)]
+
+    def get_image(self, id: int) -> Optional[Image]:
+        row = self._find_id(self._image_record, self.n_images, int(id))
+        return None if row is None else self._image(row)
+
+
+class SharedCatalogSnapshot(CatalogSnapshot):
+    """CatalogSnapshot whose catalog lives in a memory mapped file shared by every worker on the node.
+    The worker holding the file lock checks the version marker and rewrites the file, the rest remap it."""
+
+    def __init__(
+        self,
+        db_factory,
+        path: str,
+        check_interval: float = 5.0,
+        max_age: float = 300.0,
+    ):
+        """Creates the shared catalog snapshot.
+
+        :param db_factory: Callable returning a MySQLBase used to load the tables.
+        :type db_factory: Callable
+        :param path: Location of the shared catalog file. Must be on a local file system.
+        :type path: str
+        :param check_interval: Seconds between checks of the version marker, shared across workers.
+        :type check_interval: float
+        :param max_age: Seconds after which the file is rewritten even if the version has not changed.
+        :type max_age: float
+        """
+        super().__init__(db_factory, check_interval, max_age)
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.maps = 0
+
+    def _refresh(self, force: bool):
+        """Remaps the file if another worker replaced it, then checks the version marker if no worker has recently.
+        Caller must hold the thread lock."""
+        self._next_check = time.monotonic() + self.check_interval
+        self._map_if_replaced()
+        if not force and self._recently_checked():
+            return
+
+        lock_file = open(self.lock_path, "a")
+        try:
+            if not self._lock_file(lock_file, blocking=self._catalog is None):
+                return  # Another worker is refreshing, keep serving the current mapping
+            self._map_if_replaced()
+            if not force and self._recently_checked():
+                return
+
+            db = self.db_factory()
+            self.checks += 1
+            version = self._load_version(db)
+            catalog = self._catalog
+            if (
+                not force
+                and catalog is not None
+                and version == catalog.version
+                and time.time() - catalog.written_at < self.max_age
+            ):
+                os.utime(self.path)  # Tells the other workers the version was just checked
+                return
+
+            new_catalog = self._load_catalog(db, version)
+            write_catalog_file(self.path, new_catalog)
+            self.loads += 1
+            self.logger.info(
+                f"Wrote catalog file '{self.path}' version {version}: {len(new_catalog.categories)} categories, "
+                f"{len(new_catalog.projects)} projects, {len(new_catalog.images)} images"
+            )
+            self._map_if_replaced()
+        finally:
+            lock_file.close()  # Closing releases the lock
+
+    def _recently_checked(self) -> bool:
+        """True if a mapped catalog exists and some worker checked the version within the check interval."""
+        if self._catalog is None:
+            return False
+        try:
+            return time.time() - os.stat(self.path).st_mtime < self.check_interval
+        except OSError:
+            return False
+
+    def _map_if_replaced(self):
+        """Maps the catalog file if it is newer than the current mapping. Old mappings close once no request holds them."""
+        try:
+            inode = os.stat(self.path).st_ino
+        except OSError:
+            return
+        if self._catalog is not None and self._catalog.inode == inode:
+            return
+        try:
+            catalog = MappedCatalog(self.path)
+        except (CatalogFileError, OSError, ValueError) as e:
+            self.logger.error(f"Could not map catalog file '{self.path}': {e}")
+            return
+        previous, self._catalog = self._catalog, catalog
+        self.maps += 1
+        self.logger.info(f"Mapped catalog file '{self.path}' version {catalog.version}")
+        if catalog.version is None and previous is not None and previous.version is None:
+            return  # Without a version row every max_age rewrite would empty the caches for nothing
+        self._notify_listeners()
+
+    def _lock_file(self, lock_file, blocking: bool) -> bool:
+        if fcntl is None:
+            return True
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lock_file.fileno(), flags)
+            return True
+        except BlockingIOError:
+            return False
@@ -0,0 +1,276 @@
+import threading
+import time
+from dataclasses import replace
+from datetime import date, datetime
+from typing import Callable, Optional, Tuple
+from data_classes.category import Category
+from data_classes.image import Image
+from data_classes.project import Project
+from utility_classes.custom_logger import log
+from utility_classes.slug import slugify
+
+# In memory copy of the category, project and image tables.
+# The portfolio content is small and read mostly, so View_User serves its reads from a Catalog
+# and the snapshot reloads the whole thing when the catalog_version row in site_meta changes.
+
+
+def _date_order(project: Project) -> tuple:
+    """Sort key matching ORDER BY project_date ASC, where MySQL puts NULL dates first.
+    Rows carry the date as text, a NULL date as "None", so it is parsed back to a date to compare."""
+    value = project.project_date
+    if isinstance(value, str):
+        try:
+            value = date.fromisoformat(value)
+        except ValueError:
+            value = None
+    elif isinstance(value, datetime):
+        value = value.date()
+    return (value is not None, value or date.min, project.project_id)
+
+
+class Catalog:
+    """Immutable, indexed view of every category, project and image at one point in time.
+    Lookup methods mirror the View_User read methods."""
+
+    def __init__(
+        self,
+        categories: list[Category],
+        projects: list[Project],
+        images: list[Image],
+        version=None,
+    ):
+        """Builds the indexes for a catalog.
+
+        :param categories: Every category.
+        :type categories: list[Category]
+        :param projects: Every project. Each project is copied with its project_image filled in from images.
+        :type projects: list[Project]
+        :param images: Every image.
+        :type images: list[Image]
+        :param version: Version marker the catalog was loaded at.
+        """
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+        self.images = sorted(images, key=lambda image: image.image_id)
+        self.image_by_id = {image.image_id: image for image in self.images}
+        self.images_by_project: dict[int, list[Image]] = {}
+        for image in sorted(self.images, key=lambda image: (image.image_weight, image.image_id)):
+            self.images_by_project.setdefault(image.project_id, []).append(image)
+
+        projects = [  # Data classes are frozen, so projects are copied with their image filled in
+            replace(
+                project,
+                project_image=self.image_by_id.get(project.project_image_id)
+                or Image(project_id=project.project_id, image_weight=0),
+            )
+            for project in projects
+        ]
+        self.projects = sorted(projects, key=lambda project: project.project_id)
+        self.project_by_id = {project.project_id: project for project in self.projects}
+        self.projects_by_category: dict[int, list[Project]] = {}
+        for project in self.projects:
+            self.projects_by_category.setdefault(project.category_id, []).append(project)
+        self.projects_by_category_dated = {
+            category_id: sorted(
+                category_projects,
+                key=_date_order,
+            )
+            for category_id, category_projects in self.projects_by_category.items()
+        }
+        self.project_by_slug = {
+            (project.category_id, project.project_slug): project
+            for project in reversed(self.projects)  # First project wins on duplicate slugs
+        }
+
+        self.categories = sorted(categories, key=lambda category: category.category_id)
+        self.categories_ordered = sorted(
+            categories, key=lambda category: (category.category_order, category.category_id)
+        )
+        self.category_by_id = {category.category_id: category for category in self.categories}
+        self.category_by_slug = {
+            category.category_slug: category for category in reversed(self.categories)
+        }
+
+    def get_all_categories(self, ordered: bool = True) -> list[Category]:
+        return list(self.categories_ordered if ordered else self.categories)
+
+    def get_category_by_slug(self, slug: str) -> Optional[Category]:
+        return self.category_by_slug.get(slugify(slug))
+
+    def get_all_projects(self) -> list[Project]:
+        return list(self.projects)
+
+    def get_projects_by_category(self, id: int, ordered: bool = True) -> list[Project]:
+        if ordered:
+            return list(self.projects_by_category_dated.get(id, []))
+        return list(self.projects_by_category.get(id, []))
+
+    def get_projects_by_category_slug(
+        self, slug: str, ordered: bool = True
+    ) -> list[Project]:
+        category = self.get_category_by_slug(slug)
+        if category is None:
+            return []
+        return self.get_projects_by_category(category.category_id, ordered)
+
+    def get_project(self, id: int) -> Optional[Project]:
+        return self.project_by_id.get(int(id))
+
+    def get_project_by_slug(
+        self, project_slug: str, category_slug: str
+    ) -> Optional[Project]:
+        category = self.get_category_by_slug(category_slug)
+        if category is None:
+            return None
+        return self.project_by_slug.get((category.category_id, slugify(project_slug)))
+
+    def get_project_page(
+        self, category_slug: str, project_slug: str
+    ) -> Optional[Tuple[Project, Category, list[Image]]]:
+        category = self.get_category_by_slug(category_slug)
+        if category is None:
+            return None
+        project = self.project_by_slug.get((category.category_id, slugify(project_slug)))
+        if project is None:
+            return None
+        return (project, category, self.get_project_images(project.project_id))
+
+    def get_all_images(self) -> list[Image]:
+        return list(self.images)
+
+    def get_project_images(self, id: int) -> list[Image]:
+        return list(self.images_by_project.get(int(id), []))
+
+    def get_image(self, id: int) -> Optional[Image]:
+        return self.image_by_id.get(int(id))
+
+
+class CatalogSnapshot:
+    """Holds the current Catalog and swaps in a new one when the content version changes."""
+
+    version_query = "SELECT meta_data, last_updated FROM Portfolio.`VV.site_meta` WHERE meta_key = 'catalog_version';"
+    category_query = "SELECT * FROM Portfolio.`VV.category`;"
+    project_query = "SELECT * FROM Portfolio.`VV.project`;"
+    image_query = "SELECT * FROM Portfolio.`VV.image`;"
+
+    def __init__(
+        self,
+        db_factory: Callable,
+        check_interval: float = 5.0,
+        max_age: float = 300.0,
+    ):
+        """Creates the catalog snapshot. Nothing is loaded until the first call to get().
+
+        :param db_factory: Callable returning a MySQLBase used to load the tables.
+        :type db_factory: Callable
+        :param check_interval: Seconds between checks of the version marker.
+        :type check_interval: float
+        :param max_age: Seconds after which the catalog is reloaded even if the version has not changed.
+        :type max_age: float
+        """
+        self.db_factory = db_factory
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self.logger = log("CATALOG")
+        self._catalog: Optional[Catalog] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[], None]] = []
+        self.loads = 0
+        self.checks = 0
+
+    def on_refresh(self, listener: Callable[[], None]):
+        """Registers a callable that is run after a new catalog is swapped in."""
+        self._listeners.append(listener)
+
+    def get(self) -> Catalog:
+        """Returns the current catalog, checking the version marker at most once per check interval.
+        While one thread refreshes, other threads keep reading the current catalog.
+
+        :return: The current catalog.
+        :rtype: Catalog
+        :raises Exception: If no catalog has been loaded and loading fails.
+        """
+        catalog = self._catalog
+        if catalog is not None and time.monotonic() < self._next_check:
+            return catalog
+
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._refresh(force=False)
+                return self._catalog
+
+        if not self._lock.acquire(blocking=False):
+            return catalog  # Another thread is already checking
+        try:
+            if time.monotonic() >= self._next_check:
+                self._refresh(force=False)
+        except Exception as e:
+            self.logger.error(f"Failed to refresh catalog, serving version {catalog.version}: {e}")
+        finally:
+            self._lock.release()
+        return self._catalog
+
+    def refresh(self):
+        """Reloads the catalog now regardless of the version marker."""
+        with self._lock:
+            self._refresh(force=True)
+
+    def invalidate(self):
+        """Forces a version check on the next call to get()."""
+        self._next_check = 0.0
+
+    def _refresh(self, force: bool):
+        """Checks the version marker and loads a new catalog if it changed. Caller must hold the lock."""
+        db = self.db_factory()
+        self.checks += 1
+        version = self._load_version(db)
+        catalog = self._catalog
+        if (
+            not force
+            and catalog is not None
+            and version == catalog.version
+            and time.monotonic() - catalog.loaded_at < self.max_age
+        ):
+            self._next_check = time.monotonic() + self.check_interval
+            return
+
+        # Version is read before the tables, so a write during the load is picked up by the next check
+        new_catalog = self._load_catalog(db, version)
+        self._catalog = new_catalog
+        self._next_check = time.monotonic() + self.check_interval
+        self.loads += 1
+        self.logger.info(
+            f"Loaded catalog version {version}: {len(new_catalog.categories)} categories, "
+            f"{len(new_catalog.projects)} projects, {len(new_catalog.images)} images"
+        )
+        if version is None and catalog is not None and catalog.version is None:
+            return  # Without a version row every max_age reload would empty the caches for nothing
+        self._notify_listeners()
+
+    def _notify_listeners(self):
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception as e:
+                self.logger.error(f"Catalog refresh listener failed: {e}")
+
+    def _load_version(self, db):
+        result = db.fetch_one(self.version_query)
+        if result is None:
+            return None
+        return (str(result.get("meta_data")), str(result.get("last_updated")))
+
+    def _load_catalog(self, db, version) -> Catalog:
+        categories = self._build(db.fetch_all(self.category_query), Category)
+        projects = self._build(db.fetch_all(self.project_query), Project)
+        images = self._build(db.fetch_all(self.image_query), Image)
+        return Catalog(categories, projects, images, version)
+
+    def _build(self, results, data_class) -> list:
+        return data_class.from_rows(
+            results,
+            on_error=lambda result, e: self.logger.error(f"Failed to add {result} to catalog: {e}"),
+        )
@@ -1,4 +1,5 @@
 import pymysql, time, os, utility_classes.custom_logger
+from typing import Tuple
 from pymysql.cursors import DictCursor
 from dotenv import load_dotenv
 from werkzeug.security import generate_password_hash
@@ -25,8 +26,202 @@ class Root(MySQLBase):
         password = os.getenv("MYSQL_ROOT_PASSWORD")
         super().__init__(user, password, "ROOT")
 
+    # Indexes the View_User queries depend on ---Needs Updated with sql-scripts/init-db.sql---
+    need_indexes = [
+        {"table": "category", "name": "category_slug_key", "columns": ("category_slug",), "unique": True},
+        {"table": "project", "name": "project_category_slug_key", "columns": ("category_id", "project_slug"), "unique": True},
+        {"table": "project", "name": "project_category_date", "columns": ("category_id", "project_date"), "unique": False},
+        {"table": "image", "name": "image_project_weight", "columns": ("project_id", "image_weight"), "unique": False},
+    ]
+
+    # Columns added after the first release, so databases made by an older init-db.sql gain them on start up.
+    # ---Needs Updated with sql-scripts/init-db.sql---
+    # Columns with a "fill" statement are filled in for the rows already in the table when they are added.
+    need_columns = [
+        {
+            "table": "category",
+            "name": "category_slug",
+            "definition": "VARCHAR(100) NOT NULL DEFAULT ''",
+            "fill": "UPDATE `category` SET category_slug = unique_category_slug(category_title, category_id);",
+        },
+        {
+            "table": "project",
+            "name": "project_slug",
+            "definition": "VARCHAR(255) NOT NULL DEFAULT ''",
+            "fill": "UPDATE `project` SET project_slug = unique_project_slug(category_id, project_title, project_id);",
+        },
+        {"table": "image", "name": "image_width", "definition": "SMALLINT UNSIGNED NULL"},
+        {"table": "image", "name": "image_height", "definition": "SMALLINT UNSIGNED NULL"},
+        {"table": "image", "name": "image_color", "definition": "CHAR(7) NULL"},
+        {"table": "image", "name": "image_bytes", "definition": "INT UNSIGNED NULL"},
+        {"table": "image", "name": "image_placeholder", "definition": "VARCHAR(1024) NULL"},
+    ]
+
+    # Views over tables in need_columns. A view keeps the column list it was made with, so it is remade
+    # whenever it is missing one of them.
+    need_views = {
+        "category": (
+            "VV.category",
+            "CREATE OR REPLACE VIEW `VV.category` AS "
+            "SELECT category_id, category_title, category_order, category_slug FROM category;",
+        ),
+        "project": (
+            "VV.project",
+            "CREATE OR REPLACE VIEW `VV.project` AS "
+            "SELECT project_id, project_title, project_date, project_desc, project.category_id, project_image_id, "
+            "project_slug FROM project;",
+        ),
+        "image": (
+            "VV.image",
+            "CREATE OR REPLACE VIEW `VV.image` AS "
+            "SELECT image_id, image_title, image_desc, image_URL, image_weight, image.project_id, "
+            "image_width, image_height, image_color, image_bytes, image_placeholder "
+            "FROM image;",
+        ),
+    }
+
+    # Functions, procedures and triggers that keep the slug columns filled in, clear the measurements of a
+    # changed image URL and keep the catalog version current.
+    # Functions and procedures come first, the triggers call them.
+    # ---Needs Updated with sql-scripts/init-db.sql---
+    need_routines = [
+        {
+            "type": "FUNCTION",
+            "name": "slugify",
+            "definition": (
+                "CREATE FUNCTION slugify(title VARCHAR(255)) RETURNS VARCHAR(255) DETERMINISTIC "
+                "BEGIN "
+                "DECLARE slug VARCHAR(255) DEFAULT ''; "
+                "DECLARE ch VARCHAR(1); "
+                "DECLARE i INT DEFAULT 1; "
+                "DECLARE pending_dash BOOLEAN DEFAULT FALSE; "
+                "SET title = LOWER(title); "
+                "WHILE i <= CHAR_LENGTH(title) DO "
+                "SET ch = SUBSTRING(title, i, 1); "
+                "IF LOCATE(BINARY ch, 'abcdefghijklmnopqrstuvwxyz0123456789') > 0 THEN "
+                "IF pending_dash AND slug <> '' THEN SET slug = CONCAT(slug, '-'); END IF; "
+                "SET slug = CONCAT(slug, ch); "
+                "SET pending_dash = FALSE; "
+                "ELSEIF ch <> '''' THEN "
+                "SET pending_dash = TRUE; "
+                "END IF; "
+                "SET i = i + 1; "
+                "END WHILE; "
+                "RETURN slug; "
+                "END"
+            ),
+        },
+        {
+            "type": "FUNCTION",
+            "name": "unique_category_slug",
+            "definition": (
+                "CREATE FUNCTION unique_category_slug(title VARCHAR(100), id INT) RETURNS VARCHAR(100) READS SQL DATA "
+                "BEGIN "
+                "DECLARE base VARCHAR(100); "
+                "DECLARE slug VARCHAR(100); "
+                "DECLARE n INT DEFAULT 1; "
+                "SET base = slugify(title); "
+                "SET slug = base; "
+                "WHILE EXISTS (SELECT 1 FROM category WHERE category_slug = slug AND NOT (category_id <=> id)) DO "
+                "SET n = n + 1; "
+                "SET slug = CONCAT(LEFT(base, 99 - CHAR_LENGTH(n)), '-', n); "
+                "END WHILE; "
+                "RETURN slug; "
+                "END"
+            ),
+        },
+        {
+            "type": "FUNCTION",
+            "name": "unique_project_slug",
+            "definition": (
+                "CREATE FUNCTION unique_project_slug(category INT, title VARCHAR(255), id INT) RETURNS VARCHAR(255) "
+                "READS SQL DATA "
+                "BEGIN "
+                "DECLARE base VARCHAR(255); "
+                "DECLARE slug VARCHAR(255); "
+                "DECLARE n INT DEFAULT 1; "
+                "SET base = slugify(title); "
+                "SET slug = base; "
+                "WHILE EXISTS (SELECT 1 FROM project WHERE category_id <=> category AND project_slug = slug "
+                "AND NOT (project_id <=> id)) DO "
+                "SET n = n + 1; "
+                "SET slug = CONCAT(LEFT(base, 254 - CHAR_LENGTH(n)), '-', n); "
+                "END WHILE; "
+                "RETURN slug; "
+                "END"
+            ),
+        },
+        {
+            "type": "TRIGGER",
+            "name": "category_insert_slug",
+            "definition": "CREATE TRIGGER category_insert_slug BEFORE INSERT ON category FOR EACH ROW "
+            "SET NEW.category_slug = unique_category_slug(NEW.category_title, NEW.category_id)",
+        },
+        {
+            "type": "TRIGGER",
+            "name": "category_update_slug",
+            "definition": "CREATE TRIGGER category_update_slug BEFORE UPDATE ON category FOR EACH ROW "
+            "SET NEW.category_slug = unique_category_slug(NEW.category_title, NEW.category_id)",
+        },
+        {
+            "type": "TRIGGER",
+            "name": "project_insert_slug",
+            "definition": "CREATE TRIGGER project_insert_slug BEFORE INSERT ON project FOR EACH ROW "
+            "SET NEW.project_slug = unique_project_slug(NEW.category_id, NEW.project_title, NEW.project_id)",
+        },
+        {
+            "type": "TRIGGER",
+            "name": "project_update_slug",
+            "definition": "CREATE TRIGGER project_update_slug BEFORE UPDATE ON project FOR EACH ROW "
+            "SET NEW.project_slug = unique_project_slug(NEW.category_id, NEW.project_title, NEW.project_id)",
+        },
+        {
+            "type": "TRIGGER",
+            "name": "image_update_measurements",
+            "definition": (
+                "CREATE TRIGGER image_update_measurements BEFORE UPDATE ON image FOR EACH ROW "
+                "BEGIN "
+                "IF NOT (NEW.image_URL <=> OLD.image_URL) THEN "
+                "SET NEW.image_width = NULL, NEW.image_height = NULL, NEW.image_color = NULL, "
+                "NEW.image_bytes = NULL, NEW.image_placeholder = NULL; "
+                "END IF; "
+                "END"
+            ),
+        },
+        {
+            "type": "PROCEDURE",
+            "name": "bump_catalog_version",
+            "definition": (
+                "CREATE PROCEDURE bump_catalog_version() "
+                "BEGIN "
+                "UPDATE site_meta "
+                "SET meta_data = JSON_SET(meta_data, '$.version', JSON_EXTRACT(meta_data, '$.version') + 1) "
+                "WHERE meta_key = 'catalog_version'; "
+                "END"
+            ),
+        },
+        # Every write to the catalog tables bumps catalog_version, so the snapshot reloads only when content changes
+        *[
+            {
+                "type": "TRIGGER",
+                "name": f"{table}_{event.lower()}_version",
+                "definition": f"CREATE TRIGGER {table}_{event.lower()}_version AFTER {event} ON {table} "
+                "FOR EACH ROW CALL bump_catalog_version()",
+            }
+            for table in ("category", "project", "image")
+            for event in ("INSERT", "UPDATE", "DELETE")
+        ],
+    ]
+
+    # Row the version triggers bump, read by CatalogSnapshot ---Needs Updated with sql-scripts/init-db.sql---
+    catalog_version_row = (
+        "INSERT IGNORE INTO site_meta (meta_key, meta_data) VALUES ('catalog_version', '{\"version\": 0}');"
+    )
+
     def try_connection(self) -> bool:
         """Test the connection to the database and ensures that all need tables are made and ready for use.
+        Once the tables are ready the routines, columns and indexes are verified and any missing ones are created.
+        Functions and procedures are made before the columns they fill in, and triggers after the columns they write.
 
         :return: Returns status of database tables
         :rtype: bool
@@ -62,6 +257,11 @@ class Root(MySQLBase):
             ):  # Checks if the length of the results of the differences in table sets.
                 status = True
                 self.logger.info("All tables have been created - Database is ready")
+                self.verify_routines(("FUNCTION", "PROCEDURE"))
+                self.verify_columns()
+                self.verify_routines(("TRIGGER",))
+                self.verify_catalog_version()
+                self.verify_indexes()
             else:
                 self.logger.error(
                     f"Tables do not match. Missing tables: {table_dif}"
@@ -74,6 +274,214 @@ class Root(MySQLBase):
             return status
         return status
 
+    def check_routines(self) -> list[dict]:
+        """Compares the functions, procedures and triggers in the database against need_routines.
+        Routines are matched by name, one that exists is not compared with its definition.
+
+        :return: The entries of need_routines that are missing from the database, in need_routines order.
+        :rtype: list[dict]
+        :raises pymysql.MySQLError: When there is an error interacting with the database.
+        """
+        query = (
+            "SELECT ROUTINE_TYPE AS type, ROUTINE_NAME AS name FROM information_schema.ROUTINES "
+            "WHERE ROUTINE_SCHEMA = DATABASE() "
+            "UNION ALL SELECT 'TRIGGER', TRIGGER_NAME FROM information_schema.TRIGGERS "
+            "WHERE TRIGGER_SCHEMA = DATABASE();"
+        )
+        current_routines = {(row["type"], row["name"]) for row in self.fetch_all(query) or []}
+        return [need for need in self.need_routines if (need["type"], need["name"]) not in current_routines]
+
+    def verify_routines(self, types: Tuple[str, ...] = ("FUNCTION", "PROCEDURE", "TRIGGER")) -> bool:
+        """Creates any functions, procedures or triggers in need_routines the database is missing.
+        Without them new rows get an empty slug and the catalog reloads on a timer, but the pages still load,
+        so failures are logged rather than raised.
+
+        :param types: Kinds of routine to verify.
+        :type types: tuple[str, ...]
+        :return: True if every needed routine of those kinds is in place.
+        :rtype: bool
+        """
+        try:
+            missing = [need for need in self.check_routines() if need["type"] in types]
+        except Exception as e:
+            self.logger.error(f"Was not able to check database routines: {e}")
+            return False
+        if len(missing) == 0:
+            self.logger.info(f"All {' and '.join(f'{kind.lower()}s' for kind in types)} are in place")
+            return True
+
+        status = True
+        for need in missing:
+            self.logger.warning(f"Missing {need['type'].lower()} {need['name']}, creating it")
+            try:
+                self.execute(need["definition"])
+            except Exception as e:
+                self.logger.error(f"Was not able to create {need['type'].lower()} {need['name']}: {e}")
+                status = False
+        return status
+
+    def verify_catalog_version(self) -> bool:
+        """Adds the catalog_version row if it is missing. Without it the catalog snapshot can not tell when
+        content changes, so pages are neither cached nor answered with 304. Failures are logged rather than raised.
+
+        :return: True if the row is in place.
+        :rtype: bool
+        """
+        try:
+            self.execute(self.catalog_version_row)
+        except Exception as e:
+            self.logger.error(f"Was not able to add the catalog_version row: {e}")
+            return False
+        return True
+
+    def check_indexes(self) -> list[dict]:
+        """Compares the indexes in the database against need_indexes.
+        An index counts if its leading columns match, whatever it is named. Unique keys must cover exactly
+        their columns and every text column in them must use a case-insensitive collation.
+
+        :return: The entries of need_indexes that are missing from the database.
+        :rtype: list[dict]
+        :raises pymysql.MySQLError: When there is an error interacting with the database.
+        """
+        query = (
+            "SELECT s.TABLE_NAME AS table_name, s.INDEX_NAME AS index_name, s.NON_UNIQUE AS non_unique, "
+            "s.COLUMN_NAME AS column_name, c.COLLATION_NAME AS collation_name "
+            "FROM information_schema.STATISTICS AS s "
+            "JOIN information_schema.COLUMNS AS c ON c.TABLE_SCHEMA = s.TABLE_SCHEMA "
+            "AND c.TABLE_NAME = s.TABLE_NAME AND c.COLUMN_NAME = s.COLUMN_NAME "
+            "WHERE s.TABLE_SCHEMA = DATABASE() "
+            "ORDER BY s.TABLE_NAME, s.INDEX_NAME, s.SEQ_IN_INDEX;"
+        )
+        current_indexes = {}
+        for row in self.fetch_all(query) or []:
+            index = current_indexes.setdefault(
+                (row["table_name"], row["index_name"]),
+                {"columns": [], "unique": not int(row["non_unique"]), "case_insensitive": True},
+            )
+            index["columns"].append(row["column_name"])
+            collation = row.get("collation_name")
+            if collation is not None and not collation.endswith("_ci"):
+                index["case_insensitive"] = False
+
+        missing = []
+        for need in self.need_indexes:
+            columns = list(need["columns"])
+            found = False
+            for (table, _), index in current_indexes.items():
+                if table != need["table"]:
+                    continue
+                if need["unique"]:
+                    found = index["unique"] and index["case_insensitive"] and index["columns"] == columns
+                else:
+                    found = index["columns"][: len(columns)] == columns
+                if found:
+                    break
+            if not found:
+                missing.append(need)
+        return missing
+
+    def verify_indexes(self) -> bool:
+        """Checks the indexes View_User relies on and creates any that are missing.
+        A missing index slows queries down but does not stop the site, so failures are logged rather than raised.
+
+        :return: True if every needed index is in place.
+        :rtype: bool
+        """
+        try:
+            missing = self.check_indexes()
+        except Exception as e:
+            self.logger.error(f"Was not able to check database indexes: {e}")
+            return False
+        if len(missing) == 0:
+            self.logger.info("All indexes are in place")
+            return True
+
+        status = True
+        for need in missing:
+            unique = "UNIQUE " if need["unique"] else ""
+            columns = ", ".join(need["columns"])
+            self.logger.warning(
+                f"Missing index {need['name']} on {need['table']}({columns}), creating it"
+            )
+            try:
+                self.execute(
+                    f"ALTER TABLE `{need['table']}` ADD {unique}INDEX `{need['name']}` ({columns});"
+                )
+            except Exception as e:
+                # Duplicate slugs stop a unique key being added until the titles are fixed.
+                self.logger.error(f"Was not able to create index {need['name']}: {e}")
+                status = False
+        return status
+
+    def check_columns(self) -> Tuple[list[dict], set[str]]:
+        """Compares the columns in the database against need_columns.
+
+        :return: The entries of need_columns missing from their table, and the tables whose view is missing any of them.
+        :rtype: tuple[list[dict], set[str]]
+        :raises pymysql.MySQLError: When there is an error interacting with the database.
+        """
+        query = (
+            "SELECT TABLE_NAME AS table_name, COLUMN_NAME AS column_name "
+            "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE();"
+        )
+        current_columns = {
+            (row["table_name"], row["column_name"]) for row in self.fetch_all(query) or []
+        }
+        missing = []
+        stale_views = set()
+        for need in self.need_columns:
+            if (need["table"], need["name"]) not in current_columns:
+                missing.append(need)
+                stale_views.add(need["table"])
+            view = self.need_views.get(need["table"])
+            if view is not None and (view[0], need["name"]) not in current_columns:
+                stale_views.add(need["table"])
+        return missing, stale_views
+
+    def verify_columns(self) -> bool:
+        """Adds any columns in need_columns the database is missing and remakes the views that should show them.
+        The pages work without them, so failures are logged rather than raised.
+
+        :return: True if every needed column is in place.
+        :rtype: bool
+        """
+        try:
+            missing, stale_views = self.check_columns()
+        except Exception as e:
+            self.logger.error(f"Was not able to check database columns: {e}")
+            return False
+        if len(missing) == 0 and len(stale_views) == 0:
+            self.logger.info("All columns are in place")
+            return True
+
+        status = True
+        for need in missing:
+            self.logger.warning(f"Missing column {need['name']} on {need['table']}, adding it")
+            try:
+                self.execute(
+                    f"ALTER TABLE `{need['table']}` ADD COLUMN `{need['name']}` {need['definition']};"
+                )
+            except Exception as e:
+                self.logger.error(f"Was not able to add column {need['name']}: {e}")
+                status = False
+                continue
+            if need.get("fill"):
+                self.logger.info(f"Filling in column {need['name']} on {need['table']}")
+                try:
+                    self.execute(need["fill"])
+                except Exception as e:
+                    self.logger.error(f"Was not able to fill in column {need['name']}: {e}")
+                    status = False
+        for table in sorted(stale_views):
+            view, definition = self.need_views[table]
+            self.logger.warning(f"View {view} is missing columns, remaking it")
+            try:
+                self.execute(definition)
+            except Exception as e:
+                self.logger.error(f"Was not able to remake view {view}: {e}")
+                status = False
+        return status
+
     def create_db_users(self):
         """Creates need database users and provides them set permissions.
 
@@ -91,9 +499,23 @@ class Root(MySQLBase):
                     "GRANT SELECT ON `VV.users` TO %s;",
                     "GRANT SELECT ON `VV.site_meta` TO %s;",
                 ],
-            }
+            },
+            {
+                "user": os.getenv("MYSQL_IMAGE_WRITER"),
+                "password": os.getenv("MYSQL_IMAGE_WRITER_PASSWORD"),
+                "permissions": [
+                    "GRANT SELECT ON `VV.image` TO %s;",
+                    # Only the measurement columns, see Image_Writer.image_metadata_columns
+                    "GRANT SELECT (image_id, image_placeholder), "
+                    "UPDATE (image_width, image_height, image_color, image_bytes, image_placeholder) "
+                    "ON `image` TO %s;",
+                ],
+            },
         ]
         for user in user_list:
+            if not user.get("user"):
+                self.logger.warning("A database user is not configured, skipping it.")
+                continue
             try:
                 self.logger.info(f"Checking if user '{user.get('user')}' exist.")
                 users = self.fetch_all(
@@ -3,9 +3,11 @@ import time
 from typing import Optional, Literal
 import pymysql
 from dotenv import load_dotenv
-from pymysql.cursors import DictCursor
+from pymysql.cursors import DictCursor, SSDictCursor
 from pymysql.err import OperationalError, MySQLError
 from utility_classes.custom_logger import log
+from mysql_connections.mysql_pool import get_pool
+from utility_classes import query_tracker, metrics
 
 
 class MySQLBase:
@@ -42,7 +44,7 @@ class MySQLBase:
         :raises MySQLError: pymysql over all error handing, similar to an Exception but specifically for mysql errors.
         :raises Exception: If any uncaught exceptions happens.
         """
-        self.logger.debug(f"Creating connection to: {self.host}")
+        self.logger.debug("Creating connection to: %s", self.host)
         try:
             connection = pymysql.connect(
                 host=self.host,
@@ -53,6 +55,8 @@ class MySQLBase:
                 cursorclass=DictCursor,
             )
             self.logger.debug("Connection created")
+            query_tracker.record_connection()
+            metrics.connections_opened.inc(user=self.user)
             return connection
         except OperationalError as e:
             self.logger.error(f"Operational error when connecting to the database: {e}")
@@ -65,10 +69,13 @@ class MySQLBase:
             raise
 
     def _run_query(
-        self, query: str, args=None, fetch: Optional[Literal["one", "all"]] = None
+        self, query: str, args=None, fetch: Optional[Literal["one", "all"]] = None, many: bool = False
     ):
         """Core unified query runner used by all non-sensitive helper functions.
         Handles connections, logs, commits, and error handling.
+        Connections are checked out of the worker's connection pool and returned after the query.
+        Any connection that raised an error is closed instead of being returned.
+        Every query is counted on the current request's QueryStats, with the time spent getting a connection kept apart.
 
         :param query: Query that needs to be executed.
         :type query: str
@@ -79,6 +86,9 @@ class MySQLBase:
         :param fetch: "one" to fetch one row, "all" to fetch all rows, None to fetch nothing
         :type fetch: "one", "all", None
 
+        :param many: True to run the query once for each item of args in one transaction, all rows or none.
+        :type many: bool
+
         :return: Results of query or row count of executions.
         :rtype: dict | int | None
 
@@ -97,11 +107,27 @@ class MySQLBase:
         results = None
         connection = None
         cursor = None
+        failed = True
+        acquired_at = None
+        pool = get_pool(self.host, self.port, self.user, self.db)
         try:
-            connection = self.create_connection()
+            connection = pool.acquire(self.create_connection)
+            acquired_at = time.time()
             with connection.cursor() as cursor:
                 # Execute query
-                if args is None:
+                if many:
+                    # Pooled connections autocommit and executemany sends one statement per row, so the rows
+                    # are only applied together inside an explicit transaction
+                    connection.begin()
+                    try:
+                        cursor.executemany(query, args)
+                    except Exception:
+                        try:
+                            connection.rollback()
+                        except MySQLError:
+                            pass  # The connection is discarded either way
+                        raise
+                elif args is None:
                     cursor.execute(query)
                 else:
                     cursor.execute(query, args)
@@ -115,6 +141,7 @@ class MySQLBase:
                     results = cursor.rowcount
                     connection.commit()
 
+                failed = False
                 return results
 
         except OperationalError as e:
@@ -130,8 +157,17 @@ class MySQLBase:
             if cursor:
                 cursor.close()
             if connection:
-                connection.close()
-            self.logger.con_close(time.time() - start_time)
+                pool.release(connection, discard=failed)
+            end_time = time.time()
+            acquired_at = acquired_at or end_time
+            query_tracker.record_query(
+                query, end_time - acquired_at, acquired_at - start_time
+            )
+            metrics.query_duration.observe(
+                end_time - acquired_at,
+                method=metrics.current_db_method() or type(self).__name__,
+            )
+            self.logger.con_close(end_time - start_time)
 
     def fetch_all(self, query: str, args=None):
         """Fetches all results from provided query.
@@ -288,6 +324,55 @@ class MySQLBase:
             self.logger.error(f"Unexpected error when executing query '{query}': {e}")
             raise
 
+    def execute_many(self, query, rows):
+        """Executes the provided query once for each set of parameters in one transaction, if any row fails
+        none are applied. Does not return results.
+
+        :param query: Query to execute.
+        :type query: str
+
+        :param rows: Parameters for each execution.
+        :type rows: list of tuple, list or dict
+
+        :raises pymysql.MySQLError: When there is an error interacting with the database.
+        :raises Exception: If any uncaught error happens.
+        """
+        try:
+            row_count = self._run_query(query, rows, None, many=True)
+            self.logger.query(query, f"[{len(rows)} rows]", f"{row_count} rows affected")
+        except pymysql.MySQLError as e:
+            self.logger.error(f"Was not able to execute '{query}' {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error when executing query '{query}': {e}")
+            raise
+
+    def stream(self, query: str, args=None):
+        """Yields the rows of a query one at a time from a server side cursor, so large tables are never held in memory.
+        Uses its own connection rather than one from the pool, the connection can not run other queries until
+        every row has been read and it is closed when the generator is.
+
+        :param query: Query to execute.
+        :type query: str
+
+        :param args: Parameters used with query. (optional)
+        :type args: tuple, list or dict
+
+        :return: Rows as dicts.
+        :rtype: Iterator[dict]
+
+        :raises pymysql.MySQLError: When there is an error interacting with the database.
+        """
+        connection = self.create_connection()
+        try:
+            with connection.cursor(SSDictCursor) as cursor:
+                cursor.execute(query, args)
+                self.logger.query(query, args, "streaming")
+                for row in cursor:
+                    yield row
+        finally:
+            connection.close()
+
     def execute_sensitive(self, query, args=None):
         """Executes the provide query to the MySQL database but with limited logging
         to avoid logging sensitive data. Does not return results.
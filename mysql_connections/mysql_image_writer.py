@@ -0,0 +1,73 @@
+import os
+from mysql_connections.mysql_base import MySQLBase
+
+# MySQL class for the image backfill. The user can read the image ids and URLs and write the measurement
+# columns of the image table, nothing else, so measuring images never needs the Root user.
+
+
+class Image_Writer(MySQLBase):
+    """Class for interacting with the MySQL database with permission to store image measurements only"""
+
+    # Columns update_image_metadata writes, the keys of utility_classes.image_derivatives.measure()
+    # ---Needs Updated with the grants in Root.create_db_users---
+    image_metadata_columns = ("image_width", "image_height", "image_color", "image_bytes", "image_placeholder")
+
+    def __init__(self):
+        """Creates Image Writer user class with set functions to read the image list and store measurements.
+        Inherits from the MySQLBase class"""
+        user = os.getenv("MYSQL_IMAGE_WRITER")
+        password = os.getenv("MYSQL_IMAGE_WRITER_PASSWORD")
+        super().__init__(user, password, "IMAGE_WRITER")
+
+    def update_image_metadata(self, image_id: int, measured: dict):
+        """Stores the measurements and placeholder of an image that does not have a placeholder yet.
+        Rows that already have one are left alone, so repeating the call does not fire the update triggers
+        and reload the catalog again.
+
+        :param image_id: Image to update.
+        :type image_id: int
+        :param measured: Value of each of image_metadata_columns.
+        :type measured: dict
+        :raises pymysql.MySQLError: When there is an error interacting with the database.
+        """
+        self.update_images_metadata([(image_id, measured)])
+
+    def update_images_metadata(self, results: list, replace: bool = False):
+        """Stores the measurements of many images in one transaction, so a failed batch stores none of them and can
+        simply be retried. See update_image_metadata().
+
+        :param results: (image_id, measured) pairs.
+        :type results: list[tuple[int, dict]]
+        :param replace: Also overwrite images that already have a placeholder.
+        :type replace: bool
+        :raises pymysql.MySQLError: When there is an error interacting with the database.
+        """
+        assignments = ", ".join(f"{column} = %s" for column in self.image_metadata_columns)
+        condition = "" if replace else " AND image_placeholder IS NULL"
+        query = f"UPDATE `image` SET {assignments} WHERE image_id = %s{condition};"
+        rows = [
+            [measured[column] for column in self.image_metadata_columns] + [image_id]
+            for image_id, measured in results
+        ]
+        if len(rows) == 1:
+            self.execute(query, rows[0])
+        elif rows:
+            self.execute_many(query, rows)
+
+    def stream_images(self, after_id: int = 0, unmeasured_only: bool = True):
+        """Yields the id and URL of every image, in id order, without loading the table into memory.
+
+        :param after_id: Only images with a larger id, to resume an earlier run.
+        :type after_id: int
+        :param unmeasured_only: Skip images that already have a placeholder.
+        :type unmeasured_only: bool
+        :return: Rows with image_id and image_URL.
+        :rtype: Iterator[dict]
+        :raises pymysql.MySQLError: When there is an error interacting with the database.
+        """
+        condition = " AND image_placeholder IS NULL" if unmeasured_only else ""
+        query = (
+            "SELECT image_id, image_URL FROM `VV.image` "
+            f"WHERE image_id > %s{condition} ORDER BY image_id ASC;"
+        )
+        return self.stream(query, [after_id])
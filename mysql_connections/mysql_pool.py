@@ -0,0 +1,286 @@
+import os
+import threading
+import time
+from typing import Callable, Optional
+from utility_classes.custom_logger import log
+
+# Thread-safe connection pool shared by every MySQLBase instance in a worker process.
+# Pools are keyed by connection target and user so View_User and Root never share connections.
+# Pools are rebuilt after a fork so gunicorn workers never reuse sockets opened by the master.
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out of the pool before the timeout."""
+
+
+class _PooledConnection:
+    """Book keeping for a single connection owned by the pool."""
+
+    __slots__ = ("connection", "created_at", "last_used", "overflow")
+
+    def __init__(self, connection, overflow: bool):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used = now
+        self.overflow = overflow
+
+
+class ConnectionPool:
+    """Pool of reusable database connections with checkout/return semantics."""
+
+    def __init__(
+        self,
+        name: str,
+        size: int = 2,
+        max_overflow: int = 2,
+        timeout: float = 10.0,
+        max_idle: float = 300.0,
+        max_lifetime: float = 3600.0,
+        ping_interval: float = 5.0,
+    ):
+        """Creates a connection pool.
+
+        :param name: Name used when logging pool events.
+        :type name: str
+
+        :param size: Number of connections kept open once created. Should match gunicorn --threads.
+        :type size: int
+
+        :param max_overflow: Extra connections allowed under burst load. These are closed on return.
+        :type max_overflow: int
+
+        :param timeout: Seconds to wait for a free connection before raising PoolTimeoutError.
+        :type timeout: float
+
+        :param max_idle: Seconds a connection may sit unused before it is closed on checkout.
+        :type max_idle: float
+
+        :param max_lifetime: Seconds after creation a connection is recycled.
+        :type max_lifetime: float
+
+        :param ping_interval: Connections idle longer than this are pinged on checkout.
+        :type ping_interval: float
+        """
+        self.name = name
+        self.size = size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self.logger = log("POOL")
+
+        self._lock = threading.Condition()
+        self._idle: list[_PooledConnection] = []
+        self._checked_out: dict[int, _PooledConnection] = {}
+        self._open = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.wait_time = 0.0
+
+    def acquire(self, factory: Callable[[], object]):
+        """Checks a connection out of the pool, creating one with factory if none are idle.
+
+        :param factory: Callable that opens a new connection.
+        :type factory: Callable
+
+        :return: An open connection that must be handed back with release().
+
+        :raises PoolTimeoutError: If the pool is exhausted for longer than the timeout.
+        :raises Exception: Any error raised by factory when opening a new connection.
+        """
+        start = time.monotonic()
+        waited = False
+        with self._lock:
+            while True:
+                pooled = self._take_idle()
+                if pooled is not None:
+                    break
+                if self._open < self.size + self.max_overflow:
+                    overflow = self._open >= self.size
+                    self._open += 1
+                    break
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self.timeouts += 1
+                    self.wait_time += time.monotonic() - start
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.timeout}s waiting for a connection from pool '{self.name}'"
+                    )
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                self._lock.wait(remaining)
+            self.wait_time += time.monotonic() - start
+
+        if pooled is not None and self._is_alive(pooled):
+            with self._lock:
+                self.hits += 1
+                self._checked_out[id(pooled.connection)] = pooled
+            return pooled.connection
+        if pooled is not None:  # Idle connection failed its ping, reuse its slot
+            overflow = pooled.overflow
+
+        try:
+            connection = factory()
+            connection.autocommit(True)  # Pooled connections must not hold a read snapshot between checkouts
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._lock.notify()
+            raise
+        pooled = _PooledConnection(connection, overflow)
+        with self._lock:
+            self.misses += 1
+            self._checked_out[id(connection)] = pooled
+        return connection
+
+    def release(self, connection, discard: bool = False):
+        """Returns a connection to the pool.
+
+        :param connection: Connection previously returned by acquire().
+
+        :param discard: If True the connection is closed instead of being reused.
+        :type discard: bool
+        """
+        with self._lock:
+            pooled = self._checked_out.pop(id(connection), None)
+            if pooled is None:  # Not ours, just close it
+                self._close(connection)
+                return
+            now = time.monotonic()
+            if (
+                discard
+                or pooled.overflow
+                or now - pooled.created_at > self.max_lifetime
+            ):
+                self.discarded += 1
+                self._open -= 1
+                self._close(connection)
+            else:
+                pooled.last_used = now
+                self._idle.append(pooled)
+            self._lock.notify()
+
+    def close_all(self):
+        """Closes every idle connection. Checked out connections are closed when they are returned."""
+        with self._lock:
+            while self._idle:
+                pooled = self._idle.pop()
+                self._open -= 1
+                self._close(pooled.connection)
+            self._lock.notify_all()
+
+    def stats(self) -> dict:
+        """Returns counters used to size the pool under load.
+
+        :return: Pool configuration, occupancy and hit/miss/wait counters.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": len(self._checked_out),
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "recycled": self.recycled,
+                "discarded": self.discarded,
+                "wait_time": self.wait_time,
+            }
+
+    def _take_idle(self) -> Optional[_PooledConnection]:
+        """Pops the most recently used idle connection, closing any that have expired. Caller must hold the lock."""
+        now = time.monotonic()
+        while self._idle:
+            pooled = self._idle.pop()
+            if (
+                now - pooled.last_used > self.max_idle
+                or now - pooled.created_at > self.max_lifetime
+            ):
+                self.recycled += 1
+                self._open -= 1
+                self._close(pooled.connection)
+                continue
+            return pooled
+        return None
+
+    def _is_alive(self, pooled: _PooledConnection) -> bool:
+        """Pings connections that have been idle for a while. Dead connections are closed."""
+        if time.monotonic() - pooled.last_used < self.ping_interval:
+            return True
+        try:
+            pooled.connection.ping(reconnect=False)
+            return True
+        except Exception as e:
+            self.logger.info(f"Dropping dead connection from pool '{self.name}': {e}")
+            with self._lock:
+                self.recycled += 1
+            self._close(pooled.connection)
+            return False
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing pooled connection: {e}")
+
+
+_pools: dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_pools_pid = os.getpid()
+
+
+def get_pool(host, port, user, db) -> ConnectionPool:
+    """Returns the pool for the provided connection target, creating it on first use.
+    Pool settings are pulled from env.
+
+    :return: The worker wide pool for this target and user.
+    :rtype: ConnectionPool
+    """
+    global _pools_pid
+    key = (host, port, user, db)
+    with _pools_lock:
+        if _pools_pid != os.getpid():  # Forked, connections belong to the parent process
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                name=f"{user}@{host}:{port}/{db}",
+                size=int(os.getenv("MYSQL_POOL_SIZE", 2)),
+                max_overflow=int(os.getenv("MYSQL_POOL_MAX_OVERFLOW", 2)),
+                timeout=float(os.getenv("MYSQL_POOL_TIMEOUT", 10)),
+                max_idle=float(os.getenv("MYSQL_POOL_MAX_IDLE", 300)),
+                max_lifetime=float(os.getenv("MYSQL_POOL_MAX_LIFETIME", 3600)),
+                ping_interval=float(os.getenv("MYSQL_POOL_PING_INTERVAL", 5)),
+            )
+            _pools[key] = pool
+        return pool
+
+
+def pool_stats() -> list[dict]:
+    """Returns stats for every pool in this worker."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
+
+
+def reset_pools():
+    """Closes and forgets every pool in this worker."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
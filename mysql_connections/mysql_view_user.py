@@ -6,11 +6,16 @@ from data_classes.category import Category
 from data_classes.image import Image
 from data_classes.project import Project
 from data_classes.user import User
+from utility_classes.slug import slugify
+from utility_classes.metrics import db_method
 
 
 class View_User(MySQLBase):
     """Class for interacting with the MySQL database with view(read) only permissions"""
 
+    # CatalogSnapshot installed by the app. When set, catalog reads are served from memory.
+    snapshot = None
+
     def __init__(self):
         """Creates View user class with set functions to execute set queries to get data from the database.
         Inherits from the MySQLBase class"""
@@ -18,6 +23,21 @@ class View_User(MySQLBase):
         password = os.getenv("MYSQL_VIEW_USER_PASSWORD")
         super().__init__(user, password, "VIEW_USER")
 
+    def catalog(self):
+        """Returns the in memory catalog if a snapshot is installed and loaded, otherwise None.
+        Callers fall back to querying the database when None is returned.
+
+        :rtype: Catalog or None
+        """
+        if View_User.snapshot is None:
+            return None
+        try:
+            return View_User.snapshot.get()
+        except Exception as e:
+            self.logger.error(f"Catalog snapshot unavailable, querying database: {e}")
+            return None
+
+    @db_method
     def get_all_categories(self, ordered: bool = True) -> list[Category]:
         """Returns a list of all Categories from the database or an empty list if none are found.
 
@@ -27,6 +47,9 @@ class View_User(MySQLBase):
         :rtype: List[Category]
         :raises Exception: If there is any error in getting the list of categories from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_all_categories(ordered)
         try:
             if ordered:
                 self.logger.info("Getting all categories - Sorted")
@@ -37,36 +60,35 @@ class View_User(MySQLBase):
                 self.logger.info("Getting all categories")
                 query = "SELECT * FROM Portfolio.`VV.category`;"
             results = self.fetch_all(query)
-            categories: list[Category] = []
-            if results is not None:
-                for result in results:
-                    try:
-                        categories.append(Category.from_dict(result))
-                    except Exception as e:
-                        self.logger.error(
-                            f"Failed to create category from {result} -> {e}"
-                        )
-                        continue
-            return categories
+            return Category.from_rows(
+                results,
+                on_error=lambda result, e: self.logger.error(
+                    f"Failed to create category from {result} -> {e}"
+                ),
+            )
         except Exception as e:
             self.logger.error(f"Failed to get categories: {e}")
             raise Exception(f"Failed to get categories: {e}")
 
-    def get_category_by_title(self, title: str) -> Optional[Category]:
-        """Returns Categories object if one with the same title provided is found in the database, otherwise returns None.
+    @db_method
+    def get_category_by_slug(self, slug: str) -> Optional[Category]:
+        """Returns Categories object if one with the same slug provided is found in the database, otherwise returns None.
 
-        :param title: Title of Category to pull from database.
-        :type title: str
-        :return: Category object from the database with from the provided title.
+        :param slug: Slug of Category to pull from database. Titles are converted to slugs.
+        :type slug: str
+        :return: Category object from the database with from the provided slug.
         :rtype: Category or None
         :raises Exception: If there is any error in getting the category from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_category_by_slug(slug)
         try:
             category = None
-            self.logger.info(f"Getting category by {title}")
-            args = [title]
+            self.logger.info("Getting category by %s", slug)
+            args = [slugify(slug)]
             query = (
-                "SELECT * FROM Portfolio.`VV.category` WHERE category_title LIKE %s;"
+                "SELECT * FROM Portfolio.`VV.category` WHERE category_slug = %s;"
             )
             results = self.fetch_all(query, args)
             if results is not None:
@@ -79,9 +101,10 @@ class View_User(MySQLBase):
                     return None
             return category
         except Exception as e:
-            self.logger.error(f"Failed to get category '{title}': {e}")
-            raise Exception(f"Failed to get category '{title}': {e}")
+            self.logger.error(f"Failed to get category '{slug}': {e}")
+            raise Exception(f"Failed to get category '{slug}': {e}")
 
+    @db_method
     def get_all_projects(self) -> list[Project]:
         """Returns a list of all Projects from the database or an empty list if none are found.
 
@@ -89,25 +112,24 @@ class View_User(MySQLBase):
         :rtype: List[Project]
         :raises Exception: If there is any error in getting projects from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_all_projects()
         try:
             self.logger.info("Getting all projects")
             query = "SELECT * FROM Portfolio.`VV.project`;"
             results = self.fetch_all(query)
-            projects = []
-            if results is not None:
-                for result in results:
-                    try:
-                        projects.append(Project.from_dict(result))
-                    except Exception as e:
-                        self.logger.error(
-                            f"Failed to create project from {result}: {e}"
-                        )
-                        continue
-            return projects
+            return Project.from_rows(
+                results,
+                on_error=lambda result, e: self.logger.error(
+                    f"Failed to create project from {result}: {e}"
+                ),
+            )
         except Exception as e:
             self.logger.error(f"Failed to get all projects: {e}")
             raise Exception(f"Failed to get all projects: {e}")
 
+    @db_method
     def get_projects_by_category(self, id: int, ordered: bool = True) -> list[Project]:
         """Returns a list of all Projects from the database from provided Category or an empty list if none are found.
 
@@ -119,69 +141,67 @@ class View_User(MySQLBase):
         :rtype: List[Project]
         :raises Exception: If there is any error in getting projects from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_projects_by_category(id, ordered)
         try:
             args = [id]
             if ordered:  # If true get project order by ASC on project date
-                self.logger.info(f"Getting all projects from category {id} - Sorted")
+                self.logger.info("Getting all projects from category %s - Sorted", id)
                 query = "Select * from `VV.project` as project left join `VV.image` as image on project.project_image_id = image.image_id WHERE category_id = %s ORDER BY project_date ASC;"
             else:
-                self.logger.info(f"Getting all projects from category {id}")
+                self.logger.info("Getting all projects from category %s", id)
                 query = "Select * from `VV.project` as project left join `VV.image` as image on project.project_image_id = image.image_id WHERE category_id = %s;"
             results = self.fetch_all(query, args)
-            projects = []
-            if results is not None:
-                for result in results:
-                    try:
-                        projects.append(Project.from_dict(result))
-                    except Exception as e:
-                        self.logger.error(
-                            f"Failed to create project from {result}: {e}"
-                        )
-                        continue
-            return projects
+            return Project.from_rows(
+                results,
+                on_error=lambda result, e: self.logger.error(
+                    f"Failed to create project from {result}: {e}"
+                ),
+            )
         except Exception as e:
             self.logger.error(f"Failed to get projects from category {id}: {e}")
             raise Exception(f"Failed to get projects from category {id}: {e}")
 
-    def get_projects_by_category_title(
-        self, title: str, ordered: bool = True
+    @db_method
+    def get_projects_by_category_slug(
+        self, slug: str, ordered: bool = True
     ) -> list[Project]:
         """Returns a list of all Projects from the database from provided Category or an empty list if none are found.
 
-        :param tile: Title of the parent category.
-        :type title: str
+        :param slug: Slug of the parent category. Titles are converted to slugs.
+        :type slug: str
         :param ordered: (Default: True) If true returns Projects stored by project_date.
         :type ordered: Bool
         :return: A list of Project objects can be empty.
         :rtype: List[Project]
         :raises Exception: If there is any error in getting projects from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_projects_by_category_slug(slug, ordered)
         try:
-            args = [title]
+            args = [slugify(slug)]
             if ordered:  # If true get project order by ASC on project date
                 self.logger.info(
-                    f"Getting all projects from category '{title}' - Sorted"
+                    "Getting all projects from category '%s' - Sorted", slug
                 )
-                query = "Select * from `VV.project` as project left join `VV.image` as image on project.project_image_id = image.image_id; WHERE category_title LIKE %s ORDER BY project_date ASC;"
+                query = "Select * from `VV.project` as project join `VV.category` as category on category.category_id = project.category_id left join `VV.image` as image on project.project_image_id = image.image_id WHERE category.category_slug = %s ORDER BY project_date ASC;"
             else:
-                self.logger.info(f"Getting all projects from category '{title}'")
-                query = "Select * from `VV.project` as project left join `VV.image` as image on project.project_image_id = image.image_id; WHERE category_title LIKE %s;"
+                self.logger.info("Getting all projects from category '%s'", slug)
+                query = "Select * from `VV.project` as project join `VV.category` as category on category.category_id = project.category_id left join `VV.image` as image on project.project_image_id = image.image_id WHERE category.category_slug = %s;"
             results = self.fetch_all(query, args)
-            projects = []
-            if results is not None:
-                for result in results:
-                    try:
-                        projects.append(Project.from_dict(result))
-                    except Exception as e:
-                        self.logger.error(
-                            f"Failed to create project from {result}: {e}"
-                        )
-                        continue
-            return projects
+            return Project.from_rows(
+                results,
+                on_error=lambda result, e: self.logger.error(
+                    f"Failed to create project from {result}: {e}"
+                ),
+            )
         except Exception as e:
-            self.logger.error(f"Failed to get projects from category {title}: {e}")
-            raise Exception(f"Failed to get projects from category {title}: {e}")
+            self.logger.error(f"Failed to get projects from category {slug}: {e}")
+            raise Exception(f"Failed to get projects from category {slug}: {e}")
 
+    @db_method
     def get_project(self, id: int) -> Optional[Project]:
         """Returns a Project object if one with the same id provided is found in the database, otherwise returns None.
 
@@ -191,10 +211,13 @@ class View_User(MySQLBase):
         :rtype: Project or None
         :raises Exception: If there is any error in getting the project from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_project(id)
         try:
             project = None
             args = [f"{id}"]
-            self.logger.info(f"Getting project by id {id}")
+            self.logger.info("Getting project by id %s", id)
             query = "SELECT * FROM Portfolio.`VV.project` WHERE project_id = %s;"
             results = self.fetch_all(query, args)
             if results is not None:
@@ -210,24 +233,28 @@ class View_User(MySQLBase):
             self.logger.error(f"Failed to get project by id {id}: {e}")
             raise Exception(f"Failed to get project by id {id}: {e}")
 
-    def get_project_by_title(self, project_title: str, category_title: str):
-        """Returns a Project object if one with the same title provided and category title is found in the database. Otherwise returns None.
+    @db_method
+    def get_project_by_slug(self, project_slug: str, category_slug: str):
+        """Returns a Project object if one with the same slug provided and category slug is found in the database. Otherwise returns None.
 
-        :param project_title: Title of project.
-        :type project_title: str
-        :param category_title: Title of the category the project should be in.
-        :type category_title: str
-        :return:  A project object of the same title from the database.
+        :param project_slug: Slug of project. Titles are converted to slugs.
+        :type project_slug: str
+        :param category_slug: Slug of the category the project should be in.
+        :type category_slug: str
+        :return:  A project object of the same slug from the database.
         :rtype: Project or None
         :raises Exception: If there is any error in getting the project from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_project_by_slug(project_slug, category_slug)
         try:
             project = None
-            args = [category_title, project_title]
+            args = [slugify(category_slug), slugify(project_slug)]
             self.logger.info(
-                f"Getting project: {project_title}  from category: {category_title}"
+                "Getting project: %s  from category: %s", project_slug, category_slug
             )
-            query = "SELECT * FROM `VV.project` AS project LEFT JOIN `VV.category` AS category ON category.category_id = project.category_id WHERE category.category_title LIKE %s AND project_title LIKE %s;"
+            query = "SELECT * FROM `VV.project` AS project JOIN `VV.category` AS category ON category.category_id = project.category_id WHERE category.category_slug = %s AND project.project_slug = %s;"
             results = self.fetch_all(query, args)
             if results is not None:
                 try:
@@ -240,12 +267,90 @@ class View_User(MySQLBase):
             return project
         except Exception as e:
             self.logger.error(
-                f"Failed to get project {project_title} in category {category_title}: {e}"
+                f"Failed to get project {project_slug} in category {category_slug}: {e}"
+            )
+            raise Exception(
+                f"Failed to get project {project_slug} in category {category_slug}: {e}"
+            )
+
+    @db_method
+    def get_project_page(
+        self, category_slug: str, project_slug: str
+    ) -> Optional[Tuple[Project, Category, list[Image]]]:
+        """Returns everything needed to render a project page with one query: the project, its category and its images ordered by weight.
+        Returns None if no project with the provided slug is found in the category.
+
+        :param category_slug: Slug of the category the project should be in. Titles are converted to slugs.
+        :type category_slug: str
+        :param project_slug: Slug of project.
+        :type project_slug: str
+        :return: A tuple of the Project, its Category and a list of its Images that can be empty.
+        :rtype: Tuple[Project, Category, list[Image]] or None
+        :raises Exception: If there is any error in getting the project page from the database.
+        """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_project_page(category_slug, project_slug)
+        try:
+            args = [slugify(category_slug), slugify(project_slug)]
+            self.logger.info(
+                "Getting project page: %s from category: %s", project_slug, category_slug
+            )
+            query = (
+                "SELECT project.project_id, project.project_title, project.project_date, project.project_desc, project.category_id, project.project_image_id, project.project_slug, "
+                "category.category_title, category.category_order, category.category_slug, "
+                "image.image_id, image.image_title, image.image_desc, image.image_URL, image.image_weight, "
+                "image.image_width, image.image_height, image.image_color, image.image_bytes, image.image_placeholder "
+                "FROM `VV.project` AS project "
+                "JOIN `VV.category` AS category ON category.category_id = project.category_id "
+                "LEFT JOIN `VV.image` AS image ON image.project_id = project.project_id "
+                "WHERE category.category_slug = %s AND project.project_slug = %s "
+                "ORDER BY project.project_id ASC, image.image_weight ASC;"
+            )
+            results = self.fetch_all(query, args)
+            if results is None:
+                return None
+
+            first = results[0]
+            try:
+                project = Project.from_dict(
+                    {
+                        "project_id": first["project_id"],
+                        "project_title": first["project_title"],
+                        "project_date": first["project_date"],
+                        "project_desc": first["project_desc"],
+                        "category_id": first["category_id"],
+                        "project_image_id": first["project_image_id"],
+                        "project_slug": first.get("project_slug"),
+                    }
+                )
+                category = Category.from_dict(first)
+            except Exception as e:
+                self.logger.error(f"Failed to create project page from {first}: {e}")
+                return None
+
+            image_rows = []
+            for result in results:
+                if result["project_id"] != first["project_id"]:
+                    break  # Only the first matching project is returned
+                if result["image_id"] is not None:  # Project without images
+                    image_rows.append(result)
+            images = Image.from_rows(
+                image_rows,
+                on_error=lambda result, e: self.logger.error(
+                    f"Failed to create image from {result}: {e}"
+                ),
+            )
+            return (project, category, images)
+        except Exception as e:
+            self.logger.error(
+                f"Failed to get project page {project_slug} in category {category_slug}: {e}"
             )
             raise Exception(
-                f"Failed to get project {project_title} in category {category_title}: {e}"
+                f"Failed to get project page {project_slug} in category {category_slug}: {e}"
             )
 
+    @db_method
     def get_all_images(self) -> list[Image]:
         """Returns a list of all Images from the database or an empty list if none are found.
 
@@ -253,23 +358,24 @@ class View_User(MySQLBase):
         :rtype: list[Image]
         :raises Exception: If there is any error in getting Images from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_all_images()
         try:
             self.logger.info("Getting all images")
             query = "SELECT * FROM Portfolio.`VV.image`;"
             results = self.fetch_all(query)
-            images = []
-            if results is not None:
-                for result in results:
-                    try:
-                        images.append(Image.from_dict(result))
-                    except Exception as e:
-                        self.logger.error(f"Failed to create image from {result}: {e}")
-                        continue
-            return images
+            return Image.from_rows(
+                results,
+                on_error=lambda result, e: self.logger.error(
+                    f"Failed to create image from {result}: {e}"
+                ),
+            )
         except Exception as e:
             self.logger.error(f"Failed to get all images: {e}")
             raise Exception(f"Failed to get all images: {e}")
 
+    @db_method
     def get_project_images(self, id: int) -> list[Image]:
         """Returns a list of all Images for a specific project base on project id or an empty list if none are found.
 
@@ -279,24 +385,25 @@ class View_User(MySQLBase):
         :rtype: list[Image]
         :raises Exception: If there is any error in getting Images from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_project_images(id)
         try:
             args = [f"{id}"]
-            self.logger.info(f"Getting all images for project id {id}")
+            self.logger.info("Getting all images for project id %s", id)
             query = "SELECT * FROM Portfolio.`VV.image` WHERE project_id = %s ORDER BY image_weight ASC;"
             results = self.fetch_all(query, args)
-            images = []
-            if results is not None:
-                for result in results:
-                    try:
-                        images.append(Image.from_dict(result))
-                    except Exception as e:
-                        self.logger.error(f"Failed to create image from {result}: {e}")
-                        continue
-            return images
+            return Image.from_rows(
+                results,
+                on_error=lambda result, e: self.logger.error(
+                    f"Failed to create image from {result}: {e}"
+                ),
+            )
         except Exception as e:
             self.logger.error(f"Failed to get all images by project id {id}: {e}")
             raise Exception(f"Failed to get all images by project id {id}: {e}")
 
+    @db_method
     def get_image(self, id: int) -> Optional[Image]:
         """Returns a Image object if one with the same id provided is found in the database, otherwise returns None.
 
@@ -306,10 +413,13 @@ class View_User(MySQLBase):
         :rtype: Image or None
         :raises Exception: If there is any error in getting the Image from the database.
         """
+        catalog = self.catalog()
+        if catalog is not None:
+            return catalog.get_image(id)
         try:
             image = None
             args = [f"{id}"]
-            self.logger.info(f"Getting image by id {id}")
+            self.logger.info("Getting image by id %s", id)
             query = "SELECT * FROM Portfolio.`VV.image` WHERE image_id = %s;"
             results = self.fetch_all(query, args)
             if results is not None:
@@ -323,6 +433,7 @@ class View_User(MySQLBase):
             self.logger.error(f"Failed to get image by id {id}: {e}")
             raise Exception(f"Failed to get image by id {id}: {e}")
 
+    @db_method
     def check_user_exist_and_password(
         self, user_name: str, user_password: str
     ) -> Tuple[bool, bool]:
@@ -340,10 +451,10 @@ class View_User(MySQLBase):
         password_match = False
         query = "SELECT * FROM `VV.users` WHERE user_name=%s"
         try:
-            self.logger.info(f"Checking if username '{user_name}' exist")
+            self.logger.info("Checking if username '%s' exist", user_name)
             result = self.fetch_all_sensitive(query, user_name)
             if result is None:
-                self.logger.info(f"Unable to find username '{user_name}'")
+                self.logger.info("Unable to find username '%s'", user_name)
                 return (name_match, password_match)
             try:
                 db_user = User.from_dict(result[0])  # creates user from query data
@@ -356,7 +467,7 @@ class View_User(MySQLBase):
                 name_match = True
                 # Compares password to hash
                 self.logger.info(
-                    f"Checking if username '{user_name}' entered password matches hashed"
+                    "Checking if username '%s' entered password matches hashed", user_name
                 )
                 if check_password_hash(db_user.user_password, user_password):
                     password_match = True
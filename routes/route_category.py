@@ -1,5 +1,5 @@
 import urllib.parse
-from flask import Blueprint, jsonify, flash, abort, render_template
+from flask import Blueprint, current_app, jsonify, flash, abort, render_template
 from utility_classes import custom_logger
 from mysql_connections import mysql_view_user 
 from data_classes.category import Category
@@ -22,13 +22,14 @@ def display_category_projects(url_category):
     about = "about"
 
     if url_category.lower() ==  about:
-        flash("Welcome!", "success" )
         return render_template("about.html")
 
     view_user = mysql_view_user.View_User() #Build view user
     
     try:
-        current_category = view_user.get_category_by_title(url_category) #Checks if the provide url category exists
+        current_category = current_app.extensions["category_cache"].get_by_slug(url_category) #Checks the cached nav bar categories first
+        if not current_category:
+            current_category = view_user.get_category_by_slug(url_category) #Checks if the provide url category exists
     except Exception as e:
         logger.error(f"Error looking up category {url_category}: {e}")
         flash(f"An Error occurred when attempting to look up '{url_category}'", "error")
@@ -39,8 +40,6 @@ def display_category_projects(url_category):
         flash(f"Category '{url_category}' not found", "error" )
         abort(404)
 
-    flash("Welcome!", "success")
-
     
     projects = view_user.get_projects_by_category(current_category.category_id, False) #Gets list of projects per the current category
 
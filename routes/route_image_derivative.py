@@ -0,0 +1,95 @@
+from flask import Blueprint, current_app, abort, redirect, send_file, request, url_for, g
+from utility_classes import custom_logger
+from utility_classes.image_derivatives import MIME_TYPES, SIZES, url_hash, variant_widths
+from mysql_connections import mysql_view_user
+from routes.route_image_proxy import proxy_url
+
+
+derivative_routes = Blueprint('derivative', __name__)
+
+@derivative_routes.route('<int:image_id>/<size>.<fmt>')
+def display_image_derivative(image_id, size, fmt):
+    logger = custom_logger.log("DERIVATIVE") #Build Logger
+    store = current_app.extensions['image_store']
+    if fmt not in store.formats or size not in SIZES:
+        abort(404)
+
+    view_user = mysql_view_user.View_User() #Build view user
+
+    try:
+        image = view_user.get_image(image_id)
+    except Exception as e:
+        logger.error(f"Error looking up image {image_id}: {e}")
+        abort(500)
+
+    if image is None:
+        logger.error(f"Image ID '{image_id}' not found.")
+        abort(404)
+
+    path = store.lookup(image.image_url, size, fmt)
+    if path is None: #Resized on a background thread, the page shows the original until it is ready
+        logger.debug("No %s %s of image %s yet, serving original", size, fmt, image_id)
+        store.make_later(image.image_url, size, fmt)
+        return redirect(proxy_url(image.image_url))
+
+    g.fingerprinted = request.args.get('v') == url_hash(image.image_url) #URL names this exact original, cached as immutable
+    return send_file(path, mimetype=MIME_TYPES[fmt], conditional=True)
+
+
+@derivative_routes.app_template_global()
+def derivative_url(image, size, fmt=None):
+    """URL of a resized copy of an image for templates, the original image through the proxy when there is no derivative.
+
+    :param image: The image to link.
+    :type image: Image
+    :param size: Key of image_derivatives.SIZES.
+    :type size: str
+    :param fmt: Format of the copy, defaults to the most widely supported format of the store.
+    :type fmt: str or None
+    :rtype: str
+    """
+    store = current_app.extensions['image_store']
+    if not store.enabled or image.image_id is None:
+        return proxy_url(image.image_url)
+    fmt = fmt or store.formats[-1]
+    return url_for('derivative.display_image_derivative', image_id=image.image_id, size=size, fmt=fmt, v=url_hash(image.image_url))
+
+
+@derivative_routes.app_template_global()
+def derivative_srcset(image, fmt=None):
+    """srcset of every size of an image, so the browser picks the smallest copy that fills the slot.
+    Empty when there is no derivative or the image has not been measured yet.
+
+    :param image: The image to link.
+    :type image: Image
+    :param fmt: Format of the copies, defaults to the format derivative_url defaults to.
+    :type fmt: str or None
+    :rtype: str
+    """
+    store = current_app.extensions['image_store']
+    if not store.enabled or image.image_id is None or image.image_width is None or image.image_height is None:
+        return ""
+    return ", ".join(
+        f"{derivative_url(image, size, fmt)} {width}w"
+        for size, width in variant_widths(image.image_width, image.image_height)
+    )
+
+
+@derivative_routes.app_template_global()
+def derivative_sources(image, size):
+    """Picture sources for the formats smaller than the one derivative_url links, smallest first.
+
+    :param image: The image to link.
+    :type image: Image
+    :param size: Key of image_derivatives.SIZES, linked alone when the image has not been measured yet.
+    :type size: str
+    :return: (MIME type, srcset) pairs, empty when there is no derivative.
+    :rtype: list
+    """
+    store = current_app.extensions['image_store']
+    if not store.enabled or image.image_id is None:
+        return []
+    return [
+        (MIME_TYPES[fmt], derivative_srcset(image, fmt) or derivative_url(image, size, fmt))
+        for fmt in store.formats[:-1]
+    ]
@@ -0,0 +1,46 @@
+from flask import Blueprint, current_app, abort, redirect, send_file, url_for
+from itsdangerous import BadSignature, URLSafeSerializer
+from utility_classes import custom_logger
+from utility_classes.image_proxy import ProxyError
+
+
+proxy_routes = Blueprint('proxy', __name__)
+
+def url_signer():
+    """Signs image URLs with the app secret, the proxy only fetches URLs the site itself linked."""
+    return URLSafeSerializer(current_app.secret_key, salt='image-proxy')
+
+@proxy_routes.route('<token>')
+def proxy_image(token):
+    logger = custom_logger.log("PROXY") #Build Logger
+    try:
+        url = url_signer().loads(token)
+    except BadSignature:
+        abort(404)
+
+    cache = current_app.extensions['image_proxy']
+    if not cache.enabled:
+        return redirect(url)
+
+    try:
+        image = cache.get(url)
+    except ProxyError as e: #The page still shows the image, just from the third party
+        logger.warning(f"Serving original for {url}: {e}")
+        return redirect(url)
+
+    #Range and If-None-Match/If-Modified-Since are answered by send_file, the body goes out through the server's sendfile
+    return send_file(image.path, mimetype=image.content_type, conditional=True, etag=image.digest)
+
+
+@proxy_routes.app_template_global()
+def proxy_url(url):
+    """Local URL of a third party image for templates, the URL itself when the proxy is off or it is not http.
+
+    :param url: URL of the image.
+    :type url: str
+    :rtype: str
+    """
+    cache = current_app.extensions['image_proxy']
+    if not cache.enabled or not str(url).startswith(('http://', 'https://')):
+        return url
+    return url_for('proxy.proxy_image', token=url_signer().dumps(url))
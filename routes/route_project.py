@@ -18,24 +18,30 @@ def display_project_images(url_category, url_project):
     view_user = mysql_view_user.View_User()  # Build view user
 
     try:
-        project = view_user.get_project_by_title(url_project, url_category)
+        page = view_user.get_project_page(
+            url_category, url_project
+        )  # Project, category and images in one query
     except Exception as e:
         logger.error(f"Error looking up project {url_project}: {e}")
         flash(f"An Error occurred when attempting to look up '{url_project}'", "error")
         abort(500)
 
-    logger.info(f"Project: {project}")
-    if project is None:
+    logger.debug("Project page: %s", page)
+    if page is None:
         logger.error(f"Project '{url_project}' not found in category '{url_category}'.")
         flash(
             f"Project '{url_project}' not found in category '{url_category}'.", "error"
         )
         abort(404)
 
-    images = view_user.get_project_images(project.project_id)
+    project, category, images = page
 
     current_url = request.path + "/"
 
     return render_template(
-        "project.html", project=project, images=images, current_url=current_url
+        "project.html",
+        project=project,
+        category=category,
+        images=images,
+        current_url=current_url,
     )
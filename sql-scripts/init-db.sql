@@ -2,7 +2,10 @@
 CREATE TABLE IF NOT EXISTS category (
     category_id TINYINT AUTO_INCREMENT PRIMARY KEY,
     category_title VARCHAR(100),
-    category_order TINYINT UNIQUE
+    category_order TINYINT UNIQUE,
+    category_slug VARCHAR(100) NOT NULL DEFAULT '',
+    -- Slugs are matched from the URL, filled in from the title by the slug triggers below
+    UNIQUE KEY category_slug_key (category_slug)
 );
 
 -- Create project table
@@ -13,6 +16,9 @@ CREATE TABLE IF NOT EXISTS project (
     project_desc VARCHAR(255),
     category_id TINYINT,
     project_image_id INT,
+    project_slug VARCHAR(255) NOT NULL DEFAULT '',
+    UNIQUE KEY project_category_slug_key (category_id, project_slug),
+    INDEX project_category_date (category_id, project_date),
     FOREIGN KEY (category_id) REFERENCES category(category_id) ON DELETE CASCADE
 );
 
@@ -24,6 +30,13 @@ CREATE TABLE IF NOT EXISTS image (
     image_URL VARCHAR(2083) NOT NULL,
     image_weight TINYINT,
     project_id INT,
+    -- Measured from the original image the first time it is resized, NULL until then
+    image_width SMALLINT UNSIGNED,
+    image_height SMALLINT UNSIGNED,
+    image_color CHAR(7),
+    image_bytes INT UNSIGNED,
+    image_placeholder VARCHAR(1024),
+    INDEX image_project_weight (project_id, image_weight),
     FOREIGN KEY (project_id) REFERENCES project(project_id) ON DELETE CASCADE
 );
 
@@ -44,15 +57,15 @@ CREATE TABLE IF NOT EXISTS site_meta (
 );
 
 CREATE or Replace view `VV.category` AS
-    SELECT category_id, category_title, category_order
+    SELECT category_id, category_title, category_order, category_slug
     FROM category;
 
 CREATE or Replace view `VV.project` AS
-    SELECT project_id, project_title, project_date, project_desc, project.category_id, project_image_id
+    SELECT project_id, project_title, project_date, project_desc, project.category_id, project_image_id, project_slug
     FROM project;
 
 CREATE or Replace view `VV.image` AS
-    SELECT image_id, image_title, image_desc, image_URL, image_weight, image.project_id
+    SELECT image_id, image_title, image_desc, image_URL, image_weight, image.project_id, image_width, image_height, image_color, image_bytes, image_placeholder
     FROM image;
 
 CREATE or Replace view `VV.users` AS
@@ -63,6 +76,102 @@ CREATE OR REPLACE VIEW `VV.site_meta` AS
 	SELECT meta_id, meta_key, meta_data, last_updated
 	FROM site_meta;
 
+-- Catalog version marker, bumped by triggers whenever portfolio content changes.
+-- The app reloads its in memory catalog when this row changes.
+INSERT IGNORE INTO site_meta (meta_key, meta_data) VALUES ('catalog_version', '{"version": 0}');
+
+DELIMITER $$
+
+-- URL slug for a title, must match utility_classes/slug.py.
+-- Apostrophes are dropped and every other run of characters outside a-z and 0-9 becomes one hyphen.
+CREATE FUNCTION slugify(title VARCHAR(255)) RETURNS VARCHAR(255) DETERMINISTIC
+BEGIN
+	DECLARE slug VARCHAR(255) DEFAULT '';
+	DECLARE ch VARCHAR(1);
+	DECLARE i INT DEFAULT 1;
+	DECLARE pending_dash BOOLEAN DEFAULT FALSE;
+	SET title = LOWER(title);
+	WHILE i <= CHAR_LENGTH(title) DO
+		SET ch = SUBSTRING(title, i, 1);
+		IF LOCATE(BINARY ch, 'abcdefghijklmnopqrstuvwxyz0123456789') > 0 THEN
+			IF pending_dash AND slug <> '' THEN
+				SET slug = CONCAT(slug, '-');
+			END IF;
+			SET slug = CONCAT(slug, ch);
+			SET pending_dash = FALSE;
+		ELSEIF ch <> '\'' THEN
+			SET pending_dash = TRUE;
+		END IF;
+		SET i = i + 1;
+	END WHILE;
+	RETURN slug;
+END$$
+
+-- Slug for a title that no other row uses, titles with the same slug get -2, -3, ... so the unique keys never
+-- reject an insert. id is the row being written, 0 or NULL for a new row.
+CREATE FUNCTION unique_category_slug(title VARCHAR(100), id INT) RETURNS VARCHAR(100) READS SQL DATA
+BEGIN
+	DECLARE base VARCHAR(100);
+	DECLARE slug VARCHAR(100);
+	DECLARE n INT DEFAULT 1;
+	SET base = slugify(title);
+	SET slug = base;
+	WHILE EXISTS (SELECT 1 FROM category WHERE category_slug = slug AND NOT (category_id <=> id)) DO
+		SET n = n + 1;
+		SET slug = CONCAT(LEFT(base, 99 - CHAR_LENGTH(n)), '-', n);
+	END WHILE;
+	RETURN slug;
+END$$
+
+CREATE FUNCTION unique_project_slug(category INT, title VARCHAR(255), id INT) RETURNS VARCHAR(255) READS SQL DATA
+BEGIN
+	DECLARE base VARCHAR(255);
+	DECLARE slug VARCHAR(255);
+	DECLARE n INT DEFAULT 1;
+	SET base = slugify(title);
+	SET slug = base;
+	WHILE EXISTS (
+		SELECT 1 FROM project WHERE category_id <=> category AND project_slug = slug AND NOT (project_id <=> id)
+	) DO
+		SET n = n + 1;
+		SET slug = CONCAT(LEFT(base, 254 - CHAR_LENGTH(n)), '-', n);
+	END WHILE;
+	RETURN slug;
+END$$
+
+CREATE TRIGGER category_insert_slug BEFORE INSERT ON category FOR EACH ROW SET NEW.category_slug = unique_category_slug(NEW.category_title, NEW.category_id)$$
+CREATE TRIGGER category_update_slug BEFORE UPDATE ON category FOR EACH ROW SET NEW.category_slug = unique_category_slug(NEW.category_title, NEW.category_id)$$
+CREATE TRIGGER project_insert_slug BEFORE INSERT ON project FOR EACH ROW SET NEW.project_slug = unique_project_slug(NEW.category_id, NEW.project_title, NEW.project_id)$$
+CREATE TRIGGER project_update_slug BEFORE UPDATE ON project FOR EACH ROW SET NEW.project_slug = unique_project_slug(NEW.category_id, NEW.project_title, NEW.project_id)$$
+
+-- A new image_URL is a new picture, its measurements and placeholder are made again the next time it is resized.
+CREATE TRIGGER image_update_measurements BEFORE UPDATE ON image FOR EACH ROW
+BEGIN
+	IF NOT (NEW.image_URL <=> OLD.image_URL) THEN
+		SET NEW.image_width = NULL, NEW.image_height = NULL, NEW.image_color = NULL,
+			NEW.image_bytes = NULL, NEW.image_placeholder = NULL;
+	END IF;
+END$$
+
+CREATE PROCEDURE bump_catalog_version()
+BEGIN
+	UPDATE site_meta
+	SET meta_data = JSON_SET(meta_data, '$.version', JSON_EXTRACT(meta_data, '$.version') + 1)
+	WHERE meta_key = 'catalog_version';
+END$$
+
+CREATE TRIGGER category_insert_version AFTER INSERT ON category FOR EACH ROW CALL bump_catalog_version()$$
+CREATE TRIGGER category_update_version AFTER UPDATE ON category FOR EACH ROW CALL bump_catalog_version()$$
+CREATE TRIGGER category_delete_version AFTER DELETE ON category FOR EACH ROW CALL bump_catalog_version()$$
+CREATE TRIGGER project_insert_version AFTER INSERT ON project FOR EACH ROW CALL bump_catalog_version()$$
+CREATE TRIGGER project_update_version AFTER UPDATE ON project FOR EACH ROW CALL bump_catalog_version()$$
+CREATE TRIGGER project_delete_version AFTER DELETE ON project FOR EACH ROW CALL bump_catalog_version()$$
+CREATE TRIGGER image_insert_version AFTER INSERT ON image FOR EACH ROW CALL bump_catalog_version()$$
+CREATE TRIGGER image_update_version AFTER UPDATE ON image FOR EACH ROW CALL bump_catalog_version()$$
+CREATE TRIGGER image_delete_version AFTER DELETE ON image FOR EACH ROW CALL bump_catalog_version()$$
+
+DELIMITER ;
+
 DELETE from category;
 DELETE from project;
 DELETE from image;
@@ -17,6 +17,11 @@ document.addEventListener("DOMContentLoaded", function() {
     const images = document.querySelectorAll('.project-image');
 
     images.forEach(function(img) {
+        // Tiles of measured images are classed by the server, so the grid is laid out before they load
+        if (img.closest('.gallery').hasAttribute('data-sized')) {
+            return;
+        }
+
         img.onload = function() {
             const width = img.naturalWidth;
             const height = img.naturalHeight;
@@ -41,4 +46,21 @@ document.addEventListener("DOMContentLoaded", function() {
             img.onload();
         }
     });
+});
+
+document.addEventListener("DOMContentLoaded", function() {
+    // Placeholders stay behind transparent images once they load, so they are removed
+    const placeholders = document.querySelectorAll('img[data-placeholder]');
+
+    placeholders.forEach(function(img) {
+        function clearPlaceholder() {
+            img.style.background = '';
+        }
+
+        if (img.complete) {
+            clearPlaceholder();
+        } else {
+            img.addEventListener('load', clearPlaceholder);
+        }
+    });
 });
\ No newline at end of file
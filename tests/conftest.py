@@ -4,11 +4,15 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pytest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
 
 from app import app, create_app
 from data_classes.category import Category
+from data_classes.project import Project
 from routes.route_category import category_routes
+from mysql_connections import mysql_pool
 
 # To Run Test set Flask_environment to 'Test' and run 'coverage run -m pytest -sv'
 # To generate coverage report run 'Coverage' html
@@ -33,6 +37,22 @@ def disable_site_meta_cache_mock():
 """
 
 
+# Clears the connection pools so mocked connections never leak between tests
+@pytest.fixture(autouse=True, scope="function")
+def reset_connection_pools():
+    mysql_pool.reset_pools()
+    yield
+    mysql_pool.reset_pools()
+
+
+# Clears the category cache so each test loads the categories it mocks
+@pytest.fixture(autouse=True, scope="function")
+def reset_category_cache():
+    app.extensions["category_cache"].invalidate()
+    yield
+    app.extensions["category_cache"].invalidate()
+
+
 @pytest.fixture(scope="function")
 def test_app_client_and_mocks():
     mock_logger_instance = MagicMock()
@@ -80,6 +100,11 @@ def test_project_client_and_mocks():
         # Mocking View_User
         mock_view_user = MagicMock()
         MockViewUser.return_value = mock_view_user
+        mock_view_user.get_project_page.return_value = (
+            Project("test"),
+            Category("test", 1, 1),
+            [],
+        )
 
         # Mocking the get_navbar context processor
         app_view_user.get_all_categories.return_value = [Category("test", 1, 1)]
@@ -106,6 +131,21 @@ def test_image_client_and_mocks():
         yield client, mock_view_user
 
 
+@pytest.fixture(scope="function")
+def test_derivative_client_and_mocks():
+    app.testing = True
+    with app.test_client() as client, patch(
+        "routes.route_image_derivative.mysql_view_user.View_User"
+    ) as MockViewUser:
+
+        # Mocking View_User
+        mock_view_user = MagicMock()
+        MockViewUser.return_value = mock_view_user
+
+        # Yield the client and all mocks as a tuple
+        yield client, mock_view_user
+
+
 @pytest.fixture(scope="function")
 def test_dashboard_client_and_mocks():
     app.testing = True
@@ -150,3 +190,36 @@ def mock_db(mocker):
     mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
 
     return mock_connection, mock_cursor
+
+
+@pytest.fixture
+def upstream():
+    """Local HTTP server standing in for a third party image host.
+    Add responses with upstream.files[path] = (content_type, body), upstream.requests counts requests per path.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            server.requests[self.path] = server.requests.get(self.path, 0) + 1
+            if self.path not in server.files:
+                self.send_error(404)
+                return
+            content_type, body = server.files[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.files = {}
+    server.requests = {}
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)  # Short poll so shutdown is quick
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -151,7 +151,7 @@ def test_index_redirect(test_app_client_and_mocks):
         category_view_user = MagicMock()
         CategoryViewUser.return_value = category_view_user
 
-        category_view_user.get_category_by_title.return_value = Category("test", 1, 1)
+        category_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
 
         response = client.get("/", follow_redirects=True)
 
@@ -169,11 +169,11 @@ def test_index_redirect_no_categories(test_app_client_and_mocks):
         category_view_user = MagicMock()
         CategoryViewUser.return_value = category_view_user
 
-        category_view_user.get_category_by_title.return_value = []
+        category_view_user.get_category_by_slug.return_value = []
 
         response = client.get("/", follow_redirects=True)
 
-        assert response.request.path == "/portfolio/About"
+        assert response.request.path == "/portfolio/about"
         assert response.status_code == 200
 
 
@@ -6,6 +6,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 from app import app
 from datetime import date
+from dataclasses import FrozenInstanceError
 from app import database_setup, category_list
 from data_classes.category import Category
 from data_classes.project import Project
@@ -39,7 +40,7 @@ def test_category_create_from_dict_success():
         assert cat.category_title == "Title"
         assert cat.category_order == 2
         mock_logger.return_value.debug.assert_any_call(
-            f"Successfully created Category: {cat}"
+            "Successfully created Category: %s", cat
         )
 
 
@@ -89,3 +90,49 @@ def test_category_create_from_dict_unexpected_exception():
         mock_logger.return_value.error.assert_called_once_with(
             f"Unexpected error when creating Category: Unexpected, data: {data}"
         )
+
+
+def test_category_from_rows():
+    rows = [
+        {"category_id": 1, "category_title": "Title", "category_order": 2},
+        {"category_id": 2, "category_title": "Other", "category_order": 1, "category_slug": "other-slug"},
+    ]
+    with patch("data_classes.category.log") as mock_logger, patch(
+        "data_classes.rows.log"
+    ) as mock_rows_logger:
+        categories = Category.from_rows(rows)
+
+    assert categories == [Category("Title", 1, 2), Category("Other", 2, 1, "other-slug")]
+    mock_logger.assert_not_called()  # No per row logger
+    mock_rows_logger.return_value.debug.assert_called_once_with(
+        "Created %s %s objects from rows", 2, "Category"
+    )
+    assert Category.from_rows(None) == []
+
+
+def test_category_from_rows_bad_row():
+    rows = [
+        {"category_id": 1, "category_title": "Title", "category_order": 2},
+        {"category_id": 2, "category_title": "Bad", "category_order": "bad"},
+    ]
+    on_error = MagicMock()
+    with patch("data_classes.category.log") as mock_logger:
+        categories = Category.from_rows(rows, on_error=on_error)
+
+    assert categories == [Category("Title", 1, 2)]
+    row, error = on_error.call_args.args
+    assert row is rows[1]
+    assert str(error).startswith("Invalid value type when creating Category")  # Reported through from_dict
+    mock_logger.return_value.error.assert_called_once()
+
+    with pytest.raises(ValueError):
+        Category.from_rows(rows)
+
+
+def test_category_is_frozen_and_slotted():
+    cat = Category("Title", 1, 2)
+
+    with pytest.raises(FrozenInstanceError):
+        cat.category_title = "Changed"
+    assert not hasattr(cat, "__dict__")
+    assert {cat, Category("Title", 1, 2)} == {cat}
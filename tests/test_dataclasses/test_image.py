@@ -58,10 +58,36 @@ def test_image_create_from_dict_success():
         assert img.image_desc == "some desc"
         assert img.image_url == "image.com"
         mock_logger.return_value.debug.assert_any_call(
-            f"Successfully created Image: {img}"
+            "Successfully created Image: %s", img
         )
 
 
+def test_image_create_from_dict_with_measurements():
+    data = {
+        "image_id": 1,
+        "image_title": "Title",
+        "image_desc": "some desc",
+        "image_URL": "image.com",
+        "image_weight": 2,
+        "project_id": 3,
+        "image_width": 1200,
+        "image_height": 800,
+        "image_color": "#c97829",
+        "image_bytes": 51200,
+    }
+    img = Image.from_dict(data)
+    assert (img.image_width, img.image_height, img.image_color, img.image_bytes) == (1200, 800, "#c97829", 51200)
+    assert img.orientation == "wide"
+    assert Image.from_dict({**data, "image_width": None}).image_width == None
+
+
+def test_image_orientation():
+    assert Image(1, 2).orientation == ""
+    assert Image(1, 2, image_width=800, image_height=1200).orientation == "tall"
+    assert Image(1, 2, image_width=900, image_height=900).orientation == "big"
+    assert Image(1, 2, image_width=500, image_height=400).orientation == ""
+
+
 def test_image_create_from_dict_missing_key():
     data = {
         "image_title": "Title",
@@ -157,7 +183,7 @@ def test_image_create_from_project_dict_success():
         assert img.image_desc == "Image desc"
         assert img.image_url == "image.com"
         mock_logger.return_value.debug.assert_any_call(
-            f"Successfully created Image from Project data: {img}"
+            "Successfully created Image from Project data: %s", img
         )
 
 
@@ -6,6 +6,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 from app import app
 from datetime import date
+from dataclasses import FrozenInstanceError
 from app import database_setup, category_list
 from data_classes.category import Category
 from data_classes.project import Project
@@ -68,7 +69,7 @@ def test_project_create_from_dict_success():
         assert proj.category_id == 2
         assert proj.project_image is mock_image
         mock_logger.return_value.debug.assert_any_call(
-            f"Successfully created Project: {proj}"
+            "Successfully created Project: %s", proj
         )
 
 
@@ -95,7 +96,7 @@ def test_project_create_from_dict_success_no_image():
         assert proj.category_id == 2
         assert proj.project_image is None
         mock_logger.return_value.debug.assert_any_call(
-            f"Successfully created Project: {proj}"
+            "Successfully created Project: %s", proj
         )
 
 
@@ -121,7 +122,7 @@ def test_project_create_from_dict_success_no_image_id():
         assert proj.category_id == 2
         assert proj.project_image is None
         mock_logger.return_value.debug.assert_any_call(
-            f"Successfully created Project: {proj}"
+            "Successfully created Project: %s", proj
         )
 
 
@@ -188,3 +189,45 @@ def test_project_create_from_dict_image_error():
         mock_logger.return_value.error.assert_called_once_with(
             f"Unexpected error when creating Project: some image error, data: {data}"
         )
+
+
+def test_project_from_rows_with_images():
+    rows = [
+        {
+            "project_id": 1,
+            "project_title": "Project Title",
+            "project_date": "12/12/2001",
+            "project_desc": "Project Desc",
+            "category_id": 2,
+            "project_image_id": 5,
+            "image_title": "Image",
+            "image_desc": None,
+            "image_URL": "some.url",
+            "image_weight": 1,
+        },
+        {
+            "project_id": 2,
+            "project_title": "No Image",
+            "project_date": "12/12/2001",
+            "project_desc": "Project Desc",
+            "category_id": 2,
+            "project_image_id": None,
+            "image_URL": None,
+        },
+    ]
+
+    projects = Project.from_rows(rows)
+
+    assert projects == [Project.from_dict(row) for row in rows]
+    assert projects[0].project_image.image_id == 5
+    assert projects[1].project_image.image_weight == 0
+
+
+def test_project_is_frozen_and_hashable():
+    proj = Project("Project Title", Image(0, 1), project_id=1)
+
+    with pytest.raises(FrozenInstanceError):
+        proj.project_image = None
+    assert not hasattr(proj, "__dict__")
+    assert hash(proj) == hash(Project("Project Title", Image(0, 1), project_id=1))
+    assert proj.project_slug == "project-title"
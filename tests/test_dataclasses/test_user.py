@@ -43,7 +43,7 @@ def test_user_create_from_dict_success():
     assert user.user_password == "secret"
     assert user.user_created_date is None
     mock_logger.return_value.debug.assert_any_call(
-        f"Successfully created user: {user.user_name}"
+        "Successfully created user: %s", user.user_name
     )
 
 
@@ -0,0 +1,231 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+import pytest
+from app import app
+from data_classes.category import Category
+from data_classes.image import Image
+from data_classes.project import Project
+from mysql_connections.catalog_file import (
+    CatalogFileError,
+    MappedCatalog,
+    SharedCatalogSnapshot,
+    write_catalog_file,
+)
+from mysql_connections.catalog_snapshot import Catalog
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def build_catalog(version=("1", "now")):
+    categories = [
+        Category("Illustration", 1, 2),
+        Category("Design", 2, 1),
+        Category("Comics", 3, 3),
+    ]
+    projects = [
+        Project("A to Z", None, 2, "2025-01-05", 1, "desc", 1),
+        Project("Mushroom Forest", None, None, "2024-03-10", 2, None, 1),
+        Project("Witch's Tea Party", None, 3, "2024-12-07", 3, "desc", 1),
+        Project("Cryptid Cookies", None, None, "2024-09-20", 4, "desc", 2),
+    ]
+    images = [
+        Image(2, 1, 1, "second", None, "one.com"),
+        Image(1, 1, 2, "first", "desc", "two.com"),
+        Image(1, 3, 3, "tea", None, "three.com", 1200, 800, "#c97829", 51200, "data:image/webp;base64,AAAA"),
+        Image(1, 4, 4, "Ünïcode", None, "four.com"),
+    ]
+    return Catalog(categories, projects, images, version)
+
+
+@pytest.fixture
+def mapped(tmp_path):
+    catalog = build_catalog()
+    path = str(tmp_path / "catalog.bin")
+    write_catalog_file(path, catalog)
+    return catalog, MappedCatalog(path)
+
+
+# --------------------------------------------------------------------------
+# Test file round trip
+# --------------------------------------------------------------------------
+def test_mapped_catalog_header(mapped):
+    catalog, mapped_catalog = mapped
+
+    assert mapped_catalog.version == ("1", "now")
+    assert mapped_catalog.n_categories == 3
+    assert mapped_catalog.n_projects == 4
+    assert mapped_catalog.n_images == 4
+
+
+def test_mapped_catalog_matches_catalog(mapped):
+    catalog, mapped_catalog = mapped
+
+    assert mapped_catalog.get_all_categories() == catalog.get_all_categories()
+    assert mapped_catalog.get_all_categories(False) == catalog.get_all_categories(False)
+    assert mapped_catalog.get_all_projects() == catalog.get_all_projects()
+    assert mapped_catalog.get_all_images() == catalog.get_all_images()
+    for category_id in (1, 2, 3, 9):
+        for ordered in (True, False):
+            assert mapped_catalog.get_projects_by_category(
+                category_id, ordered
+            ) == catalog.get_projects_by_category(category_id, ordered)
+    for project_id in (1, 2, 3, 4, 9):
+        assert mapped_catalog.get_project(project_id) == catalog.get_project(project_id)
+        assert mapped_catalog.get_project_images(project_id) == catalog.get_project_images(project_id)
+    for image_id in (1, 2, 3, 4, 9):
+        assert mapped_catalog.get_image(image_id) == catalog.get_image(image_id)
+
+
+def test_mapped_catalog_slug_lookups(mapped):
+    catalog, mapped_catalog = mapped
+
+    assert mapped_catalog.get_category_by_slug("design") == Category("Design", 2, 1)
+    assert mapped_catalog.get_category_by_slug("missing") is None
+    assert mapped_catalog.get_projects_by_category_slug(
+        "illustration"
+    ) == catalog.get_projects_by_category_slug("illustration")
+    assert mapped_catalog.get_project_by_slug("witchs-tea-party", "illustration").project_id == 3
+    assert mapped_catalog.get_project_by_slug("Witch's_Tea_Party", "Illustration").project_id == 3
+    assert mapped_catalog.get_project_by_slug("a-to-z", "design") is None
+    assert mapped_catalog.get_project_page("illustration", "a-to-z") == catalog.get_project_page(
+        "illustration", "a-to-z"
+    )
+    assert mapped_catalog.get_project_page("illustration", "missing") is None
+
+
+def test_mapped_catalog_keeps_nulls_and_unicode(mapped):
+    _, mapped_catalog = mapped
+
+    assert mapped_catalog.get_project(2).project_desc is None
+    assert mapped_catalog.get_project(2).project_image_id is None
+    assert mapped_catalog.get_project(2).project_image == Image(0, 2)
+    assert mapped_catalog.get_image(4).image_title == "Ünïcode"
+
+
+def test_empty_catalog_round_trip(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_catalog_file(path, Catalog([], [], [], None))
+
+    mapped_catalog = MappedCatalog(path)
+
+    assert mapped_catalog.version is None
+    assert mapped_catalog.get_all_categories() == []
+    assert mapped_catalog.get_project_page("any", "thing") is None
+
+
+def test_mapped_catalog_rejects_bad_file(tmp_path):
+    path = tmp_path / "catalog.bin"
+    path.write_bytes(b"not a catalog file at all, just some bytes")
+
+    with pytest.raises(CatalogFileError):
+        MappedCatalog(str(path))
+
+
+def test_write_replaces_file_atomically(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_catalog_file(path, build_catalog(("1", "now")))
+    old = MappedCatalog(path)
+
+    write_catalog_file(path, build_catalog(("2", "later")))
+
+    assert old.version == ("1", "now")
+    assert old.get_image(1).image_title == "second"  # Old mapping still readable after rename
+    assert MappedCatalog(path).version == ("2", "later")
+    assert os.listdir(tmp_path) == ["catalog.bin"]
+
+
+# --------------------------------------------------------------------------
+# Test shared snapshot
+# --------------------------------------------------------------------------
+def mock_db(version="1"):
+    db = MagicMock()
+    db.fetch_one.return_value = {"meta_data": version, "last_updated": "now"}
+    db.fetch_all.side_effect = lambda query: (
+        [{"category_id": 1, "category_title": "Design", "category_order": 1}]
+        if "VV.category" in query
+        else None
+    )
+    return db
+
+
+def test_shared_snapshot_loads_once_per_node(tmp_path):
+    with app.app_context():
+        path = str(tmp_path / "catalog.bin")
+        db = mock_db()
+        first_worker = SharedCatalogSnapshot(lambda: db, path, check_interval=60)
+        second_worker = SharedCatalogSnapshot(lambda: db, path, check_interval=60)
+
+        assert first_worker.get().get_category_by_slug("design").category_id == 1
+        assert second_worker.get().get_category_by_slug("design").category_id == 1
+
+        assert first_worker.loads == 1
+        assert second_worker.loads == 0
+        assert db.fetch_one.call_count == 1
+
+
+def test_shared_snapshot_other_worker_remaps_new_version(tmp_path):
+    with app.app_context():
+        path = str(tmp_path / "catalog.bin")
+        db = mock_db()
+        listener = MagicMock()
+        first_worker = SharedCatalogSnapshot(lambda: db, path, check_interval=0)
+        second_worker = SharedCatalogSnapshot(lambda: db, path, check_interval=0)
+        second_worker.on_refresh(listener)
+        first_worker.get()
+        second_worker.get()
+
+        db.fetch_one.return_value = {"meta_data": "2", "last_updated": "later"}
+        first_worker.get()
+        with patch.object(second_worker, "_recently_checked", return_value=True):
+            catalog = second_worker.get()
+
+        assert catalog.version == ("2", "later")
+        assert first_worker.loads == 2
+        assert second_worker.loads == 0
+        assert listener.call_count == 2
+
+
+def test_shared_snapshot_unchanged_version_touches_file(tmp_path):
+    with app.app_context():
+        path = str(tmp_path / "catalog.bin")
+        db = mock_db()
+        snapshot = SharedCatalogSnapshot(lambda: db, path, check_interval=0)
+        snapshot.get()
+        os.utime(path, (0, 0))
+
+        snapshot.get()
+
+        assert snapshot.loads == 1
+        assert os.stat(path).st_mtime > 0
+
+
+def test_shared_snapshot_rewrites_bad_file(tmp_path):
+    with app.app_context():
+        path = tmp_path / "catalog.bin"
+        path.write_bytes(b"garbage")
+        snapshot = SharedCatalogSnapshot(lambda: mock_db(), str(path))
+
+        assert snapshot.get().get_category_by_slug("design") is not None
+        assert snapshot.loads == 1
+
+
+def test_shared_snapshot_without_version_row_keeps_file_until_max_age(tmp_path):
+    with app.app_context():
+        path = str(tmp_path / "catalog.bin")
+        db = mock_db()
+        db.fetch_one.return_value = None
+        listener = MagicMock()
+        snapshot = SharedCatalogSnapshot(lambda: db, path, check_interval=0, max_age=60)
+        snapshot.on_refresh(listener)
+        snapshot.get()
+
+        snapshot.get()
+        assert snapshot.loads == 1
+
+        os.utime(path, (0, 0))
+        with patch("mysql_connections.catalog_file.time.time", return_value=snapshot.get().written_at + 120):
+            snapshot.get()
+
+        assert snapshot.loads == 2
+        assert listener.call_count == 1
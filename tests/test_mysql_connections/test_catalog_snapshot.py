@@ -0,0 +1,286 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+import pytest
+from datetime import date
+from app import app
+from data_classes.category import Category
+from data_classes.image import Image
+from data_classes.project import Project
+from mysql_connections.catalog_snapshot import Catalog, CatalogSnapshot
+from mysql_connections.mysql_view_user import View_User
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+CATEGORY_ROWS = [
+    {"category_id": 1, "category_title": "Illustration", "category_order": 2},
+    {"category_id": 2, "category_title": "Design", "category_order": 1},
+]
+PROJECT_ROWS = [
+    {
+        "project_id": 1,
+        "project_title": "A to Z",
+        "project_date": "2025-01-05",
+        "project_desc": "desc",
+        "category_id": 1,
+        "project_image_id": 2,
+    },
+    {
+        "project_id": 2,
+        "project_title": "Mushroom Forest",
+        "project_date": "2024-03-10",
+        "project_desc": "desc",
+        "category_id": 1,
+        "project_image_id": None,
+    },
+]
+IMAGE_ROWS = [
+    {
+        "image_id": 1,
+        "image_title": "second",
+        "image_desc": None,
+        "image_URL": "one.com",
+        "image_weight": 2,
+        "project_id": 1,
+    },
+    {
+        "image_id": 2,
+        "image_title": "first",
+        "image_desc": None,
+        "image_URL": "two.com",
+        "image_weight": 1,
+        "project_id": 1,
+    },
+]
+
+
+def mock_db(version="1"):
+    db = MagicMock()
+    db.fetch_one.return_value = {"meta_data": version, "last_updated": "now"}
+
+    def fetch_all(query):
+        if "VV.category" in query:
+            return CATEGORY_ROWS
+        if "VV.project" in query:
+            return PROJECT_ROWS
+        return IMAGE_ROWS
+
+    db.fetch_all.side_effect = fetch_all
+    return db
+
+
+def build_catalog():
+    with app.app_context():
+        return CatalogSnapshot(lambda: mock_db()).get()
+
+
+# --------------------------------------------------------------------------
+# Test catalog lookups
+# --------------------------------------------------------------------------
+def test_catalog_categories():
+    catalog = build_catalog()
+
+    assert [c.category_id for c in catalog.get_all_categories()] == [2, 1]
+    assert [c.category_id for c in catalog.get_all_categories(False)] == [1, 2]
+    assert catalog.get_category_by_slug("illustration").category_id == 1
+    assert catalog.get_category_by_slug("Illustration").category_id == 1
+    assert catalog.get_category_by_slug("missing") is None
+
+
+def test_catalog_projects():
+    catalog = build_catalog()
+
+    assert [p.project_id for p in catalog.get_projects_by_category(1)] == [2, 1]
+    assert [p.project_id for p in catalog.get_projects_by_category(1, False)] == [1, 2]
+    assert catalog.get_projects_by_category(2) == []
+    assert [p.project_id for p in catalog.get_projects_by_category_slug("illustration")] == [2, 1]
+    assert catalog.get_project(1).project_title == "A to Z"
+    assert catalog.get_project(9) is None
+    assert catalog.get_project_by_slug("a-to-z", "illustration").project_id == 1
+    assert catalog.get_project_by_slug("a-to-z", "design") is None
+
+
+def test_catalog_projects_ordered_by_date_nulls_first():
+    projects = [
+        Project("Later", project_id=1, project_date="2024-10-01", category_id=1),
+        Project("Undated", project_id=2, project_date="None", category_id=1),  # A NULL date read as text
+        Project("Earlier", project_id=3, project_date=date(2024, 9, 2), category_id=1),
+        Project("No date", project_id=4, project_date=None, category_id=1),
+    ]
+    catalog = Catalog([Category("Illustration", 1, 1)], projects, [])
+
+    assert [p.project_id for p in catalog.get_projects_by_category(1)] == [2, 4, 3, 1]
+
+
+def test_catalog_project_images():
+    catalog = build_catalog()
+
+    assert catalog.get_project(1).project_image.image_id == 2
+    assert catalog.get_project(2).project_image == Image(0, 2)
+    assert [i.image_id for i in catalog.get_project_images(1)] == [2, 1]
+    assert catalog.get_project_images(2) == []
+    assert catalog.get_image(1).image_url == "one.com"
+    assert catalog.get_image(7) is None
+
+
+def test_catalog_project_page():
+    catalog = build_catalog()
+
+    project, category, images = catalog.get_project_page("illustration", "a-to-z")
+
+    assert project.project_id == 1
+    assert category.category_id == 1
+    assert [i.image_id for i in images] == [2, 1]
+    assert catalog.get_project_page("illustration", "A_to_Z")[0].project_id == 1
+    assert catalog.get_project_page("design", "a-to-z") is None
+
+
+def test_catalog_lookups_return_copies():
+    catalog = build_catalog()
+
+    catalog.get_all_categories().clear()
+
+    assert len(catalog.get_all_categories()) == 2
+
+
+# --------------------------------------------------------------------------
+# Test snapshot refresh
+# --------------------------------------------------------------------------
+def test_snapshot_loads_once_within_check_interval():
+    with app.app_context():
+        db = mock_db()
+        snapshot = CatalogSnapshot(lambda: db, check_interval=60)
+
+        first = snapshot.get()
+        second = snapshot.get()
+
+        assert first is second
+        db.fetch_one.assert_called_once()
+        assert db.fetch_all.call_count == 3
+
+
+def test_snapshot_keeps_catalog_when_version_unchanged():
+    with app.app_context():
+        db = mock_db()
+        snapshot = CatalogSnapshot(lambda: db, check_interval=0)
+
+        first = snapshot.get()
+        second = snapshot.get()
+
+        assert first is second
+        assert db.fetch_one.call_count == 2
+        assert snapshot.loads == 1
+
+
+def test_snapshot_swaps_catalog_when_version_changes():
+    with app.app_context():
+        db = mock_db()
+        listener = MagicMock()
+        snapshot = CatalogSnapshot(lambda: db, check_interval=0)
+        snapshot.on_refresh(listener)
+
+        first = snapshot.get()
+        db.fetch_one.return_value = {"meta_data": "2", "last_updated": "later"}
+        second = snapshot.get()
+
+        assert first is not second
+        assert second.version == ("2", "later")
+        assert listener.call_count == 2
+
+
+def test_snapshot_reloads_after_max_age():
+    with app.app_context():
+        db = mock_db()
+        snapshot = CatalogSnapshot(lambda: db, check_interval=0, max_age=10)
+
+        with patch("mysql_connections.catalog_snapshot.time.monotonic", return_value=100):
+            first = snapshot.get()
+        with patch("mysql_connections.catalog_snapshot.time.monotonic", return_value=200):
+            second = snapshot.get()
+
+        assert first is not second
+
+
+def test_snapshot_without_version_row_reloads_after_max_age_only():
+    with app.app_context():
+        db = mock_db()
+        db.fetch_one.return_value = None
+        listener = MagicMock()
+        snapshot = CatalogSnapshot(lambda: db, check_interval=0, max_age=10)
+        snapshot.on_refresh(listener)
+
+        with patch("mysql_connections.catalog_snapshot.time.monotonic", return_value=100):
+            first = snapshot.get()
+            assert snapshot.get() is first
+        with patch("mysql_connections.catalog_snapshot.time.monotonic", return_value=200):
+            second = snapshot.get()
+
+        assert first is not second
+        assert snapshot.loads == 2
+        assert listener.call_count == 1
+
+
+def test_snapshot_serves_old_catalog_when_refresh_fails():
+    with app.app_context():
+        db = mock_db()
+        snapshot = CatalogSnapshot(lambda: db, check_interval=0)
+
+        first = snapshot.get()
+        db.fetch_one.side_effect = Exception("DB Error")
+
+        assert snapshot.get() is first
+
+
+def test_snapshot_raises_when_first_load_fails():
+    with app.app_context():
+        db = mock_db()
+        db.fetch_one.side_effect = Exception("DB Error")
+        snapshot = CatalogSnapshot(lambda: db)
+
+        with pytest.raises(Exception):
+            snapshot.get()
+
+
+def test_snapshot_skips_bad_rows():
+    with app.app_context():
+        db = mock_db()
+        db.fetch_all.side_effect = lambda query: (
+            [{"category_id": "bad"}] + CATEGORY_ROWS if "VV.category" in query else []
+        )
+        snapshot = CatalogSnapshot(lambda: db)
+
+        assert len(snapshot.get().get_all_categories()) == 2
+
+
+# --------------------------------------------------------------------------
+# Test View_User integration
+# --------------------------------------------------------------------------
+def test_view_user_reads_from_snapshot():
+    with app.app_context(), patch.object(
+        View_User, "snapshot", CatalogSnapshot(lambda: mock_db())
+    ):
+        view_user = View_User()
+        view_user.fetch_all = MagicMock()
+
+        assert view_user.get_category_by_slug("design").category_id == 2
+        assert view_user.get_image(2).image_title == "first"
+        project, _, images = view_user.get_project_page("illustration", "a-to-z")
+        assert project.project_id == 1
+        assert len(images) == 2
+        view_user.fetch_all.assert_not_called()
+
+
+def test_view_user_falls_back_to_database_without_catalog():
+    with app.app_context():
+        failing = MagicMock()
+        failing.get.side_effect = Exception("DB Error")
+        with patch.object(View_User, "snapshot", failing):
+            view_user = View_User()
+            view_user.fetch_all = MagicMock(return_value=CATEGORY_ROWS)
+            view_user.logger = MagicMock()
+
+            categories = view_user.get_all_categories()
+
+            assert len(categories) == 2
+            view_user.fetch_all.assert_called_once()
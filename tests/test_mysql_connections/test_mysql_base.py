@@ -88,7 +88,7 @@ def test_mysql_base_create_connection_success():
 
             assert connection == mock_connection
             mock_debug_logger.assert_any_call(
-                f"Creating connection to: {base_mysql.host}"
+                "Creating connection to: %s", base_mysql.host
             )
             mock_debug_logger.assert_any_call("Connection created")
             mock_error_logger.assert_not_called()
@@ -846,4 +846,56 @@ def test_mysql_base_execute_sensitive_general_error(caplog):
         logs = " ".join(r.message for r in caplog.records)
 
         assert "None" not in logs
-        base_mysql._run_query.assert_called_once_with(query, None, None)
\ No newline at end of file
+        base_mysql._run_query.assert_called_once_with(query, None, None)
+
+# --------------------------------------------------------------------------
+# Test execute many and streaming
+# --------------------------------------------------------------------------
+def test_mysql_base_run_query_many(mock_db):
+    with app.app_context():
+        mock_connection, mock_cursor = mock_db
+        mock_cursor.rowcount = 2
+        query = "UPDATE `image` SET image_width = %s WHERE image_id = %s;"
+        args = [[10, 1], [20, 2]]
+
+        base_mysql = MySQLBase("user", "password", "TEST")
+        base_mysql.create_connection = MagicMock(return_value=mock_connection)
+
+        assert base_mysql._run_query(query, args, None, many=True) == 2
+        mock_cursor.executemany.assert_called_once_with(query, args)
+        mock_cursor.execute.assert_not_called()
+        mock_connection.begin.assert_called_once()  # Pooled connections autocommit each row otherwise
+        mock_connection.commit.assert_called_once()
+
+
+def test_mysql_base_run_query_many_rolls_back(mock_db):
+    with app.app_context():
+        mock_connection, mock_cursor = mock_db
+        mock_cursor.executemany.side_effect = MySQLError("Row 2 failed")
+
+        base_mysql = MySQLBase("user", "password", "TEST")
+        base_mysql.create_connection = MagicMock(return_value=mock_connection)
+
+        with pytest.raises(MySQLError):
+            base_mysql._run_query("UPDATE `image` SET image_width = %s WHERE image_id = %s;", [[10, 1], [20, 2]], None, many=True)
+
+        mock_connection.begin.assert_called_once()
+        mock_connection.rollback.assert_called_once()
+        mock_connection.commit.assert_not_called()
+
+
+def test_mysql_base_stream_closes_connection():
+    with app.app_context():
+        mock_connection = MagicMock()
+        mock_cursor = mock_connection.cursor.return_value.__enter__.return_value
+        mock_cursor.__iter__.return_value = iter([{"image_id": 1}, {"image_id": 2}])
+
+        base_mysql = MySQLBase("user", "password", "TEST")
+        base_mysql.create_connection = MagicMock(return_value=mock_connection)
+
+        rows = base_mysql.stream("SELECT image_id FROM `VV.image` WHERE image_id > %s;", [0])
+        assert next(rows) == {"image_id": 1}
+        mock_connection.close.assert_not_called()
+        rows.close()
+
+        mock_connection.close.assert_called_once()
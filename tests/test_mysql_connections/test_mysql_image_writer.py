@@ -0,0 +1,72 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from unittest.mock import patch, MagicMock
+from app import app
+from mysql_connections.mysql_image_writer import Image_Writer
+
+
+# --------------------------------------------------------------------------
+# Test image writer mysql class init
+# ---------------------------------------------------------------------------
+@patch.dict(
+    os.environ,
+    {"MYSQL_IMAGE_WRITER": "image_writer", "MYSQL_IMAGE_WRITER_PASSWORD": "writer_password"},
+)
+def test_image_writer_init():
+    writer = Image_Writer()
+
+    assert writer.user == "image_writer"
+    assert writer.password == "writer_password"
+
+
+# --------------------------------------------------------------------------
+# Test storing measurements
+# ---------------------------------------------------------------------------
+def test_image_writer_update_image_metadata_only_unmeasured():
+    with app.app_context():
+        writer = Image_Writer()
+        writer.logger = MagicMock()
+        writer.execute = MagicMock()
+
+        writer.update_image_metadata(
+            7,
+            {
+                "image_width": 1200,
+                "image_height": 800,
+                "image_color": "#c97829",
+                "image_bytes": 51200,
+                "image_placeholder": "data:image/webp;base64,AAAA",
+            },
+        )
+
+        query, args = writer.execute.call_args.args
+        assert "WHERE image_id = %s AND image_placeholder IS NULL" in query
+        assert args == [1200, 800, "#c97829", 51200, "data:image/webp;base64,AAAA", 7]
+
+
+def test_image_writer_update_images_metadata_batch():
+    with app.app_context():
+        writer = Image_Writer()
+        writer.logger = MagicMock()
+        writer.execute_many = MagicMock()
+        measured = {column: None for column in Image_Writer.image_metadata_columns}
+
+        writer.update_images_metadata([(1, measured), (2, measured)], replace=True)
+
+        query, rows = writer.execute_many.call_args.args
+        assert "image_placeholder IS NULL" not in query
+        assert [row[-1] for row in rows] == [1, 2]
+
+
+def test_image_writer_stream_images():
+    with app.app_context():
+        writer = Image_Writer()
+        writer.stream = MagicMock(return_value=iter([]))
+
+        writer.stream_images(5)
+
+        query, args = writer.stream.call_args.args
+        assert "image_id > %s AND image_placeholder IS NULL ORDER BY image_id" in query
+        assert args == [5]
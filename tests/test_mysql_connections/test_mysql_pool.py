@@ -0,0 +1,195 @@
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+import pytest
+from pymysql import OperationalError
+from app import app
+from mysql_connections import mysql_pool
+from mysql_connections.mysql_base import MySQLBase
+from mysql_connections.mysql_pool import ConnectionPool, PoolTimeoutError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+# --------------------------------------------------------------------------
+# Test checkout and return
+# --------------------------------------------------------------------------
+def test_pool_reuses_returned_connection():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=0)
+        factory = MagicMock(side_effect=lambda: MagicMock())
+
+        first = pool.acquire(factory)
+        pool.release(first)
+        second = pool.acquire(factory)
+
+        assert first is second
+        factory.assert_called_once()
+        first.autocommit.assert_called_once_with(True)
+        stats = pool.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["in_use"] == 1
+
+
+def test_pool_discard_closes_connection():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=0)
+        connection = MagicMock()
+
+        pool.acquire(lambda: connection)
+        pool.release(connection, discard=True)
+
+        connection.close.assert_called_once()
+        assert pool.stats()["open"] == 0
+        assert pool.stats()["discarded"] == 1
+
+
+def test_pool_overflow_connections_are_closed_on_return():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=1)
+        factory = MagicMock(side_effect=lambda: MagicMock())
+
+        first = pool.acquire(factory)
+        second = pool.acquire(factory)
+        pool.release(second)
+        pool.release(first)
+
+        second.close.assert_called_once()
+        first.close.assert_not_called()
+        assert pool.stats()["idle"] == 1
+
+
+def test_pool_timeout_when_exhausted():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=0, timeout=0.01)
+        pool.acquire(MagicMock)
+
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire(MagicMock)
+        assert pool.stats()["timeouts"] == 1
+        assert pool.stats()["waits"] == 1
+
+
+def test_pool_waiting_thread_gets_released_connection():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=0, timeout=5)
+        connection = pool.acquire(MagicMock)
+        result = {}
+
+        def worker():
+            result["connection"] = pool.acquire(MagicMock)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        pool.release(connection)
+        thread.join(5)
+
+        assert result["connection"] is connection
+
+
+def test_pool_factory_error_frees_slot():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=0, timeout=0.01)
+
+        with pytest.raises(OperationalError):
+            pool.acquire(MagicMock(side_effect=OperationalError))
+        assert pool.stats()["open"] == 0
+        pool.acquire(MagicMock)
+
+
+# --------------------------------------------------------------------------
+# Test recycling and liveness
+# --------------------------------------------------------------------------
+def test_pool_recycles_idle_connection():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=0, max_idle=10)
+        factory = MagicMock(side_effect=lambda: MagicMock())
+
+        with patch("mysql_connections.mysql_pool.time.monotonic", return_value=100):
+            first = pool.acquire(factory)
+            pool.release(first)
+        with patch("mysql_connections.mysql_pool.time.monotonic", return_value=200):
+            second = pool.acquire(factory)
+
+        assert first is not second
+        first.close.assert_called_once()
+        assert pool.stats()["recycled"] == 1
+
+
+def test_pool_recycles_connection_past_lifetime():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=0, max_lifetime=10)
+        connection = MagicMock()
+
+        with patch("mysql_connections.mysql_pool.time.monotonic", return_value=100):
+            pool.acquire(lambda: connection)
+        with patch("mysql_connections.mysql_pool.time.monotonic", return_value=200):
+            pool.release(connection)
+
+        connection.close.assert_called_once()
+        assert pool.stats()["open"] == 0
+
+
+def test_pool_pings_stale_connection_and_replaces_dead_one():
+    with app.app_context():
+        pool = ConnectionPool("test", size=1, max_overflow=0, ping_interval=1)
+        dead = MagicMock()
+        dead.ping.side_effect = OperationalError
+        replacement = MagicMock()
+        factory = MagicMock(side_effect=[dead, replacement])
+
+        with patch("mysql_connections.mysql_pool.time.monotonic", return_value=100):
+            pool.acquire(factory)
+            pool.release(dead)
+        with patch("mysql_connections.mysql_pool.time.monotonic", return_value=105):
+            connection = pool.acquire(factory)
+
+        assert connection is replacement
+        dead.ping.assert_called_once_with(reconnect=False)
+        dead.close.assert_called_once()
+        assert pool.stats()["open"] == 1
+
+
+# --------------------------------------------------------------------------
+# Test MySQLBase integration
+# --------------------------------------------------------------------------
+def test_base_run_query_reuses_pooled_connection(mock_db):
+    with app.app_context():
+        mock_connection, mock_cursor = mock_db
+        mock_cursor.fetchall.return_value = [{"id": 1}]
+
+        base_mysql = MySQLBase("user", "password", "TEST")
+        base_mysql.create_connection = MagicMock(return_value=mock_connection)
+
+        base_mysql._run_query("SELECT 1;", None, "all")
+        base_mysql._run_query("SELECT 1;", None, "all")
+
+        base_mysql.create_connection.assert_called_once()
+        mock_connection.close.assert_not_called()
+
+
+def test_base_instances_share_worker_pool(mock_db):
+    with app.app_context():
+        mock_connection, _ = mock_db
+
+        first = MySQLBase("user", "password", "TEST")
+        first.create_connection = MagicMock(return_value=mock_connection)
+        second = MySQLBase("user", "password", "TEST")
+        second.create_connection = MagicMock()
+
+        first._run_query("SELECT 1;", None, "all")
+        second._run_query("SELECT 1;", None, "all")
+
+        second.create_connection.assert_not_called()
+        assert len(mysql_pool.pool_stats()) == 1
+
+
+def test_get_pool_rebuilt_after_fork():
+    with app.app_context():
+        pool = mysql_pool.get_pool("host", 3306, "user", "db")
+        with patch("mysql_connections.mysql_pool.os.getpid", return_value=-1):
+            forked_pool = mysql_pool.get_pool("host", 3306, "user", "db")
+
+        assert pool is not forked_pool
@@ -66,11 +66,13 @@ def test_root_try_connection():
 
         root = Root()
         root.logger = MagicMock()
-        root.fetch_all = MagicMock(return_value=mock_tables)
+        root.fetch_all = MagicMock(side_effect=[mock_tables, routine_rows(), column_rows(), routine_rows(), index_rows()])
+        root.execute = MagicMock()
 
         result = root.try_connection()
 
         assert result == True
+        root.execute.assert_called_once_with(Root.catalog_version_row)  # INSERT IGNORE, a no-op once the row exists
 
 
 def test_root_try_connection_missing_table():
@@ -120,6 +122,397 @@ def test_root_try_connection_exception():
         assert result == False
 
 
+# --------------------------------------------------------------------------
+# Index verification testing
+# --------------------------------------------------------------------------
+def index_rows(skip=(), collation="utf8mb4_general_ci"):
+    """Builds information_schema rows for the indexes made by init-db.sql, leaving out any index named in skip."""
+    indexes = [
+        ("category", "PRIMARY", 0, ["category_id"]),
+        ("category", "category_slug_key", 0, ["category_slug"]),
+        ("project", "PRIMARY", 0, ["project_id"]),
+        ("project", "project_category_slug_key", 0, ["category_id", "project_slug"]),
+        ("project", "project_category_date", 1, ["category_id", "project_date"]),
+        ("image", "PRIMARY", 0, ["image_id"]),
+        ("image", "image_project_weight", 1, ["project_id", "image_weight"]),
+    ]
+    rows = []
+    for table, name, non_unique, columns in indexes:
+        if name in skip:
+            continue
+        for column in columns:
+            rows.append(
+                {
+                    "table_name": table,
+                    "index_name": name,
+                    "non_unique": non_unique,
+                    "column_name": column,
+                    "collation_name": collation if "slug" in column else None,
+                }
+            )
+    return rows
+
+
+def test_root_check_indexes_all_present():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=index_rows())
+
+        assert root.check_indexes() == []
+
+
+def test_root_check_indexes_matches_by_columns_not_name():
+    with app.app_context():
+        rows = index_rows()
+        for row in rows:
+            row["index_name"] = f"renamed_{row['index_name']}"
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=rows)
+
+        assert root.check_indexes() == []
+
+
+def test_root_check_indexes_missing():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(
+            return_value=index_rows(skip=("image_project_weight", "category_slug_key"))
+        )
+
+        missing = root.check_indexes()
+
+        assert [need["name"] for need in missing] == [
+            "category_slug_key",
+            "image_project_weight",
+        ]
+
+
+def test_root_check_indexes_foreign_key_index_is_not_enough():
+    with app.app_context():
+        rows = index_rows(skip=("image_project_weight",))
+        rows.append(
+            {
+                "table_name": "image",
+                "index_name": "project_id",
+                "non_unique": 1,
+                "column_name": "project_id",
+                "collation_name": None,
+            }
+        )
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=rows)
+
+        assert [need["name"] for need in root.check_indexes()] == ["image_project_weight"]
+
+
+def test_root_check_indexes_case_sensitive_slug_key():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=index_rows(collation="utf8mb4_bin"))
+
+        missing = root.check_indexes()
+
+        assert [need["name"] for need in missing] == [
+            "category_slug_key",
+            "project_category_slug_key",
+        ]
+
+
+def test_root_verify_indexes_creates_missing():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(
+            return_value=index_rows(skip=("project_category_date",))
+        )
+        root.execute = MagicMock()
+
+        result = root.verify_indexes()
+
+        assert result == True
+        root.execute.assert_called_once_with(
+            "ALTER TABLE `project` ADD INDEX `project_category_date` (category_id, project_date);"
+        )
+
+
+def test_root_verify_indexes_with_real_logger(caplog):
+    with app.app_context():
+        root = Root()  # Real log, a MagicMock would accept any method name
+        root.fetch_all = MagicMock(return_value=index_rows(skip=("project_category_date",)))
+        root.execute = MagicMock()
+
+        with caplog.at_level("WARNING"):
+            assert root.verify_indexes() == True
+
+        assert "Missing index project_category_date on project(category_id, project_date)" in caplog.text
+        root.execute.assert_called_once()
+
+
+def test_root_verify_indexes_create_failure():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=index_rows(skip=("category_slug_key",)))
+        root.execute = MagicMock(side_effect=MySQLError("Duplicate entry"))
+
+        result = root.verify_indexes()
+
+        assert result == False
+        root.execute.assert_called_once_with(
+            "ALTER TABLE `category` ADD UNIQUE INDEX `category_slug_key` (category_slug);"
+        )
+        root.logger.error.assert_called_once()
+
+
+def test_root_verify_indexes_check_error():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(side_effect=MySQLError)
+        root.execute = MagicMock()
+
+        assert root.verify_indexes() == False
+        root.execute.assert_not_called()
+
+
+def test_root_try_connection_ready_when_index_creation_fails():
+    with app.app_context():
+        mock_tables = [
+            {"Tables_in_Portfolio": table}
+            for table in [
+                "VV.category",
+                "VV.image",
+                "VV.project",
+                "VV.users",
+                "VV.site_meta",
+                "category",
+                "image",
+                "project",
+                "users",
+                "site_meta",
+            ]
+        ]
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=mock_tables)
+        root.verify_indexes = MagicMock(return_value=False)
+
+        assert root.try_connection() == True
+        root.verify_indexes.assert_called_once()
+
+
+# --------------------------------------------------------------------------
+# Routine verification testing
+# --------------------------------------------------------------------------
+def routine_rows(skip=()):
+    """Builds information_schema rows for the routines in need_routines, leaving out any named in skip."""
+    return [
+        {"type": need["type"], "name": need["name"]} for need in Root.need_routines if need["name"] not in skip
+    ]
+
+
+def test_root_check_routines_missing():
+    with app.app_context():
+        root = Root()
+        root.fetch_all = MagicMock(return_value=routine_rows(skip=("slugify", "project_update_slug")))
+
+        assert [need["name"] for need in root.check_routines()] == ["slugify", "project_update_slug"]
+
+
+def test_root_verify_routines_creates_missing_of_type():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=[])
+        root.execute = MagicMock()
+
+        assert root.verify_routines(("FUNCTION",)) == True
+        created = [call.args[0] for call in root.execute.call_args_list]
+        assert len(created) == 3
+        assert created[0].startswith("CREATE FUNCTION slugify(")  # The other functions call it
+        assert all(query.startswith("CREATE FUNCTION") for query in created)
+
+
+def test_root_verify_routines_adds_version_triggers():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=routine_rows(
+            skip=[need["name"] for need in Root.need_routines if need["name"].endswith("_version")]
+        ))
+        root.execute = MagicMock()
+
+        assert root.verify_routines() == True
+        created = [call.args[0].split(" ")[2] for call in root.execute.call_args_list]
+        assert created[0] == "bump_catalog_version()"  # The triggers call it
+        assert len(created) == 10
+
+
+def test_root_verify_routines_adds_measurement_trigger():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=routine_rows(skip=("image_update_measurements",)))
+        root.execute = MagicMock()
+
+        assert root.verify_routines(("TRIGGER",)) == True
+        root.execute.assert_called_once()
+        assert root.execute.call_args.args[0].startswith(
+            "CREATE TRIGGER image_update_measurements BEFORE UPDATE ON image"
+        )
+
+
+def test_root_verify_catalog_version_failure():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.execute = MagicMock(side_effect=MySQLError("Denied"))
+
+        assert root.verify_catalog_version() == False
+        root.logger.error.assert_called_once()
+
+
+def test_root_verify_routines_create_failure():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=routine_rows(skip=("category_insert_slug",)))
+        root.execute = MagicMock(side_effect=MySQLError("Denied"))
+
+        assert root.verify_routines() == False
+        root.logger.error.assert_called_once()
+
+
+def test_root_try_connection_migrates_slug_columns():
+    with app.app_context():
+        mock_tables = [{"Tables_in_Portfolio": table} for table in (
+            "VV.category", "VV.image", "VV.project", "VV.users", "VV.site_meta",
+            "category", "image", "project", "users", "site_meta",
+        )]
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(side_effect=[
+            mock_tables,
+            [],  # A database made before slugs
+            column_rows(skip=("category_slug", "project_slug")),
+            routine_rows(skip=[need["name"] for need in Root.need_routines if need["type"] == "TRIGGER"]),
+            index_rows(skip=("category_slug_key", "project_category_slug_key")),
+        ])
+        root.execute = MagicMock()
+
+        assert root.try_connection() == True
+        queries = [call.args[0] for call in root.execute.call_args_list]
+        order = [
+            next(i for i, query in enumerate(queries) if query.startswith(prefix))
+            for prefix in (
+                "CREATE FUNCTION slugify(",
+                "CREATE PROCEDURE bump_catalog_version(",
+                "ALTER TABLE `category` ADD COLUMN `category_slug`",
+                "UPDATE `category` SET category_slug",
+                "CREATE TRIGGER category_insert_slug",
+                "CREATE TRIGGER image_update_version",
+                "INSERT IGNORE INTO site_meta",
+                "ALTER TABLE `category` ADD UNIQUE INDEX `category_slug_key`",
+            )
+        ]
+        assert order == sorted(order)  # Routines, columns and their fill, triggers, version row, then keys
+
+
+# --------------------------------------------------------------------------
+# Column verification testing
+# --------------------------------------------------------------------------
+def column_rows(skip=(), skip_view=()):
+    """Builds information_schema rows for the columns in need_columns and the views over them."""
+    rows = []
+    for need in Root.need_columns:
+        if need["name"] not in skip:
+            rows.append({"table_name": need["table"], "column_name": need["name"]})
+        if need["name"] not in skip and need["name"] not in skip_view:
+            rows.append({"table_name": Root.need_views[need["table"]][0], "column_name": need["name"]})
+    return rows
+
+
+def test_root_check_columns_all_present():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=column_rows())
+
+        assert root.check_columns() == ([], set())
+
+
+def test_root_verify_columns_adds_missing_and_remakes_view():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=column_rows(skip=("image_color",)))
+        root.execute = MagicMock()
+
+        assert root.verify_columns() == True
+        assert root.execute.call_args_list[0].args == (
+            "ALTER TABLE `image` ADD COLUMN `image_color` CHAR(7) NULL;",
+        )
+        assert root.execute.call_args_list[1].args[0].startswith("CREATE OR REPLACE VIEW `VV.image`")
+        assert root.execute.call_count == 2
+
+
+def test_root_verify_columns_remakes_stale_view():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=column_rows(skip_view=("image_bytes",)))
+        root.execute = MagicMock()
+
+        assert root.verify_columns() == True
+        root.execute.assert_called_once_with(Root.need_views["image"][1])
+
+
+def test_root_verify_columns_fills_added_slug_column():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=column_rows(skip=("project_slug",)))
+        root.execute = MagicMock()
+
+        assert root.verify_columns() == True
+        queries = [call.args[0] for call in root.execute.call_args_list]
+        assert queries == [
+            "ALTER TABLE `project` ADD COLUMN `project_slug` VARCHAR(255) NOT NULL DEFAULT '';",
+            "UPDATE `project` SET project_slug = unique_project_slug(category_id, project_title, project_id);",
+            Root.need_views["project"][1],
+        ]
+
+
+def test_root_verify_with_real_logger(caplog):
+    with app.app_context():
+        root = Root()  # Real log, a MagicMock would accept any method name
+        root.fetch_all = MagicMock(side_effect=[[], column_rows(skip=("image_color",))])
+        root.execute = MagicMock()
+
+        with caplog.at_level("WARNING"):
+            assert root.verify_routines() == True
+            assert root.verify_columns() == True
+
+        assert "Missing function slugify, creating it" in caplog.text
+        assert "Missing column image_color on image, adding it" in caplog.text
+
+
+def test_root_verify_columns_add_failure():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=column_rows(skip=("image_width",)))
+        root.execute = MagicMock(side_effect=MySQLError("Denied"))
+
+        assert root.verify_columns() == False
+        assert root.logger.error.call_count == 2
+
+
 # --------------------------------------------------------------------------
 # create_db_user testing.
 # --------------------------------------------------------------------------
@@ -158,6 +551,34 @@ def test_root_create_db_users():
         root.execute.assert_any_call("FLUSH PRIVILEGES")
 
 
+@patch.dict(
+    os.environ,
+    {"MYSQL_IMAGE_WRITER": "image_writer", "MYSQL_IMAGE_WRITER_PASSWORD": "writer_password"},
+    clear=True,
+)
+def test_root_create_db_users_image_writer_limited_to_measurements():
+    with app.app_context():
+        root = Root()
+        root.logger = MagicMock()
+        root.fetch_all = MagicMock(return_value=[])
+        root.execute_sensitive = MagicMock()
+        root.execute = MagicMock()
+
+        root.create_db_users()
+
+        root.execute_sensitive.assert_called_once_with(
+            "CREATE USER IF NOT EXISTS %s IDENTIFIED BY %s;",
+            ["image_writer", "writer_password"],
+        )
+        grants = [call.args[0] for call in root.execute.call_args_list if call.args[0].startswith("GRANT")]
+        assert grants == [
+            "GRANT SELECT ON `VV.image` TO %s;",
+            "GRANT SELECT (image_id, image_placeholder), "
+            "UPDATE (image_width, image_height, image_color, image_bytes, image_placeholder) "
+            "ON `image` TO %s;",
+        ]
+
+
 @patch.dict(
     os.environ,
     {"MYSQL_VIEW_USER": "view_user", "MYSQL_VIEW_USER_PASSWORD": "view_password"},
@@ -50,18 +50,21 @@ def test_view_user_get_all_categories():
             {"category_id": 2, "category_title": "Design", "category_order": 2},
             {"category_id": 3, "category_title": "Comics", "category_order": 3},
         ]
-        mock_category = MagicMock()
 
         view_user = View_User()
         view_user.fetch_all = MagicMock(return_value=mock_result)
         view_user.logger = MagicMock()
 
         with patch(
-            "data_classes.category.Category.from_dict", return_value=mock_category
+            "data_classes.category.Category.from_dict"
         ) as mock_from_dict:
             result = view_user.get_all_categories()
-            assert mock_from_dict.call_count == 3
-            assert result == [mock_category, mock_category, mock_category]
+            assert mock_from_dict.call_count == 0  # Valid rows are built without the per row path
+            assert result == [
+                Category("Illustration", 1, 1),
+                Category("Design", 2, 2),
+                Category("Comics", 3, 3),
+            ]
             view_user.logger.info.assert_any_call("Getting all categories - Sorted")
 
 
@@ -105,7 +108,7 @@ def test_view_user_get_all_categories_failed_obj_creation():
             side_effect=mock_from_dict,
         ):
             result = view_user.get_all_categories()
-            assert result == ["Category-1", "Category-3"]
+            assert result == [Category("Illustration", 1, 1), Category("Comics", 3, 3)]
             view_user.logger.error.assert_any_call(
                 "Failed to create category from {'category_id': 2, 'category_title': 'Design', 'category_order': 'bad'} -> Invalid category_order"
             )
@@ -125,8 +128,8 @@ def test_view_user_get_all_categories_failure():
         )
 
 
-# Get category by title testing
-def test_view_user_get_category_by_title():
+# Get category by slug testing
+def test_view_user_get_category_by_slug():
     with app.app_context():
         mock_result = [
             {"category_id": 1, "category_title": "Illustration", "category_order": 1}
@@ -140,13 +143,28 @@ def test_view_user_get_category_by_title():
         with patch(
             "data_classes.category.Category.from_dict", return_value=mock_category
         ) as mock_from_dict:
-            result = view_user.get_category_by_title("Illustration")
+            result = view_user.get_category_by_slug("illustration")
             assert mock_from_dict.call_count == 1
             assert result == mock_category
-            view_user.logger.info.assert_any_call("Getting category by Illustration")
+            view_user.logger.info.assert_any_call("Getting category by %s", "illustration")
+            view_user.fetch_all.assert_called_once_with(
+                "SELECT * FROM Portfolio.`VV.category` WHERE category_slug = %s;",
+                ["illustration"],
+            )
+
+
+def test_view_user_get_category_by_slug_normalizes_title():
+    with app.app_context():
+        view_user = View_User()
+        view_user.fetch_all = MagicMock(return_value=None)
+        view_user.logger = MagicMock()
+
+        view_user.get_category_by_slug("100% Comics_")
+
+        assert view_user.fetch_all.call_args.args[1] == ["100-comics"]
 
 
-def test_view_user_get_category_by_title_return_none():
+def test_view_user_get_category_by_slug_return_none():
     with app.app_context():
         mock_result = None
         mock_category = MagicMock()
@@ -158,13 +176,13 @@ def test_view_user_get_category_by_title_return_none():
         with patch(
             "data_classes.category.Category.from_dict", return_value=mock_category
         ) as mock_from_dict:
-            result = view_user.get_category_by_title("Design")
+            result = view_user.get_category_by_slug("design")
             assert mock_from_dict.call_count == 0
             assert result is None
-            view_user.logger.info.assert_any_call("Getting category by Design")
+            view_user.logger.info.assert_any_call("Getting category by %s", "design")
 
 
-def test_view_user_get_category_by_title_failed_obj_creation():
+def test_view_user_get_category_by_slug_failed_obj_creation():
     with app.app_context():
         mock_result = [
             {
@@ -182,22 +200,22 @@ def test_view_user_get_category_by_title_failed_obj_creation():
             "data_classes.category.Category.from_dict",
             side_effect=ValueError("bad data"),
         ):
-            result = view_user.get_category_by_title("Illustration")
+            result = view_user.get_category_by_slug("illustration")
             view_user.logger.error.assert_any_call(
                 "Failed to create category from {'category_id': 1, 'category_title': 'Illustration', 'category_order': 'bad'}: bad data"
             )
             assert result is None
 
 
-def test_view_user_get_category_by_title_failure():
+def test_view_user_get_category_by_slug_failure():
     with app.app_context():
         view_user = View_User()
         view_user.fetch_all = MagicMock(side_effect=Exception("Database error"))
         view_user.logger = MagicMock()
 
         with pytest.raises(Exception) as exc_info:
-            view_user.get_category_by_title("Illustration")
-        assert "Failed to get category 'Illustration': Database error" in str(
+            view_user.get_category_by_slug("illustration")
+        assert "Failed to get category 'illustration': Database error" in str(
             exc_info.value
         )
 
@@ -358,20 +376,20 @@ def test_view_user_get_project_by_category():
                 "image.project_id": 3,
             },
         ]
-        mock_project = MagicMock()
 
         view_user = View_User()
         view_user.fetch_all = MagicMock(return_value=mock_result)
         view_user.logger = MagicMock()
 
         with patch(
-            "data_classes.project.Project.from_dict", return_value=mock_project
+            "data_classes.project.Project.from_dict"
         ) as mock_from_dict:
             result = view_user.get_projects_by_category(1)
-            assert mock_from_dict.call_count == 3
-            assert result == [mock_project, mock_project, mock_project]
+            assert mock_from_dict.call_count == 0  # Valid rows are built without the per row path
+            assert [project.project_id for project in result] == [1, 2, 3]
+            assert result[0].project_image.image_id == 1
             view_user.logger.info.assert_any_call(
-                "Getting all projects from category 1 - Sorted"
+                "Getting all projects from category %s - Sorted", 1
             )
 
 
@@ -391,7 +409,7 @@ def test_view_user_get_project_by_category_return_none():
             assert result == []
             assert mock_from_dict.call_count == 0
             view_user.logger.info.assert_any_call(
-                "Getting all projects from category 20"
+                "Getting all projects from category %s", 20
             )
 
 
@@ -452,7 +470,7 @@ def test_view_user_get_project_by_category_failed_obj_creation():
             "data_classes.project.Project.from_dict", side_effect=mock_from_dict
         ):
             result = view_user.get_projects_by_category(1)
-            assert result == ["Project-2", "Project-3"]
+            assert [project.project_id for project in result] == [2, 3]
             view_user.logger.error.assert_any_call(
                 "Failed to create project from {'project_id': 'bad', 'project_title': 'project 1', 'project_date': 'date', 'project_desc': 'Desc 1', 'category_id': 1, 'project_image_id': 1, 'image_id': 1, 'image_title': 'image title', 'image_desc': None, 'image_URL': 'some_link.com', 'image.project_id': 1}: Invalid project_id"
             )
@@ -472,7 +490,7 @@ def test_view_user_get_project_by_category_failure():
 
 
 # Get project by category title testing
-def test_view_user_get_project_by_category_title():
+def test_view_user_get_project_by_category_slug():
     with app.app_context():
         mock_result = [
             {
@@ -515,24 +533,24 @@ def test_view_user_get_project_by_category_title():
                 "image.project_id": 3,
             },
         ]
-        mock_project = MagicMock()
 
         view_user = View_User()
         view_user.fetch_all = MagicMock(return_value=mock_result)
         view_user.logger = MagicMock()
 
         with patch(
-            "data_classes.project.Project.from_dict", return_value=mock_project
+            "data_classes.project.Project.from_dict"
         ) as mock_from_dict:
-            result = view_user.get_projects_by_category_title("design")
-            assert mock_from_dict.call_count == 3
-            assert result == [mock_project, mock_project, mock_project]
+            result = view_user.get_projects_by_category_slug("design")
+            assert mock_from_dict.call_count == 0  # Valid rows are built without the per row path
+            assert [project.project_id for project in result] == [1, 2, 3]
+            assert result[0].project_image.image_id == 1
             view_user.logger.info.assert_any_call(
-                "Getting all projects from category 'design' - Sorted"
+                "Getting all projects from category '%s' - Sorted", "design"
             )
 
 
-def test_view_user_get_project_by_category_title_return_none():
+def test_view_user_get_project_by_category_slug_return_none():
     with app.app_context():
         mock_result = None
         mock_project = MagicMock()
@@ -544,15 +562,15 @@ def test_view_user_get_project_by_category_title_return_none():
         with patch(
             "data_classes.project.Project.from_dict", return_value=mock_project
         ) as mock_from_dict:
-            result = view_user.get_projects_by_category_title("design", False)
+            result = view_user.get_projects_by_category_slug("design", False)
             assert result == []
             assert mock_from_dict.call_count == 0
             view_user.logger.info.assert_any_call(
-                "Getting all projects from category 'design'"
+                "Getting all projects from category '%s'", "design"
             )
 
 
-def test_view_user_get_project_by_category_title_failed_obj_creation():
+def test_view_user_get_project_by_category_slug_failed_obj_creation():
     with app.app_context():
         mock_result = [
             {
@@ -608,21 +626,21 @@ def test_view_user_get_project_by_category_title_failed_obj_creation():
         with patch(
             "data_classes.project.Project.from_dict", side_effect=mock_from_dict
         ):
-            result = view_user.get_projects_by_category_title("design")
-            assert result == ["Project-2", "Project-3"]
+            result = view_user.get_projects_by_category_slug("design")
+            assert [project.project_id for project in result] == [2, 3]
             view_user.logger.error.assert_any_call(
                 "Failed to create project from {'project_id': 'bad', 'project_title': 'project 1', 'project_date': 'date', 'project_desc': 'Desc 1', 'category_id': 1, 'project_image_id': 1, 'image_id': 1, 'image_title': 'image title', 'image_desc': None, 'image_URL': 'some_link.com', 'image.project_id': 1}: Invalid project_id"
             )
 
 
-def test_view_user_get_project_by_category_title_failure():
+def test_view_user_get_project_by_category_slug_failure():
     with app.app_context():
         view_user = View_User()
         view_user.fetch_all = MagicMock(side_effect=Exception("Database error"))
         view_user.logger = MagicMock()
 
         with pytest.raises(Exception) as exc_info:
-            view_user.get_projects_by_category_title("design")
+            view_user.get_projects_by_category_slug("design")
         assert "Failed to get projects from category design: Database error" in str(
             exc_info.value
         )
@@ -658,7 +676,7 @@ def test_view_user_get_project():
             result = view_user.get_project(1)
             assert mock_from_dict.call_count == 1
             assert result == mock_project
-            view_user.logger.info.assert_any_call("Getting project by id 1")
+            view_user.logger.info.assert_any_call("Getting project by id %s", 1)
 
 
 def test_view_user_get_project_return_none():
@@ -676,7 +694,7 @@ def test_view_user_get_project_return_none():
             result = view_user.get_project(5)
             assert result == None
             assert mock_from_dict.call_count == 0
-            view_user.logger.info.assert_any_call("Getting project by id 5")
+            view_user.logger.info.assert_any_call("Getting project by id %s", 5)
 
 
 def test_view_user_get_project_failed_obj_creation():
@@ -727,8 +745,8 @@ def test_view_user_get_project_failure():
         assert "Failed to get project by id 1: Database error" in str(exc_info.value)
 
 
-# Get project by title testing
-def test_view_user_get_project_by_title():
+# Get project by slug testing
+def test_view_user_get_project_by_slug():
     with app.app_context():
         mock_result = [
             {
@@ -754,15 +772,19 @@ def test_view_user_get_project_by_title():
         with patch(
             "data_classes.project.Project.from_dict", return_value=mock_project
         ) as mock_from_dict:
-            result = view_user.get_project_by_title("project 1", "design")
+            result = view_user.get_project_by_slug("project-1", "design")
             assert mock_from_dict.call_count == 1
             assert result == mock_project
+            query, args = view_user.fetch_all.call_args.args
+            assert "category.category_slug = %s AND project.project_slug = %s" in query
+            assert "LIKE" not in query
+            assert args == ["design", "project-1"]
             view_user.logger.info.assert_any_call(
-                "Getting project: project 1  from category: design"
+                "Getting project: %s  from category: %s", "project-1", "design"
             )
 
 
-def test_view_user_get_project_by_title_return_none():
+def test_view_user_get_project_by_slug_return_none():
     with app.app_context():
         mock_result = None
         mock_project = MagicMock()
@@ -774,15 +796,15 @@ def test_view_user_get_project_by_title_return_none():
         with patch(
             "data_classes.project.Project.from_dict", return_value=mock_project
         ) as mock_from_dict:
-            result = view_user.get_project_by_title("project 7", "design")
+            result = view_user.get_project_by_slug("project-7", "design")
             assert result == None
             assert mock_from_dict.call_count == 0
             view_user.logger.info.assert_any_call(
-                "Getting project: project 7  from category: design"
+                "Getting project: %s  from category: %s", "project-7", "design"
             )
 
 
-def test_view_user_get_project_by_title_failed_obj_creation():
+def test_view_user_get_project_by_slug_failed_obj_creation():
     with app.app_context():
         mock_result = [
             {
@@ -812,23 +834,137 @@ def test_view_user_get_project_by_title_failed_obj_creation():
         with patch(
             "data_classes.project.Project.from_dict", side_effect=mock_from_dict
         ):
-            result = view_user.get_project_by_title("project 1", "design")
+            result = view_user.get_project_by_slug("project-1", "design")
             assert result == None
             view_user.logger.error.assert_any_call(
                 "Failed to create project from {'project_id': 'bad', 'project_title': 'project 1', 'project_date': 'date', 'project_desc': 'Desc 1', 'category_id': 1, 'project_image_id': 1, 'image_id': 1, 'image_title': 'image title', 'image_desc': None, 'image_URL': 'some_link.com', 'image.project_id': 1}: Invalid project_id"
             )
 
 
-def test_view_user_get_project_by_title_failure():
+def test_view_user_get_project_by_slug_failure():
+    with app.app_context():
+        view_user = View_User()
+        view_user.fetch_all = MagicMock(side_effect=Exception("Database error"))
+        view_user.logger = MagicMock()
+
+        with pytest.raises(Exception) as exc_info:
+            view_user.get_project_by_slug("project-1", "design")
+        assert (
+            "Failed to get project project-1 in category design: Database error"
+            in str(exc_info.value)
+        )
+
+
+# Get project page testing
+def project_page_row(image_id, image_weight, project_id=1):
+    return {
+        "project_id": project_id,
+        "project_title": "project 1",
+        "project_date": "2025-01-02",
+        "project_desc": "Desc 1",
+        "category_id": 2,
+        "project_image_id": 1,
+        "project_slug": "project-1",
+        "category_title": "design",
+        "category_order": 1,
+        "category_slug": "design",
+        "image_id": image_id,
+        "image_title": f"image {image_id}",
+        "image_desc": None,
+        "image_URL": "some_link.com",
+        "image_weight": image_weight,
+    }
+
+
+def test_view_user_get_project_page():
+    with app.app_context():
+        mock_result = [project_page_row(1, 1), project_page_row(2, 2)]
+
+        view_user = View_User()
+        view_user.fetch_all = MagicMock(return_value=mock_result)
+        view_user.logger = MagicMock()
+
+        project, category, images = view_user.get_project_page("design", "project-1")
+
+        view_user.fetch_all.assert_called_once_with(ANY, ["design", "project-1"])
+        assert project.project_id == 1
+        assert project.project_title == "project 1"
+        assert project.project_slug == "project-1"
+        assert project.project_image_id == 1
+        assert project.project_image is None
+        assert category == Category("design", 2, 1)
+        assert [image.image_id for image in images] == [1, 2]
+        assert all(image.project_id == 1 for image in images)
+        view_user.logger.info.assert_any_call(
+            "Getting project page: %s from category: %s", "project-1", "design"
+        )
+
+
+def test_view_user_get_project_page_no_images():
+    with app.app_context():
+        mock_result = [project_page_row(None, None)]
+
+        view_user = View_User()
+        view_user.fetch_all = MagicMock(return_value=mock_result)
+        view_user.logger = MagicMock()
+
+        project, category, images = view_user.get_project_page("design", "project-1")
+
+        assert project.project_id == 1
+        assert category.category_title == "design"
+        assert images == []
+
+
+def test_view_user_get_project_page_only_first_project():
+    with app.app_context():
+        mock_result = [project_page_row(1, 1), project_page_row(5, 1, project_id=2)]
+
+        view_user = View_User()
+        view_user.fetch_all = MagicMock(return_value=mock_result)
+        view_user.logger = MagicMock()
+
+        project, _, images = view_user.get_project_page("design", "project-1")
+
+        assert project.project_id == 1
+        assert [image.image_id for image in images] == [1]
+
+
+def test_view_user_get_project_page_return_none():
+    with app.app_context():
+        view_user = View_User()
+        view_user.fetch_all = MagicMock(return_value=None)
+        view_user.logger = MagicMock()
+
+        result = view_user.get_project_page("design", "project-7")
+
+        assert result is None
+
+
+def test_view_user_get_project_page_failed_obj_creation():
+    with app.app_context():
+        row = project_page_row(1, 1)
+        row["project_id"] = "bad"
+
+        view_user = View_User()
+        view_user.fetch_all = MagicMock(return_value=[row])
+        view_user.logger = MagicMock()
+
+        result = view_user.get_project_page("design", "project-1")
+
+        assert result is None
+        view_user.logger.error.assert_called_once()
+
+
+def test_view_user_get_project_page_failure():
     with app.app_context():
         view_user = View_User()
         view_user.fetch_all = MagicMock(side_effect=Exception("Database error"))
         view_user.logger = MagicMock()
 
         with pytest.raises(Exception) as exc_info:
-            view_user.get_project_by_title("project 1", "design")
+            view_user.get_project_page("design", "project-1")
         assert (
-            "Failed to get project project 1 in category design: Database error"
+            "Failed to get project page project-1 in category design: Database error"
             in str(exc_info.value)
         )
 
@@ -854,18 +990,17 @@ def test_view_user_get_all_images():
                 "project_id": 2,
             },
         ]
-        mock_image = MagicMock()
 
         view_user = View_User()
         view_user.fetch_all = MagicMock(return_value=mock_result)
         view_user.logger = MagicMock()
 
         with patch(
-            "data_classes.image.Image.from_dict", return_value=mock_image
+            "data_classes.image.Image.from_dict"
         ) as mock_from_dict:
             result = view_user.get_all_images()
-            assert mock_from_dict.call_count == 2
-            assert result == [mock_image, mock_image]
+            assert mock_from_dict.call_count == 0  # Valid rows are built without the per row path
+            assert [image.image_id for image in result] == [1, 2]
             view_user.logger.info.assert_any_call("Getting all images")
 
 
@@ -918,7 +1053,7 @@ def test_view_user_get_all_images_failed_obj_creation():
         view_user.logger = MagicMock()
         with patch("data_classes.image.Image.from_dict", side_effect=mock_from_dict):
             result = view_user.get_all_images()
-            assert result == ["Image-2"]
+            assert [image.image_id for image in result] == [2]
             view_user.logger.error.assert_any_call(
                 "Failed to create image from {'image_id': 'bad', 'image_title': 'Image 1', 'image_desc': None, 'image_URL': 'some_link.com', 'image_weight': 1, 'project_id': 1}: Invalid image_id"
             )
@@ -956,19 +1091,18 @@ def test_view_user_get_project_images():
                 "project_id": 2,
             },
         ]
-        mock_image = MagicMock()
 
         view_user = View_User()
         view_user.fetch_all = MagicMock(return_value=mock_result)
         view_user.logger = MagicMock()
 
         with patch(
-            "data_classes.image.Image.from_dict", return_value=mock_image
+            "data_classes.image.Image.from_dict"
         ) as mock_from_dict:
             result = view_user.get_project_images(1)
-            assert mock_from_dict.call_count == 2
-            assert result == [mock_image, mock_image]
-            view_user.logger.info.assert_any_call("Getting all images for project id 1")
+            assert mock_from_dict.call_count == 0  # Valid rows are built without the per row path
+            assert [image.image_id for image in result] == [1, 2]
+            view_user.logger.info.assert_any_call("Getting all images for project id %s", 1)
 
 
 def test_view_user_get_project_images_return_none():
@@ -986,7 +1120,7 @@ def test_view_user_get_project_images_return_none():
             result = view_user.get_project_images(5)
             assert mock_from_dict.call_count == 0
             assert result == []
-            view_user.logger.info.assert_any_call("Getting all images for project id 5")
+            view_user.logger.info.assert_any_call("Getting all images for project id %s", 5)
 
 
 def test_view_user_get_project_images_failed_obj_creation():
@@ -1020,7 +1154,7 @@ def test_view_user_get_project_images_failed_obj_creation():
         view_user.logger = MagicMock()
         with patch("data_classes.image.Image.from_dict", side_effect=mock_from_dict):
             result = view_user.get_project_images(1)
-            assert result == ["Image-2"]
+            assert [image.image_id for image in result] == [2]
             view_user.logger.error.assert_any_call(
                 "Failed to create image from {'image_id': 'bad', 'image_title': 'Image 1', 'image_desc': None, 'image_URL': 'some_link.com', 'image_weight': 1, 'project_id': 1}: Invalid image_id"
             )
@@ -1064,7 +1198,7 @@ def test_view_user_get_image():
             result = view_user.get_image(1)
             assert mock_from_dict.call_count == 1
             assert result == mock_image
-            view_user.logger.info.assert_any_call("Getting image by id 1")
+            view_user.logger.info.assert_any_call("Getting image by id %s", 1)
 
 
 def test_view_user_get_image_return_none():
@@ -1082,7 +1216,7 @@ def test_view_user_get_image_return_none():
             result = view_user.get_image(5)
             assert mock_from_dict.call_count == 0
             assert result == None
-            view_user.logger.info.assert_any_call("Getting image by id 5")
+            view_user.logger.info.assert_any_call("Getting image by id %s", 5)
 
 
 def test_view_user_get_image_failed_obj_creation():
@@ -1154,7 +1288,7 @@ def test_view_user_check_user_exist_and_password():
             assert name_match is True
             assert password_match is True
             view_user.logger.info.assert_any_call(
-                "Checking if username 'Test-Admin' exist"
+                "Checking if username '%s' exist", "Test-Admin"
             )
 
 
@@ -1178,7 +1312,7 @@ def test_view_user_check_user_exist_and_password_user_name_not_match():
 
             assert name_match is False
             assert password_match is False
-            view_user.logger.info.assert_any_call("Unable to find username 'bad_user'")
+            view_user.logger.info.assert_any_call("Unable to find username '%s'", "bad_user")
 
 
 def test_view_user_check_user_exist_and_password_password_not_match():
@@ -1209,7 +1343,7 @@ def test_view_user_check_user_exist_and_password_password_not_match():
             assert name_match is True
             assert password_match is False
             view_user.logger.info.assert_any_call(
-                "Checking if username 'Test-Admin' entered password matches hashed"
+                "Checking if username '%s' entered password matches hashed", "Test-Admin"
             )
 
 
@@ -0,0 +1,59 @@
+import os
+import sys
+from unittest.mock import MagicMock
+import pytest
+from app import app
+from mysql_connections.mysql_Root import Root
+from mysql_connections.mysql_view_user import View_User
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# EXPLAIN checks for the View_User queries. These run against a real MySQL server loaded with
+# sql-scripts/init-db.sql and the test data, so they are skipped unless MYSQL_EXPLAIN_TESTS is set.
+# The get_all_* queries read every row on purpose and are not checked.
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("MYSQL_EXPLAIN_TESTS"),
+    reason="Set MYSQL_EXPLAIN_TESTS=1 with a database made from init-db.sql to check query plans",
+)
+
+VIEW_USER_CALLS = [
+    ("get_category_by_slug", ["design"]),
+    ("get_projects_by_category", [2]),
+    ("get_projects_by_category", [2, False]),
+    ("get_projects_by_category_slug", ["design"]),
+    ("get_project", [1]),
+    ("get_project_by_slug", ["a-to-z", "illustration"]),
+    ("get_project_page", ["illustration", "a-to-z"]),
+    ("get_project_images", [5]),
+    ("get_image", [1]),
+    ("check_user_exist_and_password", ["admin", "password"]),
+]
+
+
+def captured_query(method, args):
+    """Runs a View_User method with the database calls mocked and returns the query and arguments it sent."""
+    view_user = View_User()
+    view_user.logger = MagicMock()
+    view_user.fetch_all = MagicMock(return_value=None)
+    view_user.fetch_all_sensitive = MagicMock(return_value=None)
+    getattr(view_user, method)(*args)
+    sent = view_user.fetch_all.call_args or view_user.fetch_all_sensitive.call_args
+    return sent.args[0], sent.args[1]
+
+
+@pytest.mark.parametrize("method, args", VIEW_USER_CALLS)
+def test_view_user_query_uses_index(method, args):
+    with app.app_context():
+        query, query_args = captured_query(method, args)
+
+        plan = Root().fetch_all(f"EXPLAIN {query}", query_args)
+
+        full_scans = [row["table"] for row in plan if row["type"] == "ALL"]
+        assert full_scans == [], f"{method} scans {full_scans}: {plan}"
+        assert all(row["key"] is not None for row in plan if row["table"]), plan
+
+
+def test_database_has_needed_indexes():
+    with app.app_context():
+        assert Root().check_indexes() == []
@@ -14,25 +14,28 @@ from data_classes.image import Image
 
 def test_category_hyphen_converter(test_category_client_and_mocks):
     client, mock_view_user = test_category_client_and_mocks
-    response = client.get("/portfolio/test_test")
-    mock_view_user.get_category_by_title.assert_called_once_with("test test")
-    assert response.request.path == "/portfolio/test_test"
+    response = client.get("/portfolio/test_test", follow_redirects=True)
+    mock_view_user.get_category_by_slug.assert_called_once_with("test-test")
+    assert response.history[0].status_code == 301
+    assert response.request.path == "/portfolio/test-test"
     assert response.status_code == 200
 
 
 def test_category_hyphen_converter_space(test_category_client_and_mocks):
     client, mock_view_user = test_category_client_and_mocks
-    response = client.get("/portfolio/test test")
-    mock_view_user.get_category_by_title.assert_called_once_with("test test")
-    assert response.request.path == "/portfolio/test test"
+    response = client.get("/portfolio/test test", follow_redirects=True)
+    mock_view_user.get_category_by_slug.assert_called_once_with("test-test")
+    assert response.history[0].status_code == 301
+    assert response.request.path == "/portfolio/test-test"
     assert response.status_code == 200
 
 
 def test_category_hyphen_converter_apostrophe(test_category_client_and_mocks):
     client, mock_view_user = test_category_client_and_mocks
-    response = client.get("/portfolio/test's")
-    mock_view_user.get_category_by_title.assert_called_once_with("test's")
-    assert response.request.path == "/portfolio/test's"
+    response = client.get("/portfolio/test's", follow_redirects=True)
+    mock_view_user.get_category_by_slug.assert_called_once_with("tests")
+    assert response.history[0].status_code == 301
+    assert response.request.path == "/portfolio/tests"
     assert response.status_code == 200
 
 
@@ -51,7 +54,7 @@ def test_category_load_category_page(test_category_client_and_mocks):
     image = Image(1, 1, 1, "test_image", "image_desc", "test_url")
     proj_date = date(2025, 1, 2)
     project = Project("test_project", image, 1, proj_date, 1, "project_desc", 1)
-    mock_view_user.get_category_by_title.return_value = category
+    mock_view_user.get_category_by_slug.return_value = category
     mock_view_user.get_projects_by_category.return_value = [project]
     response = client.get("/portfolio/test")
     assert response.request.path == "/portfolio/test"
@@ -61,25 +64,33 @@ def test_category_load_category_page(test_category_client_and_mocks):
 
 def test_category_not_found(test_category_client_and_mocks, caplog):
     client, mock_view_user = test_category_client_and_mocks
-    mock_view_user.get_category_by_title.return_value = None
+    mock_view_user.get_category_by_slug.return_value = None
 
     with caplog.at_level("ERROR"):
-        response = client.get("/portfolio/NotACategory")
+        response = client.get("/portfolio/notacategory")
     assert response.status_code == 404
     assert (
-        b"""<div class="flash-message error">Category &#39;NotACategory&#39; not found</div>"""
+        b"""<div class="flash-message error">Category &#39;notacategory&#39; not found</div>"""
         in response.data
     )
 
 
 def test_category_error(test_category_client_and_mocks, caplog):
     client, mock_view_user = test_category_client_and_mocks
-    mock_view_user.get_category_by_title.side_effect = Exception("DB Error")
+    mock_view_user.get_category_by_slug.side_effect = Exception("DB Error")
 
     with caplog.at_level("ERROR"):
-        response = client.get("/portfolio/badCategory")
+        response = client.get("/portfolio/badcategory")
     assert response.status_code == 500
     assert (
-        b"""<div class="flash-message error">An Error occurred when attempting to look up &#39;badCategory&#39;</div>"""
+        b"""<div class="flash-message error">An Error occurred when attempting to look up &#39;badcategory&#39;</div>"""
         in response.data
     )
+
+
+def test_category_redirect_keeps_query(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    response = client.get("/portfolio/Test_Category?page=2")
+    assert response.status_code == 301
+    assert response.headers["Location"] == "/portfolio/test-category?page=2"
+    mock_view_user.get_category_by_slug.assert_not_called()  # Redirected before any lookup
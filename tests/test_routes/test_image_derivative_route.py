@@ -0,0 +1,199 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import io
+import pytest
+from unittest.mock import patch
+from app import app
+from data_classes.category import Category
+from data_classes.image import Image
+from data_classes.project import Project
+from routes.route_image_proxy import proxy_url
+from utility_classes.image_derivatives import DerivativeStore, url_hash
+
+PILImage = pytest.importorskip("PIL.Image")
+
+URL = "https://example.com/painting.png"
+
+
+def proxied(url):
+    with app.test_request_context():
+        return proxy_url(url)
+
+
+def store_with_source(tmp_path):
+    output = io.BytesIO()
+    PILImage.new("RGB", (1600, 900)).save(output, "PNG")
+    (tmp_path / url_hash(URL)).mkdir()
+    (tmp_path / url_hash(URL) / "source").write_bytes(output.getvalue())
+    return DerivativeStore(str(tmp_path), ("avif", "webp"))
+
+
+def store_with_thumb(tmp_path):
+    store = store_with_source(tmp_path)
+    store.get(URL, "thumb", "webp")  # As made by the background thread or flask backfill-images
+    return store
+
+
+def test_derivative_served_immutable(test_derivative_client_and_mocks, tmp_path):
+    client, mock_view_user = test_derivative_client_and_mocks
+    mock_view_user.get_image.return_value = Image(0, 1, 7, image_url=URL)
+
+    with patch.dict(app.extensions, {"image_store": store_with_thumb(tmp_path)}):
+        response = client.get(f"/images/7/thumb.webp?v={url_hash(URL)}")
+        data = response.data
+        response.close()
+
+    assert response.status_code == 200
+    assert response.mimetype == "image/webp"
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    with PILImage.open(io.BytesIO(data)) as image:
+        assert image.size == (800, 450)
+
+
+def test_derivative_does_not_write_to_database(test_derivative_client_and_mocks, tmp_path):
+    client, mock_view_user = test_derivative_client_and_mocks
+    mock_view_user.get_image.return_value = Image(0, 1, 7, image_url=URL)  # Not measured yet
+
+    with patch.dict(app.extensions, {"image_store": store_with_thumb(tmp_path)}), patch(
+        "mysql_connections.mysql_base.MySQLBase.execute"
+    ) as mock_execute, patch("mysql_connections.mysql_base.MySQLBase.execute_many") as mock_execute_many:
+        assert client.get("/images/7/thumb.webp").status_code == 200
+
+    mock_execute.assert_not_called()  # Measurements are stored by flask backfill-images
+    mock_execute_many.assert_not_called()
+
+
+def test_derivative_without_current_hash_not_immutable(test_derivative_client_and_mocks, tmp_path):
+    client, mock_view_user = test_derivative_client_and_mocks
+    mock_view_user.get_image.return_value = Image(0, 1, 7, image_url=URL)
+
+    with patch.dict(app.extensions, {"image_store": store_with_thumb(tmp_path)}):
+        response = client.get("/images/7/thumb.webp?v=old")
+        response.close()
+
+    assert response.headers["Cache-Control"] == "public, max-age=86400"
+
+
+def test_missing_derivative_redirects_and_is_made_in_background(test_derivative_client_and_mocks, tmp_path):
+    client, mock_view_user = test_derivative_client_and_mocks
+    mock_view_user.get_image.return_value = Image(0, 1, 7, image_url=URL)
+    store = store_with_source(tmp_path)
+
+    with patch.dict(app.extensions, {"image_store": store}):
+        response = client.get("/images/7/thumb.webp")
+        assert response.status_code == 302
+        assert response.headers["Location"] == proxied(URL)
+        assert response.headers["Cache-Control"] == "no-store"  # Not remembered, the next request gets the thumbnail
+
+        store._pool.shutdown(wait=True)
+        response = client.get("/images/7/thumb.webp")
+        response.close()
+
+    assert response.status_code == 200
+
+
+def test_derivative_failure_redirects_to_original(test_derivative_client_and_mocks, tmp_path):
+    client, mock_view_user = test_derivative_client_and_mocks
+    mock_view_user.get_image.return_value = Image(0, 1, 7, image_url="ftp://example.com/painting.png")
+    store = DerivativeStore(str(tmp_path), ("webp",))
+
+    with patch.dict(app.extensions, {"image_store": store}):
+        response = client.get("/images/7/thumb.webp")
+        store._pool.shutdown(wait=True)
+        response_after_failure = client.get("/images/7/thumb.webp")
+
+    assert response.status_code == 302
+    assert response.headers["Location"] == "ftp://example.com/painting.png"  # Not http, so not proxied either
+    assert response.headers["Cache-Control"] == "no-store"
+    assert response_after_failure.status_code == 302
+
+
+def test_unknown_image_size_or_format(test_derivative_client_and_mocks, tmp_path):
+    client, mock_view_user = test_derivative_client_and_mocks
+    mock_view_user.get_image.return_value = Image(0, 1, 7, image_url=URL)
+
+    with patch.dict(app.extensions, {"image_store": DerivativeStore(str(tmp_path), ("webp",))}):
+        assert client.get("/images/7/huge.webp").status_code == 404
+        assert client.get("/images/7/thumb.gif").status_code == 404
+
+    mock_view_user.get_image.assert_not_called()
+
+
+def test_unknown_image(test_derivative_client_and_mocks, tmp_path):
+    client, mock_view_user = test_derivative_client_and_mocks
+    mock_view_user.get_image.return_value = None
+
+    with patch.dict(app.extensions, {"image_store": DerivativeStore(str(tmp_path), ("webp",))}):
+        assert client.get("/images/7/thumb.webp").status_code == 404
+
+
+def test_category_grid_links_thumbnails(test_category_client_and_mocks, tmp_path):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = [
+        Project("Painting", project_image=Image(0, 1, 7, image_url=URL), project_id=1),
+        Project("Empty", project_image=Image(0, 2), project_id=2),
+    ]
+
+    with patch.dict(app.extensions, {"image_store": DerivativeStore(str(tmp_path), ("avif", "webp"))}):
+        response = client.get("/portfolio/test")
+
+    assert f'<source type="image/avif" srcset="/images/7/thumb.avif?v={url_hash(URL)}">'.encode() in response.data
+    assert f'src="/images/7/thumb.webp?v={url_hash(URL)}"'.encode() in response.data
+    assert f'src="{proxied(Image(0, 2).image_url)}"'.encode() in response.data  # Projects without an image keep the default
+
+
+def test_originals_linked_without_derivatives(test_category_client_and_mocks, tmp_path):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = [
+        Project("Painting", project_image=Image(0, 1, 7, image_url=URL), project_id=1)
+    ]
+
+    with patch.dict(app.extensions, {"image_store": DerivativeStore(str(tmp_path), ())}):
+        response = client.get("/portfolio/test")
+
+    assert f'src="{proxied(URL)}"'.encode() in response.data
+    assert b"<source" not in response.data
+
+
+def test_measured_images_sized_before_loading(test_category_client_and_mocks, tmp_path):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    measured = Image(0, 1, 7, image_url=URL, image_width=2400, image_height=1200, image_color="#c97829")
+    mock_view_user.get_projects_by_category.return_value = [
+        Project(f"Painting {i}", project_image=measured, project_id=i) for i in range(1, 8)
+    ]
+
+    with patch.dict(app.extensions, {"image_store": DerivativeStore(str(tmp_path), ("avif", "webp"))}):
+        page = client.get("/portfolio/test").data.decode()
+
+    v = url_hash(URL)
+    assert f'srcset="/images/7/small.webp?v={v} 400w, /images/7/thumb.webp?v={v} 800w, /images/7/medium.webp?v={v} 1600w"' in page
+    assert f'<source type="image/avif" srcset="/images/7/small.avif?v={v} 400w' in page
+    assert 'width="2400" height="1200"' in page
+    assert 'style="background-color: #c97829"' in page
+    assert '<div class="gallery wide" data-sized>' in page
+    assert "37vw" in page
+    assert page.count('loading="lazy"') == 1  # Only the tiles after the first screen wait to load
+
+
+def test_placeholder_shown_until_image_loads(test_project_client_and_mocks, tmp_path):
+    client, mock_view_user = test_project_client_and_mocks
+    placeholder = "data:image/webp;base64,AAAA"
+    mock_view_user.get_project_page.return_value = (
+        Project("Painting", project_id=1, project_slug="painting"),
+        Category("test", 1, 1),
+        [
+            Image(0, 1, 7, image_url=URL, image_width=1600, image_height=900, image_color="#c97829", image_placeholder=placeholder),
+            Image(1, 1, 8, image_url=URL, image_color="#c97829"),
+        ],
+    )
+
+    with patch.dict(app.extensions, {"image_store": DerivativeStore(str(tmp_path), ("webp",))}):
+        page = client.get("/portfolio/test/painting").data.decode()
+
+    assert f'style="background: #c97829 url({placeholder}) center / cover no-repeat" data-placeholder' in page
+    assert 'style="background-color: #c97829"' in page  # Not measured since placeholders were added
@@ -0,0 +1,87 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from unittest.mock import patch
+from app import app
+from data_classes.category import Category
+from routes.route_image_proxy import proxy_url
+from utility_classes.image_proxy import ProxyCache
+
+BODY = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def proxy(tmp_path, upstream):
+    upstream.files["/header.png"] = ("image/png", BODY)
+    app.testing = True
+    with app.test_client() as client, patch.dict(app.extensions, {"image_proxy": ProxyCache(str(tmp_path))}), patch(
+        "app.View_User"
+    ) as app_view_user:
+        app_view_user.return_value.get_all_categories.return_value = [Category("test", 1, 1)]  # Nav bar of error pages
+        with app.test_request_context():
+            link = proxy_url(f"{upstream.url}/header.png")
+        yield client, link
+
+
+def test_proxy_serves_cached_copy(proxy, upstream):
+    client, link = proxy
+
+    first = client.get(link)
+    second = client.get(link)
+
+    assert first.status_code == 200
+    assert first.mimetype == "image/png"
+    assert first.data == second.data == BODY
+    assert first.headers["Cache-Control"] == "public, max-age=86400"
+    assert upstream.requests == {"/header.png": 1}
+
+
+def test_proxy_answers_range_requests(proxy):
+    client, link = proxy
+
+    response = client.get(link, headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 10-19/{len(BODY)}"
+    assert response.data == BODY[10:20]
+
+
+def test_proxy_answers_conditional_requests(proxy):
+    client, link = proxy
+
+    etag = client.get(link).headers["ETag"]
+    response = client.get(link, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+
+
+def test_proxy_refuses_unsigned_urls(proxy, upstream):
+    client, _ = proxy
+
+    assert client.get(f"/media/{upstream.url}/header.png").status_code == 404
+    assert client.get("/media/not-a-token").status_code == 404
+    assert upstream.requests == {}
+
+
+def test_proxy_failure_redirects_to_original(proxy, upstream):
+    client, _ = proxy
+    with app.test_request_context():
+        link = proxy_url(f"{upstream.url}/missing.png")
+
+    response = client.get(link)
+
+    assert response.status_code == 302
+    assert response.headers["Location"] == f"{upstream.url}/missing.png"
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+def test_pages_link_header_through_proxy(test_category_client_and_mocks):
+    client, _ = test_category_client_and_mocks
+
+    response = client.get("/portfolio/about")
+
+    assert b'src="/media/' in response.data
+    assert b'src="https://static.wixstatic.com' not in response.data
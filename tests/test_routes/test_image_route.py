@@ -37,17 +37,19 @@ def test_image_create_with_defaults():
 
 def test_image_hyphen_converter(test_image_client_and_mocks):
     client, mock_view_user = test_image_client_and_mocks
-    response = client.get("/portfolio/test_test/project_name/image_id_1")
+    response = client.get("/portfolio/test_test/project_name/image_id_1", follow_redirects=True)
     mock_view_user.get_image.assert_called_once_with(1)
-    assert response.request.path == "/portfolio/test_test/project_name/image_id_1"
+    assert response.history[0].status_code == 301
+    assert response.request.path == "/portfolio/test-test/project-name/image_id_1"
     assert response.status_code == 200
 
 
 def test_image_hyphen_converter_space(test_image_client_and_mocks):
     client, mock_view_user = test_image_client_and_mocks
-    response = client.get("/portfolio/test test/project name/image_id_1")
+    response = client.get("/portfolio/test test/project name/image_id_1", follow_redirects=True)
     mock_view_user.get_image.assert_called_once_with(1)
-    assert response.request.path == "/portfolio/test test/project name/image_id_1"
+    assert response.history[0].status_code == 301
+    assert response.request.path == "/portfolio/test-test/project-name/image_id_1"
     assert response.status_code == 200
 
 
@@ -86,7 +88,7 @@ def test_image_error(test_image_client_and_mocks, caplog):
     mock_view_user.get_image.side_effect = Exception("DB Error")
 
     with caplog.at_level("ERROR"):
-        response = client.get("/portfolio/Category/project/image_id_4")
+        response = client.get("/portfolio/category/project/image_id_4")
 
     assert response.status_code == 500
     assert (
@@ -14,29 +14,32 @@ from data_classes.image import Image
 
 def test_project_hyphen_converter(test_project_client_and_mocks):
     client, mock_view_user = test_project_client_and_mocks
-    response = client.get("/portfolio/test_test/project_name")
-    mock_view_user.get_project_by_title.assert_called_once_with(
-        "project name", "test test"
+    response = client.get("/portfolio/test_test/project_name", follow_redirects=True)
+    mock_view_user.get_project_page.assert_called_once_with(
+        "test-test", "project-name"
     )
-    assert response.request.path == "/portfolio/test_test/project_name"
+    assert response.history[0].status_code == 301
+    assert response.request.path == "/portfolio/test-test/project-name"
     assert response.status_code == 200
 
 
 def test_project_hyphen_converter_space(test_project_client_and_mocks):
     client, mock_view_user = test_project_client_and_mocks
-    response = client.get("/portfolio/test test/project name")
-    mock_view_user.get_project_by_title.assert_called_once_with(
-        "project name", "test test"
+    response = client.get("/portfolio/test test/project name", follow_redirects=True)
+    mock_view_user.get_project_page.assert_called_once_with(
+        "test-test", "project-name"
     )
-    assert response.request.path == "/portfolio/test test/project name"
+    assert response.history[0].status_code == 301
+    assert response.request.path == "/portfolio/test-test/project-name"
     assert response.status_code == 200
 
 
 def test_project_hyphen_converter_apostrophe(test_project_client_and_mocks):
     client, mock_view_user = test_project_client_and_mocks
-    response = client.get("/portfolio/test's/project's")
-    mock_view_user.get_project_by_title.assert_called_once_with("project's", "test's")
-    assert response.request.path == "/portfolio/test's/project's"
+    response = client.get("/portfolio/test's/project's", follow_redirects=True)
+    mock_view_user.get_project_page.assert_called_once_with("tests", "projects")
+    assert response.history[0].status_code == 301
+    assert response.request.path == "/portfolio/tests/projects"
     assert response.status_code == 200
 
 
@@ -45,10 +48,9 @@ def test_project_load_page(test_project_client_and_mocks):
     client, mock_view_user = test_project_client_and_mocks
     proj = Project("Title", None, 1, date(2025, 1, 2), 2, "desc", 1)
     image = Image(1, 2)
-    mock_view_user.get_project_by_title.return_value = proj
-    mock_view_user.get_project_images.return_value = [image]
-    response = client.get("/portfolio/test/Title")
-    assert response.request.path == "/portfolio/test/Title"
+    mock_view_user.get_project_page.return_value = (proj, Category("test", 1, 1), [image])
+    response = client.get("/portfolio/test/title")
+    assert response.request.path == "/portfolio/test/title"
     assert response.status_code == 200
     assert b"""<div class="h3">Title</div>""" in response.data
     assert b"""<div class="image-title">None</div>""" in response.data
@@ -56,26 +58,23 @@ def test_project_load_page(test_project_client_and_mocks):
 
 def test_project_load_page_project_not_found(test_project_client_and_mocks):
     client, mock_view_user = test_project_client_and_mocks
-    proj = None
-    image = Image(1, 2)
-    mock_view_user.get_project_by_title.return_value = proj
-    mock_view_user.get_project_images.return_value = [image]
-    response = client.get("/portfolio/test/NotAProject")
+    mock_view_user.get_project_page.return_value = None
+    response = client.get("/portfolio/test/notaproject")
     assert response.status_code == 404
     assert (
-        b""" <div class="flash-message error">Project &#39;NotAProject&#39; not found in category &#39;test&#39;.</div>"""
+        b""" <div class="flash-message error">Project &#39;notaproject&#39; not found in category &#39;test&#39;.</div>"""
         in response.data
     )
 
 def test_project_error(test_project_client_and_mocks, caplog):
     client, mock_view_user = test_project_client_and_mocks
-    mock_view_user.get_project_by_title.side_effect = Exception("DB Error")
+    mock_view_user.get_project_page.side_effect = Exception("DB Error")
 
     with caplog.at_level("ERROR"):
-        response = client.get(f"/portfolio/Category/badProject")
+        response = client.get(f"/portfolio/category/badproject")
 
     assert response.status_code == 500
     assert (
-        b"""<div class="flash-message error">An Error occurred when attempting to look up &#39;badProject&#39;</div>"""
+        b"""<div class="flash-message error">An Error occurred when attempting to look up &#39;badproject&#39;</div>"""
         in response.data
     )
\ No newline at end of file
@@ -0,0 +1,122 @@
+import os
+import sys
+from unittest.mock import patch
+from flask import flash
+from data_classes.category import Category
+from utility_classes.cache_policy import CachePolicy, Policy
+from utility_classes.page_cache import PageCache
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def policy():
+    cache_policy = CachePolicy(Policy("no-store"), Policy("private, no-cache"))
+    cache_policy.add(("category", "project"), "public, max-age=60", ("Cookie",))
+    cache_policy.add(("project.display_project_images",), "public, max-age=5")
+    return cache_policy
+
+
+# --------------------------------------------------------------------------
+# Test choosing a policy
+# --------------------------------------------------------------------------
+def test_endpoint_rule_wins_over_blueprint():
+    cache_policy = policy()
+
+    assert cache_policy.choose("project.display_project_images", "project", 200).cache_control == "public, max-age=5"
+    assert cache_policy.choose("category.display_category_projects", "category", 200).cache_control == "public, max-age=60"
+
+
+def test_errors_and_unmatched():
+    cache_policy = policy()
+
+    assert cache_policy.choose("category.display_category_projects", "category", 404).cache_control == "no-store"
+    assert cache_policy.choose("metrics_page", None, 200) is None
+    assert cache_policy.choose(None, None, 404).cache_control == "no-store"
+    assert cache_policy.choose("category.display_category_projects", "category", 302).cache_control == "no-store"
+
+
+def test_personal_response_uses_private_policy():
+    cache_policy = policy()
+
+    assert cache_policy.choose("category.display_category_projects", "category", 200, shared=False).cache_control == "private, no-cache"
+    assert cache_policy.choose("metrics_page", None, 200, shared=False) is None
+
+
+# --------------------------------------------------------------------------
+# Test response headers
+# --------------------------------------------------------------------------
+def test_public_page_headers(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    response = client.get("/portfolio/test")
+
+    assert response.headers["Cache-Control"] == "public, max-age=60, stale-while-revalidate=600"
+    assert "Cookie" in response.headers["Vary"]
+    assert "Set-Cookie" not in response.headers
+
+
+def test_public_page_writing_session_is_private(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+
+    def flash_and_list(*args):
+        flash("Welcome!", "success")  # Consumed by the same render, so the session cookie is cleared
+        return []
+
+    mock_view_user.get_projects_by_category.side_effect = flash_and_list
+
+    with patch("app.page_cache", PageCache(1024 * 1024)) as cache, patch("app.content_version", return_value=1):
+        response = client.get("/portfolio/test")
+
+    assert "Set-Cookie" in response.headers
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert len(cache) == 0
+
+
+def test_public_page_for_admin_is_private(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+    with client.session_transaction() as session:
+        session["logged_in"] = True
+
+    response = client.get("/portfolio/test")
+
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_not_modified_keeps_policy(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+    version = ('{"version": 1}', "2024-05-01 10:30:00")
+
+    with patch("app.content_version", return_value=version):
+        etag = client.get("/portfolio/test").headers["ETag"]
+        response = client.get("/portfolio/test", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == "public, max-age=60, stale-while-revalidate=600"
+
+
+def test_missing_page_not_stored(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = None
+
+    response = client.get("/portfolio/missing")
+
+    assert response.status_code == 404
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+def test_static_and_admin_headers(test_dashboard_client_and_mocks):
+    client, _ = test_dashboard_client_and_mocks
+
+    static = client.get("/static/main.css")
+    login = client.get("/admin/login")
+    static.close()
+
+    assert static.headers["Cache-Control"] == "public, max-age=86400"
+    assert login.headers["Cache-Control"] == "no-store"
@@ -0,0 +1,101 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import pytest
+from unittest.mock import patch, MagicMock
+from app import app
+from data_classes.category import Category
+from utility_classes.category_cache import CategoryCache
+
+
+def test_category_cache_loads_once_within_ttl():
+    with app.app_context():
+        loader = MagicMock(return_value=[Category("test", 1, 1)])
+        cache = CategoryCache(loader, ttl=60)
+
+        assert cache.get() == [Category("test", 1, 1)]
+        assert cache.get() == [Category("test", 1, 1)]
+        loader.assert_called_once()
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+
+def test_category_cache_reloads_after_ttl():
+    with app.app_context():
+        loader = MagicMock(return_value=[Category("test", 1, 1)])
+        cache = CategoryCache(loader, ttl=10)
+
+        with patch("utility_classes.category_cache.time.monotonic", return_value=100):
+            cache.get()
+        with patch("utility_classes.category_cache.time.monotonic", return_value=111):
+            cache.get()
+
+        assert loader.call_count == 2
+
+
+def test_category_cache_invalidate():
+    with app.app_context():
+        loader = MagicMock(return_value=[Category("test", 1, 1)])
+        cache = CategoryCache(loader, ttl=60)
+
+        cache.get()
+        cache.invalidate()
+        cache.get()
+
+        assert loader.call_count == 2
+
+
+def test_category_cache_returns_copy():
+    with app.app_context():
+        cache = CategoryCache(MagicMock(return_value=[Category("test", 1, 1)]), ttl=60)
+
+        cache.get().append(Category("other", 2, 2))
+
+        assert cache.get() == [Category("test", 1, 1)]
+
+
+def test_category_cache_get_by_slug():
+    with app.app_context():
+        loader = MagicMock(
+            return_value=[Category("Test Title", 1, 1), Category("About", 0, 2)]
+        )
+        cache = CategoryCache(loader, ttl=60)
+
+        assert cache.get_by_slug("test-title") == Category("Test Title", 1, 1)
+        assert cache.get_by_slug("Test_Title") == Category("Test Title", 1, 1)
+        assert cache.get_by_slug("about") is None
+        assert cache.get_by_slug("missing") is None
+
+
+def test_category_cache_serves_stale_on_reload_error():
+    with app.app_context():
+        loader = MagicMock(side_effect=[[Category("test", 1, 1)], Exception("DB Error")])
+        cache = CategoryCache(loader, ttl=0)
+
+        cache.get()
+        assert cache.get() == [Category("test", 1, 1)]
+
+
+def test_category_cache_raises_when_nothing_cached():
+    with app.app_context():
+        cache = CategoryCache(MagicMock(side_effect=Exception("DB Error")), ttl=60)
+
+        with pytest.raises(Exception):
+            cache.get()
+
+
+def test_index_and_navbar_share_one_category_load(test_app_client_and_mocks):
+    client, _, mock_view_user, _ = test_app_client_and_mocks
+    mock_view_user.get_all_categories.return_value = [Category("test", 1, 1)]
+
+    with patch("routes.route_category.mysql_view_user.View_User") as CategoryViewUser:
+        category_view_user = MagicMock()
+        CategoryViewUser.return_value = category_view_user
+        category_view_user.get_projects_by_category.return_value = []
+
+        response = client.get("/", follow_redirects=True)
+
+        assert response.status_code == 200
+        mock_view_user.get_all_categories.assert_called_once()
+        category_view_user.get_category_by_slug.assert_not_called()
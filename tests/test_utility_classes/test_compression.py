@@ -0,0 +1,119 @@
+import gzip
+import os
+import sys
+from unittest.mock import patch
+from data_classes.category import Category
+from utility_classes.compression import compressed_variants, precompress_folder
+from utility_classes.page_cache import PageCache
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+CSS = b"body { margin: 0; padding: 0; }\n" * 50
+
+
+# --------------------------------------------------------------------------
+# Test compression helpers
+# --------------------------------------------------------------------------
+def test_precompress_folder_writes_siblings(tmp_path):
+    (tmp_path / "main.css").write_bytes(CSS)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG")
+
+    available = precompress_folder(str(tmp_path))
+
+    assert "gzip" in available["main.css"]
+    assert "logo.png" not in available
+    assert gzip.decompress((tmp_path / "main.css.gz").read_bytes()) == CSS
+    assert not (tmp_path / "logo.png.gz").exists()
+
+
+def test_precompress_folder_rewrites_stale_siblings(tmp_path):
+    (tmp_path / "main.css").write_bytes(CSS)
+    precompress_folder(str(tmp_path))
+    os.utime(tmp_path / "main.css.gz", (0, 0))
+    (tmp_path / "main.css").write_bytes(CSS * 2)
+
+    precompress_folder(str(tmp_path))
+
+    assert gzip.decompress((tmp_path / "main.css.gz").read_bytes()) == CSS * 2
+
+
+def test_compressed_variants_skip_small_bodies():
+    assert compressed_variants(b"tiny", 500) == ()
+    assert dict(compressed_variants(CSS, 500))["gzip"] == gzip.compress(CSS, compresslevel=9, mtime=0)
+
+
+# --------------------------------------------------------------------------
+# Test compressed responses
+# --------------------------------------------------------------------------
+def category_mocks(mock_view_user):
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+
+def test_page_compressed_when_accepted(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    category_mocks(mock_view_user)
+
+    plain = client.get("/portfolio/test")
+    compressed = client.get("/portfolio/test", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert gzip.decompress(compressed.data) == plain.data
+
+
+def test_small_pages_sent_uncompressed(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    category_mocks(mock_view_user)
+
+    with patch.dict("app.app.config", {"COMPRESS_MIN_SIZE": 10_000_000}):
+        response = client.get("/portfolio/test", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compressed_page_has_weak_etag(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    category_mocks(mock_view_user)
+
+    with patch("app.content_version", return_value=('{"version": 1}', "2024-05-01 10:30:00")):
+        plain = client.get("/portfolio/test")
+        compressed = client.get("/portfolio/test", headers={"Accept-Encoding": "gzip"})
+        revalidated = client.get(
+            "/portfolio/test", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]}
+        )
+
+    assert compressed.headers["ETag"] == "W/" + plain.headers["ETag"]
+    assert revalidated.status_code == 304
+
+
+def test_cached_page_served_from_stored_variant(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    category_mocks(mock_view_user)
+
+    with patch("app.content_version", return_value=1), patch("app.page_cache", PageCache(1024 * 1024)) as cache:
+        plain = client.get("/portfolio/test")
+        with patch("app.compress") as compress:
+            hit = client.get("/portfolio/test", headers={"Accept-Encoding": "gzip"})
+
+    compress.assert_not_called()
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(hit.data) == plain.data
+    assert cache.size > len(plain.data)
+
+
+def test_static_served_precompressed(test_dashboard_client_and_mocks):
+    client, _ = test_dashboard_client_and_mocks
+
+    plain = client.get("/static/styles.css")
+    compressed = client.get("/static/styles.css", headers={"Accept-Encoding": "gzip"})
+    plain_data, compressed_data = plain.data, compressed.data
+    plain.close()
+    compressed.close()
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.mimetype == "text/css"
+    assert "Accept-Encoding" in plain.headers["Vary"]
+    assert gzip.decompress(compressed_data) == plain_data
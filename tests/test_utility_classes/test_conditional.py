@@ -0,0 +1,156 @@
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import patch
+from data_classes.category import Category
+from utility_classes.conditional import last_modified, page_etag, template_hash
+from utility_classes.page_cache import PageCache
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+VERSION = ('{"version": 3}', "2024-05-01 10:30:00")
+
+
+# --------------------------------------------------------------------------
+# Test validators
+# --------------------------------------------------------------------------
+def test_template_hash_changes_with_templates(tmp_path):
+    (tmp_path / "base.html").write_text("<html>")
+    before = template_hash(str(tmp_path))
+
+    assert template_hash(str(tmp_path)) == before
+    (tmp_path / "base.html").write_text("<html lang='en'>")
+    assert template_hash(str(tmp_path)) != before
+
+
+def test_page_etag_changes_with_version_templates_and_path():
+    etag = page_etag(VERSION, "a", "/portfolio/test")
+
+    assert page_etag(VERSION, "a", "/portfolio/test") == etag
+    assert page_etag(('{"version": 4}', VERSION[1]), "a", "/portfolio/test") != etag
+    assert page_etag(VERSION, "b", "/portfolio/test") != etag
+    assert page_etag(VERSION, "a", "/portfolio/other") != etag
+
+
+def test_last_modified_from_version():
+    assert last_modified(VERSION) == datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc)
+    assert last_modified(("{}", "None")) is None
+    assert last_modified(None) is None
+
+
+# --------------------------------------------------------------------------
+# Test conditional requests
+# --------------------------------------------------------------------------
+def test_page_sends_validators(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.content_version", return_value=VERSION):
+        response = client.get("/portfolio/test")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"')
+    assert response.headers["Last-Modified"] == "Wed, 01 May 2024 10:30:00 GMT"
+
+
+def test_matching_etag_is_304_without_queries(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.content_version", return_value=VERSION):
+        etag = client.get("/portfolio/test").headers["ETag"]
+        mock_view_user.reset_mock()
+        response = client.get("/portfolio/test", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    mock_view_user.get_category_by_slug.assert_not_called()
+    mock_view_user.get_projects_by_category.assert_not_called()
+
+
+def test_etag_of_another_page_is_not_304(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.content_version", return_value=VERSION):
+        etag = client.get("/portfolio/test").headers["ETag"]
+        mock_view_user.get_category_by_slug.return_value = None
+        response = client.get("/portfolio/nope", headers={"If-None-Match": etag})
+
+    assert response.status_code == 404
+
+
+def test_304_repeats_validator_and_vary_of_compressed_page(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+    gzip = {"Accept-Encoding": "gzip"}
+
+    with patch("app.content_version", return_value=VERSION):
+        page = client.get("/portfolio/test", headers=gzip)
+        response = client.get("/portfolio/test", headers={**gzip, "If-None-Match": page.headers["ETag"]})
+        plain = client.get("/portfolio/test", headers={"If-None-Match": page.headers["ETag"]})
+
+    assert page.headers["Content-Encoding"] == "gzip"
+    assert response.status_code == 304
+    assert response.headers["ETag"] == page.headers["ETag"]
+    assert response.headers["ETag"].startswith('W/"')
+    assert response.headers["Vary"] == page.headers["Vary"]
+    assert plain.status_code == 304
+    assert plain.headers["ETag"].startswith('"')  # Uncompressed pages keep the strong ETag
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+
+def test_if_modified_since(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.content_version", return_value=VERSION):
+        unchanged = client.get("/portfolio/test", headers={"If-Modified-Since": "Wed, 01 May 2024 10:30:00 GMT"})
+        changed = client.get("/portfolio/test", headers={"If-Modified-Since": "Wed, 01 May 2024 10:29:59 GMT"})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+
+
+def test_new_version_is_not_304(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.content_version", return_value=VERSION):
+        etag = client.get("/portfolio/test").headers["ETag"]
+    with patch("app.content_version", return_value=('{"version": 4}', "2024-05-02 08:00:00")):
+        response = client.get("/portfolio/test", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_cached_page_keeps_validators(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.content_version", return_value=VERSION), patch("app.page_cache", PageCache(1024 * 1024)):
+        rendered = client.get("/portfolio/test")
+        cached = client.get("/portfolio/test")
+
+    assert cached.headers["X-Cache"] == "HIT"
+    assert cached.headers["ETag"] == rendered.headers["ETag"]
+
+
+def test_no_validators_without_content_version(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    response = client.get("/portfolio/test")
+
+    assert "ETag" not in response.headers
+    assert "Last-Modified" not in response.headers
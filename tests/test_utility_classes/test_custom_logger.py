@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import queue
+import sys
+from unittest.mock import MagicMock, patch
+from app import app
+from data_classes.category import Category
+from mysql_connections.mysql_base import MySQLBase
+from utility_classes import custom_logger, query_tracker
+from utility_classes.custom_logger import (
+    DroppingQueueHandler,
+    JsonFormatter,
+    dropped_records,
+    log,
+    request_id_from,
+    start_queued_logging,
+    stop_queued_logging,
+)
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def info_logger():
+    logger = log("TEST")
+    logger.logger = MagicMock()
+    logger.logger.isEnabledFor.side_effect = lambda level: level >= logging.INFO
+    return logger
+
+
+# --------------------------------------------------------------------------
+# Test lazy formatting
+# --------------------------------------------------------------------------
+def test_args_formatted_when_emitted():
+    logger = info_logger()
+
+    logger.info("Getting project by id %s from %s", 3, "design")
+
+    logger.logger.log.assert_called_once_with(logging.INFO, "[TEST] Getting project by id 3 from design")
+
+
+def test_dropped_records_are_never_formatted():
+    logger = info_logger()
+    data = MagicMock()
+    message = MagicMock(return_value="expensive")
+
+    logger.debug("Attempting to create Project: %s", data)
+    logger.debug(message)
+
+    data.__str__.assert_not_called()
+    message.assert_not_called()
+    logger.logger.log.assert_not_called()
+
+
+def test_callable_message_called_when_emitted():
+    logger = info_logger()
+
+    logger.warning(lambda: "built late")
+
+    logger.logger.log.assert_called_once_with(logging.WARNING, "[TEST] built late")
+
+
+def test_message_without_args_is_not_formatted():
+    logger = info_logger()
+
+    logger.info("100% done")
+
+    logger.logger.log.assert_called_once_with(logging.INFO, "[TEST] 100% done")
+
+
+def test_request_headers_only_at_debug():
+    logger = info_logger()
+    headers = MagicMock()
+
+    logger.request("GET", "/portfolio", headers)
+
+    logger.logger.log.assert_called_once_with(logging.INFO, "[TEST] Request: GET /portfolio")
+    headers.keys.assert_not_called()
+
+
+# --------------------------------------------------------------------------
+# Test queued logging
+# --------------------------------------------------------------------------
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def record(message):
+    return logging.LogRecord("TEST", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_full_queue_drops_and_counts():
+    handler = DroppingQueueHandler(queue.Queue(1))
+
+    handler.handle(record("first"))
+    handler.handle(record("second"))
+
+    assert handler.queue.get_nowait().getMessage() == "first"
+    assert handler.dropped == 1
+
+
+def test_full_queue_blocks_then_drops():
+    handler = DroppingQueueHandler(queue.Queue(1), block=True, block_timeout=0.01)
+
+    handler.handle(record("first"))
+    handler.handle(record("second"))  # Waits for the timeout before giving up
+
+    assert handler.dropped == 1
+
+
+def test_queued_logging_writes_through_listener_and_restores_handlers():
+    root = logging.getLogger()
+    original = root.handlers
+    writer = ListHandler()
+    root.handlers = [writer]
+    try:
+        start_queued_logging(size=100)
+        assert isinstance(root.handlers[0], DroppingQueueHandler)
+
+        logging.getLogger("TEST.queued").warning("queued %s", "line")
+        stop_queued_logging()  # Drains the queue
+
+        assert writer.messages == ["queued line"]
+        assert root.handlers == [writer]
+        assert dropped_records() == 0
+    finally:
+        stop_queued_logging()
+        root.handlers = original
+
+
+def test_listener_restarted_after_fork():
+    root = logging.getLogger()
+    original = root.handlers
+    writer = ListHandler()
+    root.handlers = [writer]
+    try:
+        start_queued_logging(size=100)
+        old_queue = custom_logger._queue_handler.queue
+
+        custom_logger._restart_listener()  # What a forked worker runs
+
+        assert custom_logger._queue_handler.queue is not old_queue
+        logging.getLogger("TEST.queued").warning("from worker")
+        stop_queued_logging()
+        assert writer.messages == ["from worker"]
+    finally:
+        stop_queued_logging()
+        root.handlers = original
+
+
+# --------------------------------------------------------------------------
+# Test structured logging
+# --------------------------------------------------------------------------
+def json_lines(handler):
+    return [json.loads(JsonFormatter().format(record)) for record in handler.records]
+
+
+class RecordHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_request_id_from_header():
+    assert request_id_from("abc-123.DEF_4") == "abc-123.DEF_4"
+    assert len(request_id_from(None)) == 32
+    assert request_id_from('bad"id\n') != 'bad"id\n'
+    assert request_id_from("x" * 65) != "x" * 65
+
+
+def test_json_formatter_outside_request():
+    handler = RecordHandler()
+    logger = log("TEST")
+    logger.logger = logging.getLogger("TEST.json")
+    logger.logger.handlers = [handler]
+    logger.logger.propagate = False
+
+    with patch.object(custom_logger, "_structured", True):
+        logger.info("Getting image by id %s", 4)
+
+    entry = json_lines(handler)[0]
+    assert entry["message"] == "[TEST] Getting image by id 4"
+    assert entry["level"] == "INFO"
+    assert entry["tag"] == "TEST"
+    assert "request_id" not in entry
+
+
+def test_json_records_carry_request_fields():
+    handler = RecordHandler()
+    with app.test_request_context("/portfolio/design", method="GET"):
+        app.preprocess_request()  # Runs log_request, which sets the request id
+        query_tracker.record_query("SELECT 1", 0.002)
+        base_mysql = MySQLBase("user", "password", "TEST")
+        base_mysql.logger.logger = logging.getLogger("TEST.json")
+        base_mysql.logger.logger.handlers = [handler]
+        base_mysql.logger.logger.propagate = False
+
+        with patch.object(custom_logger, "_structured", True):
+            base_mysql.logger.con_open()
+            base_mysql.logger.response("404 NOT FOUND", 0.0123)
+
+    opened, response = json_lines(handler)
+    assert opened["request_id"] == response["request_id"]
+    assert opened["method"] == "GET"
+    assert opened["queries"] == 1
+    assert opened["db_ms"] == 2.0
+    assert "status" not in opened
+    assert response["status"] == 404
+    assert response["elapsed_ms"] == 12.3
+
+
+def test_request_id_returned_in_response(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    sent = client.get("/portfolio/test", headers={"X-Request-ID": "proxy-id-1"})
+    made = client.get("/portfolio/test")
+
+    assert sent.headers["X-Request-ID"] == "proxy-id-1"
+    assert len(made.headers["X-Request-ID"]) == 32
@@ -0,0 +1,128 @@
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+from app import app
+from utility_classes.image_backfill import ImageBackfill
+from utility_classes.image_derivatives import DerivativeError, SIZES
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def rows(*ids):
+    return [{"image_id": i, "image_URL": f"https://example.com/{i}.png"} for i in ids]
+
+
+def mocks(image_rows, fail=()):
+    store = MagicMock()
+    store.formats = ("avif", "webp")
+
+    def measure(image_url):
+        if any(image_url.endswith(f"/{i}.png") for i in fail):
+            raise DerivativeError("Not an image")
+        return {"image_width": 10, "image_url": image_url}
+
+    store.measure.side_effect = measure
+    writer = MagicMock()
+    writer.stream_images.side_effect = lambda after_id, unmeasured_only: (
+        row for row in image_rows if row["image_id"] > after_id
+    )
+    return store, writer
+
+
+def written_ids(writer):
+    return [image_id for call in writer.update_images_metadata.call_args_list for image_id, _ in call.args[0]]
+
+
+# --------------------------------------------------------------------------
+# Test running a backfill
+# --------------------------------------------------------------------------
+def test_backfill_writes_in_batches():
+    store, writer = mocks(rows(1, 2, 3, 4, 5))
+
+    stats = ImageBackfill(store, writer, workers=2, batch_size=2).run()
+
+    assert [len(call.args[0]) for call in writer.update_images_metadata.call_args_list] == [2, 2, 1]
+    assert written_ids(writer) == [1, 2, 3, 4, 5]  # Kept in table order whatever order the pool finishes in
+    assert (stats.processed, stats.written, stats.failed) == (5, 5, 0)
+    writer.stream_images.assert_called_once_with(0, unmeasured_only=True)
+
+
+def test_backfill_makes_every_variant():
+    store, writer = mocks(rows(1))
+
+    ImageBackfill(store, writer).run()
+
+    assert store.get.call_count == len(SIZES) * 2
+    store.measure.assert_called_once_with("https://example.com/1.png")
+
+
+def test_backfill_counts_failures_and_continues():
+    store, writer = mocks(rows(1, 2, 3), fail=(2,))
+
+    stats = ImageBackfill(store, writer, batch_size=10, variants=False).run()
+
+    assert written_ids(writer) == [1, 3]
+    assert (stats.processed, stats.written, stats.failed) == (3, 2, 1)
+    store.get.assert_not_called()
+
+
+def test_backfill_replace_rewrites_measured_images():
+    store, writer = mocks(rows(1))
+
+    ImageBackfill(store, writer, replace=True).run()
+
+    writer.stream_images.assert_called_once_with(0, unmeasured_only=False)
+    assert writer.update_images_metadata.call_args.args[1] == True
+
+
+# --------------------------------------------------------------------------
+# Test checkpoints
+# --------------------------------------------------------------------------
+def test_backfill_resumes_from_checkpoint(tmp_path):
+    checkpoint = tmp_path / "backfill.json"
+    checkpoint.write_text(json.dumps({"after_id": 2}))
+    store, writer = mocks(rows(1, 2, 3, 4))
+
+    ImageBackfill(store, writer, checkpoint=str(checkpoint)).run()
+
+    assert written_ids(writer) == [3, 4]
+    assert not checkpoint.exists()  # Finished runs start over next time
+
+
+def test_interrupted_backfill_keeps_checkpoint(tmp_path):
+    checkpoint = tmp_path / "backfill.json"
+    store, writer = mocks(rows(1, 2, 3, 4))
+    writer.update_images_metadata.side_effect = [None, Exception("Lost connection")]
+
+    backfill = ImageBackfill(store, writer, workers=1, batch_size=2, checkpoint=str(checkpoint))
+    try:
+        backfill.run()
+    except Exception:
+        pass
+
+    assert json.loads(checkpoint.read_text()) == {"after_id": 2}
+
+
+def test_unreadable_checkpoint_starts_over(tmp_path):
+    checkpoint = tmp_path / "backfill.json"
+    checkpoint.write_text("{}")
+
+    assert ImageBackfill(MagicMock(), MagicMock(), checkpoint=str(checkpoint)).load_checkpoint() == 0
+
+
+# --------------------------------------------------------------------------
+# Test the flask command
+# --------------------------------------------------------------------------
+def test_backfill_command(tmp_path):
+    store, writer = mocks(rows(1, 2))
+    store.folder = str(tmp_path)
+
+    with patch.dict(app.extensions, {"image_store": store}), patch(
+        "utility_classes.image_backfill.Image_Writer", return_value=writer
+    ):
+        result = app.test_cli_runner().invoke(args=["backfill-images", "--workers", "2", "--no-variants"])
+
+    assert result.exit_code == 0, result.output
+    assert "Processed 2 images" in result.output
+    assert written_ids(writer) == [1, 2]
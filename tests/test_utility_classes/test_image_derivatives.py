@@ -0,0 +1,199 @@
+import base64
+import io
+import os
+import sys
+import time
+import pytest
+from unittest.mock import patch
+from utility_classes.image_derivatives import (
+    PLACEHOLDER_MAX_LENGTH,
+    DerivativeError,
+    DerivativeStore,
+    measure,
+    placeholder,
+    url_hash,
+    variant_widths,
+)
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+PILImage = pytest.importorskip("PIL.Image")
+
+URL = "https://example.com/painting.png"
+
+
+def png(width, height):
+    output = io.BytesIO()
+    PILImage.new("RGB", (width, height), (200, 120, 40)).save(output, "PNG")
+    return output.getvalue()
+
+
+def seeded_store(tmp_path, source):
+    store = DerivativeStore(str(tmp_path), ("webp",))
+    folder = tmp_path / url_hash(URL)
+    folder.mkdir()
+    (folder / "source").write_bytes(source)  # Already downloaded
+    return store
+
+
+# --------------------------------------------------------------------------
+# Test making derivatives
+# --------------------------------------------------------------------------
+def test_thumb_fits_longest_side(tmp_path):
+    store = seeded_store(tmp_path, png(2400, 1200))
+
+    path = store.get(URL, "thumb", "webp")
+
+    with PILImage.open(path) as image:
+        assert image.format == "WEBP"
+        assert image.size == (800, 400)
+    assert (store.hits, store.misses) == (0, 1)
+
+
+def test_small_images_not_enlarged(tmp_path):
+    store = seeded_store(tmp_path, png(300, 500))
+
+    with PILImage.open(store.get(URL, "medium", "webp")) as image:
+        assert image.size == (300, 500)
+
+
+def test_derivative_made_once(tmp_path):
+    store = seeded_store(tmp_path, png(1000, 1000))
+
+    first = store.get(URL, "thumb", "webp")
+    with patch.object(store, "_render") as render:
+        second = store.get(URL, "thumb", "webp")
+
+    assert first == second
+    render.assert_not_called()
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_source_downloaded_once(tmp_path):
+    store = DerivativeStore(str(tmp_path), ("webp",))
+
+    with patch("utility_classes.image_derivatives.urllib.request.urlopen") as urlopen:
+        urlopen.return_value.__enter__.return_value.read.return_value = png(1000, 500)
+        store.get(URL, "thumb", "webp")
+        store.get(URL, "medium", "webp")
+
+    urlopen.assert_called_once()
+    assert (tmp_path / url_hash(URL) / "source").exists()
+
+
+def test_unusable_sources_raise(tmp_path):
+    store = DerivativeStore(str(tmp_path), ("webp",))
+
+    with pytest.raises(DerivativeError):
+        store.get("file:///etc/passwd", "thumb", "webp")
+    with pytest.raises(DerivativeError):
+        seeded_store(tmp_path, b"not an image").get(URL, "thumb", "webp")
+    with pytest.raises(DerivativeError):
+        store.get(URL, "huge", "webp")
+    assert store.failures == 1  # Unknown sizes are refused before any work
+
+
+def test_lookup_only_finds_made_derivatives(tmp_path):
+    store = seeded_store(tmp_path, png(1000, 1000))
+
+    assert store.lookup(URL, "thumb", "webp") is None
+    path = store.get(URL, "thumb", "webp")
+
+    assert store.lookup(URL, "thumb", "webp") == path
+
+
+def test_make_later_makes_derivative_in_background(tmp_path):
+    store = seeded_store(tmp_path, png(1000, 1000))
+
+    assert store.make_later(URL, "thumb", "webp") == True
+    store._pool.shutdown(wait=True)
+
+    assert store.lookup(URL, "thumb", "webp") is not None
+    assert store._pending == set()
+
+
+def test_make_later_queues_each_derivative_once(tmp_path):
+    store = seeded_store(tmp_path, png(1000, 1000))
+    store.max_pending = 1
+
+    with patch.object(store, "get", side_effect=lambda *args: time.sleep(0.05)):
+        assert store.make_later(URL, "thumb", "webp") == True
+        assert store.make_later(URL, "thumb", "webp") == False  # Already queued
+        assert store.make_later(URL, "small", "webp") == False  # Queue full
+        store._pool.shutdown(wait=True)
+
+
+def test_make_later_logs_failures(tmp_path):
+    store = DerivativeStore(str(tmp_path), ("webp",))
+
+    with patch.object(store, "logger") as logger:
+        store.make_later("ftp://example.com/painting.png", "thumb", "webp")
+        store._pool.shutdown(wait=True)
+
+    logger.warning.assert_called_once()
+    assert store._pending == set()
+
+
+def test_no_formats_disables():
+    assert not DerivativeStore("/tmp/unused", ()).enabled
+
+
+# --------------------------------------------------------------------------
+# Test measuring originals
+# --------------------------------------------------------------------------
+def test_measure_size_color_and_bytes():
+    source = png(1200, 600)
+
+    measured = measure(source)
+
+    assert measured["image_width"] == 1200
+    assert measured["image_height"] == 600
+    assert measured["image_color"] == "#c87828"
+    assert measured["image_bytes"] == len(source)
+
+
+def test_placeholder_is_tiny_data_uri():
+    noise = PILImage.effect_noise((64, 64), 100).convert("RGB")
+
+    uri = placeholder(noise)
+
+    assert uri.startswith("data:image/")
+    assert len(uri) <= PLACEHOLDER_MAX_LENGTH
+    with PILImage.open(io.BytesIO(base64.b64decode(uri.split(",", 1)[1]))) as image:
+        assert max(image.size) <= 16
+
+
+def test_measure_applies_exif_rotation():
+    output = io.BytesIO()
+    image = PILImage.new("RGB", (300, 100))
+    exif = image.getexif()
+    exif[0x0112] = 6  # Rotate 90 degrees when shown
+    image.save(output, "JPEG", exif=exif)
+
+    measured = measure(output.getvalue())
+
+    assert (measured["image_width"], measured["image_height"]) == (100, 300)
+
+
+def test_store_measures_once(tmp_path):
+    store = seeded_store(tmp_path, png(1000, 500))
+
+    first = store.measure(URL)
+    with patch("utility_classes.image_derivatives.measure") as measure_again:
+        second = store.measure(URL)
+
+    assert first == second
+    measure_again.assert_not_called()
+
+
+def test_store_measures_again_without_placeholder(tmp_path):
+    store = seeded_store(tmp_path, png(1000, 500))
+    (tmp_path / url_hash(URL) / "measure.json").write_text('{"image_width": 1000}')  # Measured by an older release
+
+    assert store.measure(URL)["image_placeholder"].startswith("data:image/")
+
+
+def test_variant_widths():
+    assert variant_widths(2400, 1200) == [("small", 400), ("thumb", 800), ("medium", 1600)]
+    assert variant_widths(1200, 2400) == [("small", 200), ("thumb", 400), ("medium", 800)]
+    assert variant_widths(300, 500) == [("small", 240), ("thumb", 300)]  # Never enlarged
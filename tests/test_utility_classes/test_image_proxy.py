@@ -0,0 +1,84 @@
+import os
+import sys
+import pytest
+from utility_classes.image_proxy import ProxyCache, ProxyError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"0" * 100
+
+
+# --------------------------------------------------------------------------
+# Test fetching
+# --------------------------------------------------------------------------
+def test_fetched_from_upstream_once(tmp_path, upstream):
+    upstream.files["/a.png"] = ("image/png", PNG)
+    cache = ProxyCache(str(tmp_path))
+
+    first = cache.get(f"{upstream.url}/a.png")
+    second = cache.get(f"{upstream.url}/a.png")
+
+    assert first == second
+    assert first.content_type == "image/png"
+    with open(first.path, "rb") as file:
+        assert file.read() == PNG
+    assert upstream.requests == {"/a.png": 1}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_same_bytes_stored_once(tmp_path, upstream):
+    upstream.files["/a.png"] = ("image/png", PNG)
+    upstream.files["/copy.png"] = ("image/png", PNG)
+    cache = ProxyCache(str(tmp_path))
+
+    assert cache.get(f"{upstream.url}/a.png").path == cache.get(f"{upstream.url}/copy.png").path
+    assert (len(cache), cache.size) == (1, len(PNG))
+
+
+def test_new_worker_reads_cache_from_disk(tmp_path, upstream):
+    upstream.files["/a.png"] = ("image/png", PNG)
+    ProxyCache(str(tmp_path)).get(f"{upstream.url}/a.png")
+
+    cache = ProxyCache(str(tmp_path))
+
+    assert cache.size == len(PNG)
+    cache.get(f"{upstream.url}/a.png")
+    assert upstream.requests == {"/a.png": 1}
+
+
+def test_non_images_and_failures_raise(tmp_path, upstream):
+    upstream.files["/page.html"] = ("text/html", b"<html></html>")
+    upstream.files["/huge.png"] = ("image/png", PNG * 10)
+    cache = ProxyCache(str(tmp_path), max_object_bytes=len(PNG))
+
+    for path in ("/page.html", "/huge.png", "/missing.png"):
+        with pytest.raises(ProxyError):
+            cache.get(f"{upstream.url}{path}")
+    with pytest.raises(ProxyError):
+        cache.get("file:///etc/passwd")
+    assert cache.failures == 4
+    assert len(cache) == 0
+
+
+# --------------------------------------------------------------------------
+# Test eviction
+# --------------------------------------------------------------------------
+def test_least_recently_served_evicted(tmp_path, upstream):
+    for name in ("a", "b", "c"):
+        upstream.files[f"/{name}.png"] = ("image/png", PNG + name.encode())
+    cache = ProxyCache(str(tmp_path), max_bytes=2 * len(PNG) + 2)
+
+    a = cache.get(f"{upstream.url}/a.png")
+    b = cache.get(f"{upstream.url}/b.png")
+    cache.get(f"{upstream.url}/a.png")  # a is now the most recent
+    cache.get(f"{upstream.url}/c.png")
+
+    assert os.path.exists(a.path)
+    assert not os.path.exists(b.path)
+    assert (len(cache), cache.evictions) == (2, 1)
+    cache.get(f"{upstream.url}/b.png")  # Evicted objects are fetched again
+    assert upstream.requests["/b.png"] == 2
+
+
+def test_zero_bytes_disables():
+    assert not ProxyCache("/tmp/unused", 0).enabled
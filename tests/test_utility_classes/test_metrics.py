@@ -0,0 +1,183 @@
+import json
+import os
+import sys
+from unittest.mock import MagicMock, patch
+from app import app
+from data_classes.category import Category
+from mysql_connections.mysql_base import MySQLBase
+from utility_classes import metrics
+from utility_classes.metrics import Registry, db_method
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+DEAD_PID = 4194305  # Above the largest Linux pid
+
+
+# --------------------------------------------------------------------------
+# Test registry and text format
+# --------------------------------------------------------------------------
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0))
+    latency.observe(0.05, endpoint="index")
+    latency.observe(0.1, endpoint="index")
+    latency.observe(0.5, endpoint="index")
+    latency.observe(3, endpoint="index")
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert lines[2:] == [
+        'latency_seconds_bucket{endpoint="index",le="0.1"} 2',
+        'latency_seconds_bucket{endpoint="index",le="1"} 3',
+        'latency_seconds_bucket{endpoint="index",le="+Inf"} 4',
+        'latency_seconds_sum{endpoint="index"} 3.65',
+        'latency_seconds_count{endpoint="index"} 4',
+    ]
+
+
+def test_counter_and_gauge_render_with_escaped_labels():
+    registry = Registry()
+    registry.counter("requests_total", "Requests.", ("path",)).inc(path='a"b\\c')
+    registry.counter("requests_total", "Requests.", ("path",)).inc(2, path='a"b\\c')
+    registry.gauge("open", "Open.").set(3)
+
+    text = registry.render()
+
+    assert 'requests_total{path="a\\"b\\\\c"} 3' in text
+    assert "# TYPE open gauge\nopen 3\n" in text
+
+
+def test_broken_collector_does_not_break_render():
+    registry = Registry()
+    registry.gauge("open", "Open.").set(1)
+    registry.on_collect(MagicMock(side_effect=RuntimeError("boom")))
+
+    assert "open 1" in registry.render()
+
+
+def test_reset_after_fork_drops_parent_values():
+    registry = Registry()
+    counter = registry.counter("queries_total", "Queries.")
+    counter.inc()
+
+    registry._reset()
+
+    assert counter.values == {}
+    assert "queries_total" in registry.metrics
+
+
+# --------------------------------------------------------------------------
+# Test multiprocess merging
+# --------------------------------------------------------------------------
+def worker_file(directory, pid, dumps):
+    with open(os.path.join(directory, f"metrics_{pid}.json"), "w") as file:
+        json.dump(dumps, file)
+
+
+def test_collect_adds_live_workers_and_removes_dead(tmp_path):
+    registry = Registry(str(tmp_path))
+    registry.counter("requests_total", "Requests.", ("status",)).inc(status="200")
+    registry.histogram("latency_seconds", "Latency.", buckets=(1.0,)).observe(0.5)
+
+    other_worker = registry.snapshot()
+    worker_file(tmp_path, os.getppid(), other_worker)
+    worker_file(tmp_path, DEAD_PID, other_worker)
+
+    merged = {dump["name"]: dump["samples"] for dump in registry.collect()}
+
+    assert merged["requests_total"] == [[["200"], 2.0]]
+    assert merged["latency_seconds"] == [[[], [2, 0, 1.0]]]
+    assert not os.path.exists(os.path.join(tmp_path, f"metrics_{DEAD_PID}.json"))
+    assert os.path.exists(os.path.join(tmp_path, f"metrics_{os.getpid()}.json"))
+
+
+def test_flush_is_throttled(tmp_path):
+    registry = Registry(str(tmp_path), flush_interval=60)
+    counter = registry.counter("requests_total", "Requests.")
+    path = os.path.join(tmp_path, f"metrics_{os.getpid()}.json")
+
+    counter.inc()
+    registry.flush()
+    counter.inc()
+    registry.flush()  # Within the interval, file keeps the first value
+
+    with open(path) as file:
+        assert json.load(file)[0]["samples"] == [[[], 1.0]]
+
+
+# --------------------------------------------------------------------------
+# Test database instrumentation
+# --------------------------------------------------------------------------
+def test_query_duration_labelled_by_view_user_method():
+    class FakeUser(MySQLBase):
+        @db_method
+        def get_things(self):
+            return self._run_query("SELECT 1;", None, "all")
+
+    with app.app_context():
+        mock_connection = MagicMock()
+        fake_user = FakeUser("user", "password", "TEST")
+        fake_user.logger = MagicMock()
+
+        with patch("mysql_connections.mysql_base.pymysql.connect", return_value=mock_connection):
+            fake_user.get_things()
+            fake_user._run_query("SELECT 2;", None, "all")
+
+    assert ("get_things",) in metrics.query_duration.values
+    assert ("FakeUser",) in metrics.query_duration.values
+    assert metrics.current_db_method() is None
+
+
+# --------------------------------------------------------------------------
+# Test /metrics endpoint
+# --------------------------------------------------------------------------
+def test_metrics_endpoint(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch.dict(app.config, {"METRICS_ENABLED": True, "METRICS_TOKEN": None}):
+        client.get("/portfolio/test")
+        response = client.get("/metrics", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "Content-Encoding" not in response.headers
+    assert response.content_type == metrics.CONTENT_TYPE
+    text = response.get_data(as_text=True)
+    assert (
+        'portfolio_http_request_duration_seconds_count{endpoint="category.display_category_projects",status="200"}'
+        in text
+    )
+    assert 'portfolio_cache_requests_total{cache="category",result="miss"}' in text
+
+
+def test_metrics_endpoint_disabled(test_category_client_and_mocks):
+    client, _ = test_category_client_and_mocks
+
+    with patch.dict(app.config, {"METRICS_ENABLED": False}):
+        assert client.get("/metrics").status_code == 404
+
+
+def test_disabled_metrics_not_recorded_or_written(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch.dict(app.config, {"METRICS_ENABLED": False}), \
+            patch.object(metrics.registry, "flush") as flush, \
+            patch.object(metrics.request_duration, "observe") as observe:
+        client.get("/portfolio/test")
+
+    flush.assert_not_called()
+    observe.assert_not_called()
+
+
+def test_metrics_endpoint_requires_token(test_category_client_and_mocks):
+    client, _ = test_category_client_and_mocks
+
+    with patch.dict(app.config, {"METRICS_ENABLED": True, "METRICS_TOKEN": "secret"}):
+        assert client.get("/metrics").status_code == 404
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+        assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
@@ -0,0 +1,136 @@
+import os
+import sys
+from unittest.mock import patch
+from data_classes.category import Category
+from utility_classes.page_cache import CachedPage, PageCache
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def page(body, version=1):
+    return CachedPage(body, 200, (("Content-Type", "text/html; charset=utf-8"),), version)
+
+
+# --------------------------------------------------------------------------
+# Test the LRU
+# --------------------------------------------------------------------------
+def test_get_returns_page_for_same_version():
+    cache = PageCache(100)
+    cache.put("/portfolio/design", page(b"design"))
+
+    assert cache.get("/portfolio/design", 1).body == b"design"
+    assert cache.get("/portfolio/design", 2) is None
+    assert cache.get("/portfolio/other", 1) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_evicted_over_max_bytes():
+    cache = PageCache(10)
+    cache.put("/a", page(b"aaaa"))
+    cache.put("/b", page(b"bbbb"))
+    cache.get("/a", 1)  # /b is now the least recently used
+
+    cache.put("/c", page(b"cccc"))
+
+    assert cache.get("/b", 1) is None
+    assert cache.get("/a", 1) is not None
+    assert cache.size == 8
+    assert cache.evictions == 1
+
+
+def test_replacing_a_page_updates_size():
+    cache = PageCache(10)
+    cache.put("/a", page(b"aaaa"))
+    cache.put("/a", page(b"aa", version=2))
+
+    assert cache.size == 2
+    assert len(cache) == 1
+
+
+def test_page_larger_than_cache_not_stored():
+    cache = PageCache(3)
+    cache.put("/a", page(b"aaaa"))
+
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_clear():
+    cache = PageCache(10)
+    cache.put("/a", page(b"aaaa"))
+
+    cache.clear()
+
+    assert cache.get("/a", 1) is None
+    assert cache.size == 0
+
+
+def test_zero_bytes_disables():
+    assert not PageCache(0).enabled
+
+
+# --------------------------------------------------------------------------
+# Test the public routes
+# --------------------------------------------------------------------------
+def test_category_page_served_from_cache(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.page_cache", PageCache(1024 * 1024)), patch("app.content_version", return_value=1):
+        first = client.get("/portfolio/test")
+        second = client.get("/portfolio/test")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.data == first.data
+    assert second.content_type == first.content_type
+    mock_view_user.get_projects_by_category.assert_called_once()
+
+
+def test_new_content_version_renders_again(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.page_cache", PageCache(1024 * 1024)), patch("app.content_version", side_effect=[1, 2, 2]):
+        client.get("/portfolio/test")
+        changed = client.get("/portfolio/test")
+        cached = client.get("/portfolio/test")
+
+    assert changed.headers["X-Cache"] == "MISS"
+    assert cached.headers["X-Cache"] == "HIT"
+    assert mock_view_user.get_projects_by_category.call_count == 2
+
+
+def test_logged_in_and_flashed_sessions_bypass_cache(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.page_cache", PageCache(1024 * 1024)) as cache, patch("app.content_version", return_value=1):
+        client.get("/portfolio/test")
+        with client.session_transaction() as session:
+            session["logged_in"] = True
+        admin = client.get("/portfolio/test")
+        with client.session_transaction() as session:
+            session.clear()
+            session["_flashes"] = [("error", "Project 'x' not found")]
+        flashed = client.get("/portfolio/test")
+
+    assert "X-Cache" not in admin.headers
+    assert "X-Cache" not in flashed.headers
+    assert b"Project &#39;x&#39; not found" in flashed.data
+    assert cache.hits == 0
+
+
+def test_missing_pages_not_cached(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = None
+
+    with patch("app.page_cache", PageCache(1024 * 1024)) as cache, patch("app.content_version", return_value=1):
+        client.get("/portfolio/missing")
+        response = client.get("/portfolio/missing")
+
+    assert response.status_code == 404
+    assert len(cache) == 0
@@ -0,0 +1,221 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+import pytest
+from app import app
+from data_classes.category import Category
+from mysql_connections.mysql_base import MySQLBase
+from utility_classes import query_tracker
+from utility_classes.query_tracker import (
+    QueryBudgetExceeded,
+    QueryStats,
+    assert_query_budget,
+    statement_shape,
+)
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def query_side_effect(*queries, result=None):
+    """Builds a View_User mock side effect that records the provided queries on the current request."""
+
+    def side_effect(*args, **kwargs):
+        for query in queries:
+            query_tracker.record_query(query, 0.001)
+        return result
+
+    return side_effect
+
+
+# --------------------------------------------------------------------------
+# Test statement shapes and stats
+# --------------------------------------------------------------------------
+def test_statement_shape_ignores_values_and_whitespace():
+    assert statement_shape(
+        "SELECT * FROM `VV.image`\n   WHERE image_id = 12;"
+    ) == statement_shape("SELECT * FROM `VV.image` WHERE image_id = 7;")
+    assert statement_shape("SELECT * FROM t WHERE a = 'it''s'") == "SELECT * FROM t WHERE a = ?"
+    assert statement_shape("SELECT * FROM t WHERE a = %s") == "SELECT * FROM t WHERE a = %s"
+
+
+def test_query_stats_problems():
+    stats = QueryStats()
+    stats.record_query("SELECT * FROM t WHERE id = %s", 0.002)
+    stats.record_query("SELECT * FROM t WHERE id = %s", 0.003)
+    stats.record_query("SELECT 1", 0.001)
+
+    assert stats.queries == 3
+    assert stats.db_time == pytest.approx(0.006)
+    assert stats.repeated() == {"SELECT * FROM t WHERE id = %s": 2}
+    assert stats.problems(budget=5, allow_repeats=True) == []
+    assert stats.problems(budget=2, allow_repeats=True) == ["3 queries exceeds budget of 2"]
+    assert stats.problems() == ["statement ran 2 times: SELECT * FROM t WHERE id = %s"]
+    assert str(stats) == "Queries: 3 - DB time: 0.006s - Connections: 0"
+
+
+def test_current_stats_only_inside_request():
+    with app.app_context():
+        assert query_tracker.current_stats() is None
+        query_tracker.record_query("SELECT 1", 0.001)  # Ignored outside a request
+
+    with app.test_request_context("/"):
+        query_tracker.record_query("SELECT 1", 0.001)
+        assert query_tracker.current_stats().queries == 1
+
+
+# --------------------------------------------------------------------------
+# Test MySQLBase instrumentation
+# --------------------------------------------------------------------------
+def test_run_query_records_query_and_connection():
+    with app.test_request_context("/"):
+        mock_connection = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value.fetchall.return_value = []
+        base_mysql = MySQLBase("user", "password", "TEST")
+        base_mysql.logger = MagicMock()
+
+        with patch("mysql_connections.mysql_base.pymysql.connect", return_value=mock_connection):
+            base_mysql._run_query("SELECT * FROM t WHERE id = %s;", [1], "all")
+            base_mysql._run_query("SELECT * FROM t WHERE id = %s;", [2], "all")
+
+        stats = query_tracker.current_stats()
+        assert stats.queries == 2
+        assert stats.connections == 1  # Second query reused the pooled connection
+        assert stats.repeated() == {"SELECT * FROM t WHERE id = %s;": 2}
+
+
+# --------------------------------------------------------------------------
+# Test app integration
+# --------------------------------------------------------------------------
+def test_response_log_includes_query_stats(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.side_effect = query_side_effect(
+        "SELECT * FROM `VV.category` WHERE category_slug = %s;", result=Category("test", 1, 1)
+    )
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch("app.logger") as mock_logger:
+        client.get("/portfolio/test")
+
+    status, _, stats = mock_logger.response.call_args.args
+    assert status == "200 OK"
+    assert stats.queries == 1
+
+
+def test_assert_query_budget_passes(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.side_effect = query_side_effect(
+        "SELECT * FROM `VV.category` WHERE category_slug = %s;", result=Category("test", 1, 1)
+    )
+    mock_view_user.get_projects_by_category.side_effect = query_side_effect(
+        "SELECT * FROM `VV.project` WHERE category_id = %s;", result=[]
+    )
+
+    with assert_query_budget(2) as requests:
+        client.get("/portfolio/test")
+
+    assert [(path, stats.queries) for path, stats in requests] == [("/portfolio/test", 2)]
+
+
+def test_assert_query_budget_fails_over_budget(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.side_effect = query_side_effect(
+        "SELECT * FROM `VV.category` WHERE category_slug = %s;", result=Category("test", 1, 1)
+    )
+    mock_view_user.get_projects_by_category.side_effect = query_side_effect(
+        "SELECT * FROM `VV.project` WHERE category_id = %s;", result=[]
+    )
+
+    with pytest.raises(QueryBudgetExceeded, match="2 queries exceeds budget of 1"):
+        with assert_query_budget(1):
+            client.get("/portfolio/test")
+
+
+def test_enforced_budget_fails_request_with_repeated_statement(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.side_effect = query_side_effect(
+        "SELECT * FROM `VV.image` WHERE image_id = 1;",
+        "SELECT * FROM `VV.image` WHERE image_id = 2;",
+        result=[],
+    )
+
+    with patch.dict(app.config, {"QUERY_BUDGET_ENFORCE": True}):
+        with pytest.raises(QueryBudgetExceeded, match="statement ran 2 times"):
+            client.get("/portfolio/test")
+
+
+def test_budget_only_logged_when_not_enforced(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.side_effect = query_side_effect(
+        "SELECT * FROM `VV.project`;", "SELECT * FROM `VV.image`;", result=[]
+    )
+
+    with patch.dict(app.config, {"QUERY_BUDGET_ENFORCE": False, "QUERY_BUDGET": 1}), patch(
+        "app.logger"
+    ) as mock_logger:
+        response = client.get("/portfolio/test")
+
+    assert response.status_code == 200
+    mock_logger.warning.assert_called_once_with(
+        "Query budget exceeded on /portfolio/test: 2 queries exceeds budget of 1"
+    )
+
+
+# --------------------------------------------------------------------------
+# Test Server-Timing header
+# --------------------------------------------------------------------------
+def test_server_timing_value():
+    stats = QueryStats()
+    stats.record_query("SELECT 1", 0.0015, 0.0005)
+    stats.render_time = 0.002
+
+    assert (
+        stats.server_timing(0.01)
+        == 'db;dur=1.50;desc="1 queries", conn;dur=0.50, render;dur=2.00, total;dur=10.00'
+    )
+
+
+def test_run_query_keeps_acquire_time_apart():
+    with app.test_request_context("/"):
+        mock_connection = MagicMock()
+        base_mysql = MySQLBase("user", "password", "TEST")
+        base_mysql.logger = MagicMock()
+
+        with patch("mysql_connections.mysql_base.pymysql.connect", return_value=mock_connection), patch(
+            "mysql_connections.mysql_base.time.time", side_effect=[100.0, 100.25, 101.0]
+        ):
+            base_mysql._run_query("SELECT 1;", None, "all")
+
+        stats = query_tracker.current_stats()
+        assert stats.acquire_time == pytest.approx(0.25)
+        assert stats.db_time == pytest.approx(0.75)
+
+
+def test_server_timing_header(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.side_effect = query_side_effect(
+        "SELECT * FROM `VV.category` WHERE category_slug = %s;", result=Category("test", 1, 1)
+    )
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch.dict(app.config, {"SERVER_TIMING": True}):
+        response = client.get("/portfolio/test")
+
+    timings = dict(
+        entry.split(";dur=")[0:2] for entry in response.headers["Server-Timing"].split(", ")
+    )
+    assert set(timings) == {"db", "conn", "render", "total"}
+    assert timings["db"].endswith('desc="1 queries"')
+    assert float(timings["render"]) > 0
+
+
+def test_server_timing_header_disabled(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    with patch.dict(app.config, {"SERVER_TIMING": False}):
+        response = client.get("/portfolio/test")
+
+    assert "Server-Timing" not in response.headers
@@ -0,0 +1,41 @@
+import os
+import sys
+import pytest
+from app import app
+from flask import url_for
+from utility_classes.slug import slugify
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+@pytest.mark.parametrize(
+    "title, slug",
+    [
+        ("Illustration", "illustration"),
+        ("Witch's Tea Party", "witchs-tea-party"),
+        ("1928 Reese's Ad", "1928-reeses-ad"),
+        ("The Half-Goose of Ohio", "the-half-goose-of-ohio"),
+        ("  100% Comics!  ", "100-comics"),
+        ("A_to_Z", "a-to-z"),
+        ("Café Menu", "caf-menu"),
+        ("", ""),
+    ],
+)
+def test_slugify(title, slug):
+    assert slugify(title) == slug
+
+
+def test_slugify_keeps_slugs():
+    assert slugify("witchs-tea-party") == "witchs-tea-party"
+
+
+def test_hyphen_converter_builds_slug_urls():
+    with app.test_request_context():
+        assert (
+            url_for(
+                "project.display_project_images",
+                url_category="Illustration",
+                url_project="Witch's Tea Party",
+            )
+            == "/portfolio/illustration/witchs-tea-party"
+        )
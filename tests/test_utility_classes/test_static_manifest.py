@@ -0,0 +1,66 @@
+import os
+import sys
+from data_classes.category import Category
+from utility_classes.static_manifest import StaticManifest
+from app import static_manifest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+# --------------------------------------------------------------------------
+# Test the manifest
+# --------------------------------------------------------------------------
+def test_hash_changes_with_contents(tmp_path):
+    (tmp_path / "main.css").write_text("body {}")
+    (tmp_path / "icons").mkdir()
+    (tmp_path / "icons" / "logo.svg").write_text("<svg/>")
+    manifest = StaticManifest(str(tmp_path))
+
+    (tmp_path / "main.css").write_text("body { margin: 0 }")
+    changed = StaticManifest(str(tmp_path))
+
+    assert len(manifest.hash_for("main.css")) == 12
+    assert manifest.hash_for("icons/logo.svg") == changed.hash_for("icons/logo.svg")
+    assert manifest.hash_for("main.css") != changed.hash_for("main.css")
+    assert manifest.digest != changed.digest
+    assert manifest.hash_for("missing.css") is None
+
+
+def test_url_defaults_only_for_known_static_files(tmp_path):
+    (tmp_path / "main.css").write_text("body {}")
+    manifest = StaticManifest(str(tmp_path))
+    known, missing, other = {"filename": "main.css"}, {"filename": "missing.css"}, {"url_category": "design"}
+
+    manifest.url_defaults("static", known)
+    manifest.url_defaults("static", missing)
+    manifest.url_defaults("category.display_category_projects", other)
+
+    assert known["v"] == manifest.hash_for("main.css")
+    assert "v" not in missing
+    assert "v" not in other
+
+
+# --------------------------------------------------------------------------
+# Test static URLs and caching
+# --------------------------------------------------------------------------
+def test_pages_link_hashed_static_urls(test_category_client_and_mocks):
+    client, mock_view_user = test_category_client_and_mocks
+    mock_view_user.get_category_by_slug.return_value = Category("test", 1, 1)
+    mock_view_user.get_projects_by_category.return_value = []
+
+    response = client.get("/portfolio/test")
+
+    assert f"/static/main.css?v={static_manifest.hash_for('main.css')}".encode() in response.data
+    assert f"/static/scripts.js?v={static_manifest.hash_for('scripts.js')}".encode() in response.data
+
+
+def test_hashed_static_url_is_immutable(test_dashboard_client_and_mocks):
+    client, _ = test_dashboard_client_and_mocks
+
+    current = client.get(f"/static/main.css?v={static_manifest.hash_for('main.css')}")
+    stale = client.get("/static/main.css?v=000000000000")
+    current.close()
+    stale.close()
+
+    assert current.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert stale.headers["Cache-Control"] == "public, max-age=86400"
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import Optional
+
+# Cache-Control and Vary headers chosen per endpoint or blueprint, so browsers and a fronting cache or CDN
+# know which responses they may keep and for how long.
+
+
+@dataclass(slots=True, frozen=True)
+class Policy:
+    """Headers sent with every response a rule matches."""
+
+    cache_control: str
+    vary: tuple = ()
+
+
+class CachePolicy:
+    """Chooses the caching headers of a response from its endpoint, then its blueprint."""
+
+    def __init__(self, errors: Optional[Policy] = None, private: Optional[Policy] = None):
+        """Creates an empty policy, responses no rule matches keep the Flask defaults.
+
+        :param errors: Policy for redirects and responses with a 4xx or 5xx status, whatever their endpoint.
+            Redirects are often fallbacks, e.g. to an original image, and should not outlive the problem.
+        :type errors: Policy or None
+        :param private: Policy for matched responses that depend on the visitor, e.g. an admin viewing a public page.
+        :type private: Policy or None
+        """
+        self.rules: dict[str, Policy] = {}
+        self.errors = errors
+        self.private = private
+
+    def add(self, names, cache_control: str, vary: tuple = ()):
+        """Sets the policy of one or more endpoints or blueprints, replacing any earlier rule.
+
+        :param names: Endpoint names like "static" or "image.display_image", or blueprint names like "dashboard".
+        :type names: Iterable[str]
+        :param cache_control: Cache-Control header value.
+        :type cache_control: str
+        :param vary: Request headers added to Vary.
+        :type vary: tuple
+        """
+        policy = Policy(cache_control, tuple(vary))
+        for name in names:
+            self.rules[name] = policy
+
+    def choose(self, endpoint: Optional[str], blueprint: Optional[str], status: int, shared: bool = True) -> Optional[Policy]:
+        """Returns the policy for a response, or None to leave its headers alone.
+
+        :param endpoint: Endpoint of the request, None when no route matched.
+        :param blueprint: Blueprint of the request, None for app routes.
+        :param status: Response status code.
+        :type status: int
+        :param shared: False when the response was built for this visitor and must not be shared.
+        :type shared: bool
+        :rtype: Policy or None
+        """
+        if status >= 300 and status != 304:
+            return self.errors
+        policy = self.rules.get(endpoint) or self.rules.get(blueprint)
+        if policy is not None and not shared:
+            return self.private
+        return policy
+
+    def apply(self, response, endpoint: Optional[str], blueprint: Optional[str], shared: bool = True):
+        """Sets Cache-Control and adds to Vary on a response, see choose()."""
+        policy = self.choose(endpoint, blueprint, response.status_code, shared)
+        if policy is None:
+            return response
+        response.headers["Cache-Control"] = policy.cache_control
+        if policy.vary:
+            response.vary.update(policy.vary)
+        return response
@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Callable, Optional
+from data_classes.category import Category
+from utility_classes.custom_logger import log
+from utility_classes.slug import slugify
+
+# Process wide cache of the category list used by the nav bar, the index redirect and category routes.
+# Entries expire after a TTL and can be dropped early with invalidate() when categories change.
+
+
+class CategoryCache:
+    """TTL bounded cache of the category list."""
+
+    def __init__(self, loader: Callable[[], list[Category]], ttl: float = 60.0):
+        """Creates the category cache.
+
+        :param loader: Callable that loads the category list from the database.
+        :type loader: Callable[[], list[Category]]
+
+        :param ttl: Seconds a loaded list is served before it is reloaded. 0 disables caching.
+        :type ttl: float
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.logger = log("CATEGORY CACHE")
+        self._lock = threading.Lock()
+        self._categories: Optional[list[Category]] = None
+        self._by_slug: dict[str, Category] = {}
+        self._expires = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self) -> list[Category]:
+        """Returns the cached category list, reloading it if it has expired.
+        If a reload fails and an older list exists the older list is served.
+
+        :return: List of categories.
+        :rtype: list[Category]
+        :raises Exception: If the list could not be loaded and nothing is cached.
+        """
+        categories = self._categories
+        if categories is not None and time.monotonic() < self._expires:
+            self.hits += 1
+            return list(categories)
+
+        with self._lock:  # Only one thread reloads, the rest wait for its result
+            if self._categories is not None and time.monotonic() < self._expires:
+                self.hits += 1
+                return list(self._categories)
+            self.misses += 1
+            try:
+                categories = self.loader()
+            except Exception as e:
+                if self._categories is None:
+                    raise
+                self.logger.error(f"Failed to reload categories, serving cached list: {e}")
+                return list(self._categories)
+            self._store(categories)
+            return list(categories)
+
+    def get_by_slug(self, slug: str) -> Optional[Category]:
+        """Returns the cached category with the provided slug or None. Titles are converted to slugs.
+
+        :param slug: Slug or title of the category.
+        :type slug: str
+        :rtype: Category or None
+        """
+        self.get()
+        return self._by_slug.get(slugify(slug))
+
+    def invalidate(self):
+        """Drops the cached list so the next call reloads it. Call after categories are changed."""
+        with self._lock:
+            self.logger.info("Category cache invalidated")
+            self._categories = None
+            self._by_slug = {}
+            self._expires = 0.0
+
+    def _store(self, categories: list[Category]):
+        by_slug = {}
+        for category in categories:
+            if category.category_id:  # Skip the hard coded About page
+                by_slug[category.category_slug] = category
+        self._by_slug = by_slug
+        self._categories = categories
+        self._expires = time.monotonic() + self.ttl
@@ -0,0 +1,115 @@
+import gzip
+import os
+from typing import Optional
+from utility_classes.custom_logger import log
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, without it only gzip is offered
+    brotli = None
+
+# Response compression. Static files get .gz and .br siblings written once at startup, rendered pages are
+# compressed per request, or once per cached page when they are stored in the page cache.
+
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)  # Preferred first when the client accepts both
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+COMPRESSIBLE_TYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+}
+COMPRESSIBLE_EXTENSIONS = {".html", ".css", ".js", ".json", ".svg", ".txt"}
+FAST = {"br": 4, "gzip": 6}  # Levels for bodies compressed on every request
+SMALLEST = {"br": 11, "gzip": 9}  # Levels for bodies compressed once and kept
+
+
+def compress(body: bytes, encoding: str, levels: dict = FAST) -> bytes:
+    """Compresses a body with one of ENCODINGS.
+
+    :param body: Uncompressed body.
+    :type body: bytes
+    :param encoding: "br" or "gzip".
+    :type encoding: str
+    :param levels: Compression level per encoding, FAST or SMALLEST.
+    :type levels: dict
+    :rtype: bytes
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=levels["br"])
+    return gzip.compress(body, compresslevel=levels["gzip"], mtime=0)  # mtime=0 keeps the output the same every run
+
+
+def compressed_variants(body: bytes, min_size: int) -> tuple:
+    """Compresses a body with every available encoding, for bodies that are compressed once and served many times.
+    Encodings that do not make the body smaller are left out.
+
+    :param body: Uncompressed body.
+    :type body: bytes
+    :param min_size: Bodies shorter than this are not compressed.
+    :type min_size: int
+    :return: (encoding, body) pairs in ENCODINGS order.
+    :rtype: tuple
+    """
+    if len(body) < min_size:
+        return ()
+    variants = []
+    for encoding in ENCODINGS:
+        compressed = compress(body, encoding, SMALLEST)
+        if len(compressed) < len(body):
+            variants.append((encoding, compressed))
+    return tuple(variants)
+
+
+def negotiate(accept_encodings, available) -> Optional[str]:
+    """Returns the first of available the client accepts, or None to send the body uncompressed.
+
+    :param accept_encodings: request.accept_encodings.
+    :param available: Encodings the body is available in, preferred first.
+    :rtype: str or None
+    """
+    return accept_encodings.best_match(list(available))
+
+
+def precompress_folder(folder: str) -> dict[str, tuple]:
+    """Writes a .gz and .br sibling next to every compressible file in a folder, skipping siblings that are
+    already newer than their file. Files that can not be written are logged and served uncompressed.
+
+    :param folder: Path of the static folder.
+    :type folder: str
+    :return: Encodings available for each file, keyed by its path relative to the folder with / separators.
+    :rtype: dict[str, tuple]
+    """
+    logger = log("COMPRESSION")
+    available = {}
+    written = 0
+    for root, dirs, files in os.walk(folder):
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            encodings = []
+            for encoding in ENCODINGS:
+                sibling = path + SUFFIXES[encoding]
+                try:
+                    if not os.path.exists(sibling) or os.path.getmtime(sibling) < os.path.getmtime(path):
+                        with open(path, "rb") as file:
+                            body = file.read()
+                        compressed = compress(body, encoding, SMALLEST)
+                        if len(compressed) >= len(body):
+                            continue
+                        temp = f"{sibling}.{os.getpid()}.tmp"  # Workers starting together never see half a file
+                        with open(temp, "wb") as file:
+                            file.write(compressed)
+                        os.replace(temp, sibling)
+                        written += 1
+                    encodings.append(encoding)
+                except OSError as e:
+                    logger.warning(f"Could not precompress {path} with {encoding}: {e}")
+            if encodings:
+                available[os.path.relpath(path, folder).replace(os.sep, "/")] = tuple(encodings)
+    logger.info("Precompressed %s static files, %s siblings written", len(available), written)
+    return available
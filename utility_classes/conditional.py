@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+# Validators for the public pages, so repeat visits can be answered with 304 Not Modified before any query runs.
+# A page only changes when the catalog version or a template changes, so both are hashed into its ETag.
+
+
+def template_hash(folder: str) -> str:
+    """Hashes the name and contents of every file under a template folder.
+
+    :param folder: Path of the template folder.
+    :type folder: str
+    :return: Hex digest that changes whenever a template is added, removed or edited.
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, folder).encode("utf-8") + b"\0")
+            with open(path, "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+def page_etag(version: Any, templates: str, path: str) -> str:
+    """Builds the strong ETag, without quotes, of a page rendered at a catalog version with a set of templates.
+    The path is part of it, so a validator from one page never matches another.
+
+    :param version: Catalog version marker.
+    :param templates: Hash from template_hash().
+    :type templates: str
+    :param path: Request path of the page.
+    :type path: str
+    :rtype: str
+    """
+    marker = json.dumps([version, templates, path], default=str)
+    return hashlib.sha256(marker.encode("utf-8")).hexdigest()[:32]
+
+
+def last_modified(version: Any) -> Optional[datetime]:
+    """Returns when the catalog was last updated, from the last_updated half of its version marker.
+    site_meta.last_updated is a TIMESTAMP read in the server time zone, which is UTC.
+
+    :param version: Catalog version marker, (meta_data, last_updated).
+    :return: The update time in UTC, or None if the marker has no usable time.
+    :rtype: datetime or None
+    """
+    try:
+        updated = datetime.fromisoformat(str(version[1]))
+    except (TypeError, ValueError, IndexError, KeyError):
+        return None
+    if updated.tzinfo is None:
+        updated = updated.replace(tzinfo=timezone.utc)
+    return updated.astimezone(timezone.utc).replace(microsecond=0)
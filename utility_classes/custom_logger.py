@@ -1,7 +1,146 @@
 import re
-import logging
+import os
 import sys
-from flask import current_app, has_app_context
+import json
+import uuid
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from flask import current_app, has_app_context, has_request_context, request, g
+from utility_classes import query_tracker
+
+#Queued logging. Request threads put records on a bounded queue and one listener thread per worker writes them,
+#so a slow stdout reader never holds up a request. start_queued_logging() moves the root handlers behind the queue.
+
+_queue_handler = None #DroppingQueueHandler while queued logging is on
+_listener = None
+_tag_loggers = [] #Loggers made outside an app context, given their own stdout handler until the queue starts
+
+
+class DroppingQueueHandler(QueueHandler): #Drops records when the queue is full, or waits up to block_timeout when block is set, and counts every record lost
+    def __init__(self, record_queue, block=False, block_timeout=1.0):
+        super().__init__(record_queue)
+        self.block = block
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def enqueue(self, record): #Runs under the handler lock, so the counter needs no lock of its own
+        try:
+            if self.block:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def start_queued_logging(size=10000, block=False, block_timeout=1.0):
+    """Moves the root logger's handlers onto a background listener thread fed by a bounded queue.
+
+    :param size: Most records waiting to be written.
+    :type size: int
+    :param block: If True a full queue makes the caller wait up to block_timeout, otherwise the record is dropped.
+    :type block: bool
+    :param block_timeout: Seconds to wait for space before the record is dropped when block is True.
+    :type block_timeout: float
+    """
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        return
+    root = logging.getLogger()
+    _queue_handler = DroppingQueueHandler(queue.Queue(size), block, block_timeout)
+    _listener = QueueListener(_queue_handler.queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [_queue_handler]
+    for tag_logger in _tag_loggers: #Their records reach the queue through the root logger
+        tag_logger.handlers = []
+    _listener.start()
+
+
+def stop_queued_logging():
+    """Writes any queued records and puts the root handlers back."""
+    global _queue_handler, _listener
+    if _queue_handler is None:
+        return
+    _listener.stop()
+    logging.getLogger().handlers = list(_listener.handlers)
+    _queue_handler = None
+    _listener = None
+
+
+def dropped_records():
+    """Records lost to a full queue in this worker."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def _restart_listener(): #Threads do not survive fork, so each gunicorn worker starts its own listener on a new queue
+    global _listener
+    if _queue_handler is None:
+        return
+    _queue_handler.queue = queue.Queue(_queue_handler.queue.maxsize)
+    _queue_handler.dropped = 0
+    _listener = QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_listener)
+atexit.register(stop_queued_logging)
+
+
+#Structured logging. With use_json_logging() every record is written as one JSON object, and records made during a request
+#carry the request id set in log_request along with the endpoint, method and the request's query count and DB time so far.
+
+_structured = False #Request fields are only gathered when a JSON formatter will write them
+_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
+JSON_FIELDS = ("tag", "request_id", "endpoint", "method", "status", "elapsed_ms", "queries", "db_ms")
+
+
+class JsonFormatter(logging.Formatter): #One JSON object per line, with the request fields log adds to each record
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in JSON_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def use_json_logging():
+    """Writes the root logger's records as JSON. Call before start_queued_logging so the listener's handlers get the formatter."""
+    global _structured
+    _structured = True
+    for handler in logging.getLogger().handlers + [h for tag_logger in _tag_loggers for h in tag_logger.handlers]:
+        handler.setFormatter(JsonFormatter())
+
+
+def request_id_from(header):
+    """Keeps a request id sent by a proxy if it is safe to log, otherwise makes a new one.
+
+    :param header: Value of the X-Request-ID header, None if it was not sent.
+    :type header: str or None
+    :rtype: str
+    """
+    if header and _REQUEST_ID.fullmatch(header):
+        return header
+    return uuid.uuid4().hex
+
+
+def request_fields():
+    """Fields describing the current request, empty outside a request."""
+    if not has_request_context():
+        return {}
+    fields = {"request_id": g.get("request_id"), "endpoint": request.endpoint, "method": request.method}
+    stats = query_tracker.current_stats()
+    fields["queries"] = stats.queries
+    fields["db_ms"] = round(stats.db_time * 1000, 3)
+    return fields
 
 
 class log(): #A simple logging class that just forces standard message format across the whole project.  
@@ -12,7 +151,8 @@ class log(): #A simple logging class that just forces standard message format ac
             self.logger = current_app.logger
         else:
             self.logger = logging.getLogger(tag)
-            if not self.logger.handlers:
+            if not self.logger.handlers and _queue_handler is None:
+                _tag_loggers.append(self.logger)
                 stream = logging.StreamHandler(sys.stdout)
                 formatter = logging.Formatter(
                     '%(asctime)s %(levelname)-8s| %(message)s'
@@ -23,49 +163,65 @@ class log(): #A simple logging class that just forces standard message format ac
 
         self.level = self.logger.getEffectiveLevel()
 
-    def debug(self, message): #Default DEBUG message
-        self.logger.debug(f"{self.tag} {message}")
+    def _log(self, level, message, args, fields=None): #Formats only records the level lets through. message can be a %-style string used with args, or a callable returning the message
+        if not self.logger.isEnabledFor(level):
+            return
+        if callable(message):
+            message = message()
+        elif args:
+            message = message % args
+        if _structured: #Gathered here because the queue listener that writes the record has no request context
+            extra = {"tag": self.tag[1:-1], **request_fields(), **(fields or {})}
+            self.logger.log(level, f"{self.tag} {message}", extra=extra)
+        else:
+            self.logger.log(level, f"{self.tag} {message}")
+
+    def debug(self, message, *args): #Default DEBUG message
+        self._log(logging.DEBUG, message, args)
 
-    def info(self, message): #Default INFO message
-        self.logger.info(f"{self.tag} {message}")
+    def info(self, message, *args): #Default INFO message
+        self._log(logging.INFO, message, args)
     
-    def error(self, message): #Default ERROR message
-        self.logger.error(f"{self.tag} {message}")
+    def error(self, message, *args): #Default ERROR message
+        self._log(logging.ERROR, message, args)
 
-    def critical(self, message): #Default CRITICAL message
-        self.logger.critical(f"{self.tag} {message}")
+    def critical(self, message, *args): #Default CRITICAL message
+        self._log(logging.CRITICAL, message, args)
 
     def con_open(self): #Default open database connection message
-        self.logger.info(f"{self.tag} ---Connecting to database---")
+        self._log(logging.INFO, "---Connecting to database---", ())
     
     def con_close(self, time): #Default close database connection message
-        self.logger.info(f"{self.tag} ---Connecting Closing---Time: {time:.2f}s---")
+        self._log(logging.INFO, "---Connecting Closing---Time: %.2fs---", (time,))
 
-    def query(self, query, args, results): #Default query message
-        if self.level == 10: #checks if log level is debug
-            self.logger.debug(f"{self.tag} Query: {query}\nargs: {args}\n Results:{results}")
+    def query(self, query, args, results): #Default query message, results are only written at debug
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, "Query: %s\nargs: %s\n Results:%s", (query, args, results))
         else:
-            self.logger.info(f"{self.tag} Query: {query}\nargs: {args}")
+            self._log(logging.INFO, "Query: %s\nargs: %s", (query, args))
     
     def register(self, blueprint): #Default blueprint registration message
-        self.logger.info(f"{self.tag} Registering blueprint {blueprint}")
+        self._log(logging.INFO, "Registering blueprint %s", (blueprint,))
     
     def visit(self, page): #Default site visit message
-        self.logger.info(f"{self.tag} User visited page: {page}")
+        self._log(logging.INFO, "User visited page: %s", (page,))
     
     def redirect(self, url): #Default redirect message
-        self.logger.info(f"{self.tag} Redirecting user to: {url}")
+        self._log(logging.INFO, "Redirecting user to: %s", (url,))
 
     def request(self, method, url, headers): #Default request
-        self.logger.info(f"{self.tag} Request: {method} {url}")
-        if self.level == 10: #checks if level is debug
-            self.logger.debug(f"{self.tag} Headers: {dict(headers)}")
+        self._log(logging.INFO, "Request: %s %s", (method, url))
+        self._log(logging.DEBUG, lambda: f"Headers: {dict(headers)}", ())
     
-    def response(self, status, time):
+    def warning(self, message, *args): #Default WARNING message
+        self._log(logging.WARNING, message, args)
+
+    def response(self, status, time, stats=None): #stats is the request's QueryStats, added to the line when given
+        queries = f" - {stats}" if stats is not None else ""
+        fields = {"status": int(status.split()[0]), "elapsed_ms": round(time * 1000, 3)}
         if re.match(r'^5', status): #Checks if status is of type 500
-            self.logger.critical(f"{self.tag} Response status: {status} - Processing time: {time:.2f}s")
+            self._log(logging.CRITICAL, "Response status: %s - Processing time: %.2fs%s", (status, time, queries), fields)
         elif re.match(r'^4', status):#Checks if status is of type 400
-            self.logger.warning(f"{self.tag} Response status: {status} - Processing time: {time:.2f}s")
+            self._log(logging.WARNING, "Response status: %s - Processing time: %.2fs%s", (status, time, queries), fields)
         else: 
-            self.logger.info(f"{self.tag} Response status: {status} - Processing time: {time:.2f}")
-            
\ No newline at end of file
+            self._log(logging.INFO, "Response status: %s - Processing time: %.2f%s", (status, time, queries), fields)
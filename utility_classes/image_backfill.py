@@ -0,0 +1,189 @@
+import collections
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from mysql_connections.mysql_image_writer import Image_Writer
+from utility_classes.custom_logger import log
+from utility_classes.image_derivatives import SIZES, PILImage
+
+# Measures every image in the database and makes its derivatives ahead of time, so pages never wait on a
+# first resize and rows added before the image columns existed get their sizes and placeholders.
+#
+# One thread streams the image table while a pool of threads downloads and resizes. Downloads wait on the
+# network and Pillow releases the GIL while it decodes and encodes, so threads keep every core busy without
+# copying images between processes. Results are written back a batch at a time and the id of the last image
+# written is kept in a checkpoint file, so an interrupted run picks up where it stopped.
+
+
+@dataclass(slots=True)
+class BackfillStats:
+    processed: int = 0
+    failed: int = 0
+    written: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Images processed per second."""
+        return self.processed / self.seconds if self.seconds else 0.0
+
+
+class ImageBackfill:
+    """Measures and resizes the images streamed from the database with a bounded pool of threads."""
+
+    def __init__(self, store, writer, workers: int = 4, batch_size: int = 50, checkpoint: str = None,
+                 variants: bool = True, replace: bool = False, report_every: float = 10.0):
+        """Creates a backfill, nothing is read until run() is called.
+
+        :param store: Store the originals and derivatives are kept in.
+        :type store: DerivativeStore
+        :param writer: Image writer user, streams the image table and writes the results.
+        :type writer: Image_Writer
+        :param workers: Threads downloading and resizing at once.
+        :type workers: int
+        :param batch_size: Results written to the database per transaction.
+        :type batch_size: int
+        :param checkpoint: File the last written image id is kept in, None to always start from the first image.
+        :type checkpoint: str or None
+        :param variants: Also make every derivative the pages link.
+        :type variants: bool
+        :param replace: Measure images that already have a placeholder again.
+        :type replace: bool
+        :param report_every: Seconds between progress log lines.
+        :type report_every: float
+        """
+        self.store = store
+        self.writer = writer
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.checkpoint = checkpoint
+        self.variants = variants
+        self.replace = replace
+        self.report_every = report_every
+        self.logger = log("BACKFILL")
+
+    def process(self, row: dict) -> dict:
+        """Downloads, measures and resizes one image, returns its measurements."""
+        image_url = row["image_URL"]
+        measured = self.store.measure(image_url)  # Downloads the original into the store, later steps reuse it
+        if self.variants:
+            for size in SIZES:
+                for fmt in self.store.formats:
+                    self.store.get(image_url, size, fmt)
+        return measured
+
+    def run(self) -> BackfillStats:
+        """Processes every image after the checkpoint, see the module comment.
+
+        :return: Totals for this run.
+        :rtype: BackfillStats
+        :raises pymysql.MySQLError: If the image table can not be read or the results can not be written.
+        """
+        stats = BackfillStats()
+        after_id = self.load_checkpoint()
+        if after_id:
+            self.logger.info("Resuming after image %s", after_id)
+        started = last_report = time.monotonic()
+        batch = []
+        in_flight = collections.deque()
+        rows = self.writer.stream_images(after_id, unmeasured_only=not self.replace)
+
+        def finish_oldest():  # Oldest first so the checkpoint only ever moves past finished images
+            nonlocal after_id
+            row, future = in_flight.popleft()
+            try:
+                batch.append((row["image_id"], future.result()))
+            except Exception as e:
+                stats.failed += 1
+                self.logger.warning(f"Could not process image {row['image_id']}: {e}")
+            stats.processed += 1
+            after_id = row["image_id"]
+            if len(batch) >= self.batch_size:
+                self.write(batch, after_id, stats)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as pool:
+                for row in rows:
+                    in_flight.append((row, pool.submit(self.process, row)))
+                    if len(in_flight) >= self.workers * 2:  # Bounded, the table is never read far ahead of the pool
+                        finish_oldest()
+                    if time.monotonic() - last_report >= self.report_every:
+                        last_report = time.monotonic()
+                        self.report(stats, last_report - started)
+                while in_flight:
+                    finish_oldest()
+            self.write(batch, after_id, stats)
+        finally:
+            rows.close()
+        stats.seconds = time.monotonic() - started
+        self.report(stats, stats.seconds)
+        self.clear_checkpoint()  # Finished, the next run starts from the first image again
+        return stats
+
+    def write(self, batch: list, after_id: int, stats: BackfillStats):
+        """Writes a batch of results and moves the checkpoint past them."""
+        if batch:
+            results = batch.copy()
+            batch.clear()
+            self.writer.update_images_metadata(results, self.replace)
+            stats.written += len(results)
+        self.save_checkpoint(after_id)
+
+    def report(self, stats: BackfillStats, seconds: float):
+        rate = stats.processed / seconds if seconds else 0.0
+        self.logger.info(
+            "Processed %s images, %s failed, %s written, %.1f images/s",
+            stats.processed, stats.failed, stats.written, rate,
+        )
+
+    def load_checkpoint(self) -> int:
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return 0
+        try:
+            with open(self.checkpoint, "rb") as file:
+                return int(json.load(file)["after_id"])
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable checkpoint '{self.checkpoint}': {e}")
+            return 0
+
+    def save_checkpoint(self, after_id: int):
+        if self.checkpoint is None:
+            return
+        os.makedirs(os.path.dirname(self.checkpoint) or ".", exist_ok=True)
+        temp = f"{self.checkpoint}.{os.getpid()}.tmp"  # An interrupted write never leaves a broken checkpoint
+        with open(temp, "w") as file:
+            json.dump({"after_id": after_id}, file)
+        os.replace(temp, self.checkpoint)
+
+    def clear_checkpoint(self):
+        if self.checkpoint is not None and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+
+@click.command("backfill-images")
+@click.option("--workers", default=4, show_default=True, help="Images downloaded and resized at once.")
+@click.option("--batch-size", default=50, show_default=True, help="Results written per transaction.")
+@click.option("--checkpoint", default=None, help="Resume file, defaults to backfill.json in IMAGE_STORE_DIR.")
+@click.option("--restart", is_flag=True, help="Ignore the checkpoint and start from the first image.")
+@click.option("--all", "replace", is_flag=True, help="Measure images that already have a placeholder again.")
+@click.option("--no-variants", is_flag=True, help="Only measure, leave the derivatives to the first page view.")
+@with_appcontext
+def backfill_images_command(workers, batch_size, checkpoint, restart, replace, no_variants):
+    """Measures every image and makes its derivatives and placeholder."""
+    if PILImage is None:
+        raise click.ClickException("Pillow is not installed, images can not be measured")
+    store = current_app.extensions['image_store']
+    checkpoint = checkpoint or os.path.join(store.folder, "backfill.json")
+    if restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    backfill = ImageBackfill(store, Image_Writer(), workers, batch_size, checkpoint, variants=not no_variants, replace=replace)
+    stats = backfill.run()
+    click.echo(
+        f"Processed {stats.processed} images in {stats.seconds:.1f}s ({stats.rate:.1f}/s), "
+        f"{stats.written} written, {stats.failed} failed"
+    )
@@ -0,0 +1,308 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from utility_classes.custom_logger import log
+
+try:
+    from PIL import Image as PILImage, ImageOps, features
+except ImportError:  # Pillow is optional, without it pages link the original images
+    PILImage = None
+
+# Resized copies of the portfolio images, kept in a local folder and served by the derivative route.
+# Images are only ever fetched from the image_URL stored in the database, never from a URL in the request.
+# Requests never wait on a resize, a missing derivative is made on a background thread or by flask backfill-images.
+#
+# Store layout, one folder per source URL so a changed URL never serves old copies:
+#   <folder>/<url hash>/source           the downloaded original
+#   <folder>/<url hash>/measure.json     size, dominant color, placeholder and bytes of the original
+#   <folder>/<url hash>/<size>.<format>  a derivative
+
+# Longest side of each size, smallest first as srcset lists them. Thumbnails fit in 800px so the 600px
+# wide/tall check in scripts.js classifies grid tiles exactly as it did with the full size images.
+SIZES = {"small": 400, "thumb": 800, "medium": 1600}
+QUALITY = {"avif": 55, "webp": 80}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+ORIENTATION_TAG = 0x0112
+# Placeholders are a blurry copy this many pixels on the longest side, inlined in the page as a data URI.
+# Busy images are made smaller still until they fit the image_placeholder column.
+PLACEHOLDER_SIDES = (16, 8, 4)
+PLACEHOLDER_MAX_LENGTH = 1024
+
+
+class DerivativeError(Exception):
+    """Raised when a derivative can not be made, the caller should fall back to the original image."""
+
+
+def url_hash(image_url: str) -> str:
+    """Short hash of an image URL, names its store folder and versions its derivative URLs."""
+    return hashlib.sha256(str(image_url).encode("utf-8")).hexdigest()[:16]
+
+
+def variant_widths(width: int, height: int) -> list:
+    """Widths of the derivatives of an image of the given size, as (size, width) pairs smallest first.
+    Sizes that would be no wider than the one before, because originals are never enlarged, are left out.
+
+    :param width: Width of the original.
+    :type width: int
+    :param height: Height of the original.
+    :type height: int
+    :rtype: list[tuple[str, int]]
+    """
+    widths = []
+    for size, longest_side in SIZES.items():
+        scale = min(1.0, longest_side / max(width, height, 1))
+        variant = max(1, round(width * scale))
+        if widths and variant <= widths[-1][1]:
+            break
+        widths.append((size, variant))
+    return widths
+
+
+def measure(source: bytes) -> dict:
+    """Measures an original image for the image table columns.
+
+    :param source: The encoded original.
+    :type source: bytes
+    :return: image_width and image_height once any EXIF rotation is applied, image_color the most common
+        color as #rrggbb, image_placeholder a tiny copy as a data URI and image_bytes.
+    :rtype: dict
+    """
+    with PILImage.open(io.BytesIO(source)) as image:
+        width, height = image.size
+        if image.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8):  # Shown turned a quarter, see exif_transpose
+            width, height = height, width
+        image.draft("RGB", (64, 64))  # JPEGs decode straight to a small size
+        sample = ImageOps.exif_transpose(image).convert("RGB")
+        sample.thumbnail((64, 64))
+    palette = sample.quantize(colors=8)
+    _, index = max(palette.getcolors())
+    red, green, blue = palette.getpalette()[index * 3 : index * 3 + 3]
+    return {
+        "image_width": width,
+        "image_height": height,
+        "image_color": f"#{red:02x}{green:02x}{blue:02x}",
+        "image_placeholder": placeholder(sample),
+        "image_bytes": len(source),
+    }
+
+
+def placeholder(sample) -> str:
+    """Low quality copy of an image as a data URI, shown stretched under the image until it loads.
+
+    :param sample: Small RGB copy of the image.
+    :type sample: PIL.Image.Image
+    :return: The largest copy in PLACEHOLDER_SIDES that fits in PLACEHOLDER_MAX_LENGTH characters.
+    :rtype: str
+    """
+    fmt = "webp" if "webp" in supported_formats() else "jpeg"
+    for side in PLACEHOLDER_SIDES:
+        tiny = sample.copy()
+        tiny.thumbnail((side, side))
+        output = io.BytesIO()
+        tiny.save(output, fmt.upper(), quality=30)
+        uri = f"data:image/{fmt};base64,{base64.b64encode(output.getvalue()).decode('ascii')}"
+        if len(uri) <= PLACEHOLDER_MAX_LENGTH:
+            break
+    return uri
+
+
+def supported_formats() -> tuple:
+    """Formats the installed Pillow can write, smallest first. Empty when Pillow is not installed."""
+    if PILImage is None:
+        return ()
+    return tuple(fmt for fmt in ("avif", "webp") if features.check(fmt))
+
+
+class DerivativeStore:
+    """On disk store of resized images, each derivative is made once and then served from disk."""
+
+    def __init__(self, folder: str, formats: tuple = None, timeout: float = 10.0, max_source_bytes: int = 20 * 1024 * 1024,
+                 workers: int = 1, max_pending: int = 64):
+        """Creates the store, the folder is created when the first derivative is written.
+
+        :param folder: Folder the derivatives are kept in.
+        :type folder: str
+        :param formats: Formats to offer, defaults to every format Pillow can write. Empty disables derivatives.
+        :type formats: tuple or None
+        :param timeout: Seconds to wait for an original image to download.
+        :type timeout: float
+        :param max_source_bytes: Larger originals are not resized.
+        :type max_source_bytes: int
+        :param workers: Background threads making the derivatives queued by make_later().
+        :type workers: int
+        :param max_pending: Derivatives queued at once, more are dropped until the queue drains.
+        :type max_pending: int
+        """
+        self.folder = folder
+        self.formats = supported_formats() if formats is None else tuple(formats)
+        self.timeout = timeout
+        self.max_source_bytes = max_source_bytes
+        self.logger = log("DERIVATIVES")
+        self._lock = threading.Lock()
+        self._locks: dict[str, threading.Lock] = {}
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self._pool = None
+        self._pool_pid = None
+        self._pending: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.formats)
+
+    def path(self, image_url: str, size: str, fmt: str) -> str:
+        return os.path.join(self.folder, url_hash(image_url), f"{size}.{fmt}")
+
+    def lookup(self, image_url: str, size: str, fmt: str) -> Optional[str]:
+        """Returns the path of a derivative already in the store, None when it has not been made yet."""
+        path = self.path(image_url, size, fmt)
+        if not os.path.exists(path):
+            return None
+        self.hits += 1
+        return path
+
+    def make_later(self, image_url: str, size: str, fmt: str) -> bool:
+        """Queues a derivative to be made on a background thread, see get().
+
+        :param image_url: URL of the original image.
+        :type image_url: str
+        :param size: Key of SIZES.
+        :type size: str
+        :param fmt: One of formats.
+        :type fmt: str
+        :return: False when the derivative is already queued or the queue is full.
+        :rtype: bool
+        """
+        path = self.path(image_url, size, fmt)
+        with self._lock:
+            if path in self._pending or len(self._pending) >= self.max_pending:
+                return False
+            if self._pool is None or self._pool_pid != os.getpid():  # Threads do not survive fork, each worker starts its own
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="derivatives")
+                self._pool_pid = os.getpid()
+            self._pending.add(path)
+            pool = self._pool
+        try:
+            pool.submit(self._make, image_url, size, fmt, path)
+        except RuntimeError:  # Shutting down
+            with self._lock:
+                self._pending.discard(path)
+            return False
+        return True
+
+    def _make(self, image_url: str, size: str, fmt: str, path: str):
+        try:
+            self.get(image_url, size, fmt)
+        except DerivativeError as e:
+            self.logger.warning(f"Could not make {size} {fmt} of {image_url}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(path)
+
+    def get(self, image_url: str, size: str, fmt: str) -> str:
+        """Returns the path of a derivative, making it first if it is not in the store.
+        Only one thread makes a given derivative, the rest wait for it.
+
+        :param image_url: URL of the original image.
+        :type image_url: str
+        :param size: Key of SIZES.
+        :type size: str
+        :param fmt: One of formats.
+        :type fmt: str
+        :return: Path of the derivative file.
+        :rtype: str
+        :raises DerivativeError: If the original can not be downloaded or read.
+        """
+        if size not in SIZES or fmt not in self.formats:
+            raise DerivativeError(f"No {size} {fmt} derivatives")
+        path = self.path(image_url, size, fmt)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+
+        with self._lock:
+            lock = self._locks.setdefault(path, threading.Lock())
+        with lock:
+            if os.path.exists(path):
+                self.hits += 1
+                return path
+            self.misses += 1
+            try:
+                body = self._render(self._source(image_url), SIZES[size], fmt)
+                self._write(path, body)
+            except DerivativeError:
+                self.failures += 1
+                raise
+            except Exception as e:
+                self.failures += 1
+                raise DerivativeError(f"Could not make {size} {fmt} of {image_url}: {e}") from e
+            self.logger.info("Made %s %s of %s, %s bytes", size, fmt, image_url, len(body))
+            return path
+
+    def measure(self, image_url: str) -> dict:
+        """Returns the measurements of an original image, see measure(). They are kept in the store so the
+        original is only decoded once.
+
+        :param image_url: URL of the original image.
+        :type image_url: str
+        :rtype: dict
+        :raises DerivativeError: If the original can not be downloaded or read.
+        """
+        path = os.path.join(self.folder, url_hash(image_url), "measure.json")
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                measured = json.load(file)
+            if "image_placeholder" in measured:  # Measured before placeholders were added otherwise
+                return measured
+        try:
+            measured = measure(self._source(image_url))
+        except DerivativeError:
+            raise
+        except Exception as e:
+            raise DerivativeError(f"Could not measure {image_url}: {e}") from e
+        self._write(path, json.dumps(measured).encode("utf-8"))
+        return measured
+
+    def _source(self, image_url: str) -> bytes:
+        """Returns the original image, downloading it into the store the first time."""
+        path = os.path.join(self.folder, url_hash(image_url), "source")
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                return file.read()
+        if urllib.parse.urlsplit(image_url).scheme not in ("http", "https"):
+            raise DerivativeError(f"Not an http image URL: {image_url}")
+        self.logger.debug("Downloading %s", image_url)
+        request = urllib.request.Request(image_url, headers={"User-Agent": "portfolio-derivatives"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = response.read(self.max_source_bytes + 1)
+        if len(body) > self.max_source_bytes:
+            raise DerivativeError(f"{image_url} is over {self.max_source_bytes} bytes")
+        self._write(path, body)
+        return body
+
+    def _render(self, source: bytes, longest_side: int, fmt: str) -> bytes:
+        with PILImage.open(io.BytesIO(source)) as image:
+            image = ImageOps.exif_transpose(image)  # Phone photos are stored sideways with a rotation tag
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+            image.thumbnail((longest_side, longest_side))  # Keeps the aspect ratio and never enlarges
+            output = io.BytesIO()
+            image.save(output, fmt.upper(), quality=QUALITY[fmt])
+            return output.getvalue()
+
+    def _write(self, path: str, body: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Readers never see half a file
+        with open(temp, "wb") as file:
+            file.write(body)
+        os.replace(temp, path)
@@ -0,0 +1,193 @@
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from utility_classes.custom_logger import log
+
+# Local copies of images hosted by third parties, so pages do not wait on their servers and the site sets the
+# cache headers. Only URLs the site signed are fetched, see routes/route_image_proxy.py.
+#
+# Store layout, content addressed so URLs that serve the same bytes share one copy:
+#   <folder>/objects/<sha256 of body>  the image
+#   <folder>/urls/<sha256 of URL>.json  digest and content type of the image at that URL
+#
+# The store is bounded by evicting the least recently served objects. Each gunicorn worker tracks the objects
+# it knows about and serving one touches its access time, so a worker that starts up picks up the order the
+# others left. The bound is approximate when several workers fill the store at once.
+
+
+class ProxyError(Exception):
+    """Raised when an image can not be fetched, the caller should fall back to the original URL."""
+
+
+@dataclass(slots=True, frozen=True)
+class ProxiedImage:
+    path: str
+    content_type: str
+    digest: str
+
+
+def _sha256(value: bytes) -> str:
+    return hashlib.sha256(value).hexdigest()
+
+
+class ProxyCache:
+    """On disk, size bounded LRU cache of third party images, each URL is fetched from upstream once."""
+
+    def __init__(self, folder: str, max_bytes: int = 256 * 1024 * 1024, timeout: float = 10.0,
+                 max_object_bytes: int = 20 * 1024 * 1024):
+        """Creates the cache and reads the objects already on disk.
+
+        :param folder: Folder the images are kept in.
+        :type folder: str
+        :param max_bytes: Total size of the images kept, 0 disables the cache.
+        :type max_bytes: int
+        :param timeout: Seconds to wait for an upstream image.
+        :type timeout: float
+        :param max_object_bytes: Larger images are not cached.
+        :type max_object_bytes: int
+        """
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.max_object_bytes = max_object_bytes
+        self.logger = log("PROXY")
+        self._lock = threading.Lock()
+        self._locks: dict[str, threading.Lock] = {}
+        self._objects: collections.OrderedDict[str, int] = collections.OrderedDict()  # digest -> bytes, oldest first
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.evictions = 0
+        if self.enabled:
+            self._scan()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.folder, "objects", digest)
+
+    def index_path(self, url: str) -> str:
+        return os.path.join(self.folder, "urls", f"{_sha256(url.encode('utf-8'))}.json")
+
+    def get(self, url: str) -> ProxiedImage:
+        """Returns the local copy of an image, fetching it first if it is not in the cache.
+        Only one thread fetches a given URL, the rest wait for it.
+
+        :param url: http or https URL of the image.
+        :type url: str
+        :rtype: ProxiedImage
+        :raises ProxyError: If the image can not be fetched or is not an image.
+        """
+        image = self._lookup(url)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        with self._lock:
+            lock = self._locks.setdefault(url, threading.Lock())
+        with lock:
+            image = self._lookup(url)
+            if image is not None:
+                self.hits += 1
+                return image
+            self.misses += 1
+            try:
+                body, content_type = self._fetch(url)
+                image = self._put(url, body, content_type)
+            except ProxyError:
+                self.failures += 1
+                raise
+            except Exception as e:
+                self.failures += 1
+                raise ProxyError(f"Could not fetch {url}: {e}") from e
+            self.logger.info("Cached %s, %s bytes", url, len(body))
+            return image
+
+    def _lookup(self, url: str):
+        try:
+            with open(self.index_path(url), "rb") as file:
+                entry = json.load(file)
+            path = self.object_path(entry["digest"])
+            stat = os.stat(path)
+            os.utime(path, (time.time(), stat.st_mtime))  # Access time orders the LRU, mtime stays Last-Modified
+        except (OSError, ValueError, KeyError):  # Never fetched, or its object was evicted
+            return None
+        size = stat.st_size
+        with self._lock:
+            if entry["digest"] not in self._objects:  # Written by another worker
+                self.size += size
+            self._objects[entry["digest"]] = size
+            self._objects.move_to_end(entry["digest"])
+        return ProxiedImage(path, entry["content_type"], entry["digest"])
+
+    def _fetch(self, url: str):
+        if urllib.parse.urlsplit(url).scheme not in ("http", "https"):
+            raise ProxyError(f"Not an http image URL: {url}")
+        self.logger.debug("Fetching %s", url)
+        request = urllib.request.Request(url, headers={"User-Agent": "portfolio-proxy"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            content_type = response.headers.get_content_type()
+            if not content_type.startswith("image/"):
+                raise ProxyError(f"{url} is {content_type}, not an image")
+            body = response.read(self.max_object_bytes + 1)
+        if len(body) > self.max_object_bytes:
+            raise ProxyError(f"{url} is over {self.max_object_bytes} bytes")
+        return body, content_type
+
+    def _put(self, url: str, body: bytes, content_type: str) -> ProxiedImage:
+        digest = _sha256(body)
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            self._write(path, body)
+        self._write(self.index_path(url), json.dumps({"digest": digest, "content_type": content_type}).encode("utf-8"))
+        with self._lock:
+            if digest not in self._objects:
+                self.size += len(body)
+            self._objects[digest] = len(body)
+            self._objects.move_to_end(digest)
+            while self.size > self.max_bytes and len(self._objects) > 1:
+                oldest = next(iter(self._objects))
+                self._remove(oldest)
+                self.evictions += 1
+        return ProxiedImage(path, content_type, digest)
+
+    def _remove(self, digest: str):
+        """Forgets and deletes an object, callers hold the lock. Index entries pointing at it become misses."""
+        self.size -= self._objects.pop(digest)
+        try:
+            os.remove(self.object_path(digest))  # Responses already sending it keep their open file
+        except FileNotFoundError:
+            pass
+
+    def _scan(self):
+        folder = os.path.join(self.folder, "objects")
+        if not os.path.isdir(folder):
+            return
+        entries = []
+        for name in os.listdir(folder):
+            if name.endswith(".tmp"):
+                continue
+            stat = os.stat(os.path.join(folder, name))
+            entries.append((stat.st_atime, name, stat.st_size))
+        for _, digest, size in sorted(entries):
+            self._objects[digest] = size
+            self.size += size
+
+    def _write(self, path: str, body: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Readers never see half a file
+        with open(temp, "wb") as file:
+            file.write(body)
+        os.replace(temp, path)
@@ -0,0 +1,292 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+# In process metrics registry exposed in the Prometheus text format at /metrics.
+# With a metrics directory set, every gunicorn worker writes its values to its own file in it
+# and the worker answering /metrics adds up the files of the workers that are still alive.
+# Without one, /metrics shows the values of the process serving it.
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_db_method: ContextVar[Optional[str]] = ContextVar("db_method", default=None)
+
+
+def db_method(func):
+    """Labels the queries run inside the decorated method with its name in the query latency histogram."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _db_method.set(func.__name__)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _db_method.reset(token)
+
+    return wrapper
+
+
+def current_db_method() -> Optional[str]:
+    return _db_method.get()
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, registry: "Registry", name: str, help: str, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _dump(self) -> dict:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "help": self.help,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(key), value] for key, value in self.values.items()],
+        }
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels):
+        """Sets the total directly, for counters mirrored from objects that keep their own totals."""
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = float(value)
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = float(value)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, registry, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        bucket = bisect.bisect_left(self.buckets, value)  # First bucket with le >= value, len(buckets) is +Inf
+        with self.registry.lock:
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bucket] += 1
+            counts[-1] += value  # Last slot holds the sum
+
+    def _dump(self) -> dict:
+        dump = super()._dump()
+        dump["buckets"] = list(self.buckets)
+        return dump
+
+
+class Registry:
+    """Holds the metrics of one process and renders them, merged across workers when a directory is set."""
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0):
+        """Creates the registry.
+
+        :param directory: Directory shared by every worker for their metrics files. None keeps metrics in process.
+        :type directory: str or None
+        :param flush_interval: Least seconds between writes of this worker's metrics file.
+        :type flush_interval: float
+        """
+        self.lock = threading.Lock()
+        self.metrics: dict[str, _Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+        self.configure(directory, flush_interval)
+        os.register_at_fork(after_in_child=self._reset)
+
+    def configure(self, directory: Optional[str], flush_interval: float = 1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._next_flush = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _reset(self):
+        """Drops values copied from the parent so the master's startup queries are not counted by every worker."""
+        self.lock = threading.Lock()
+        self._next_flush = 0.0
+        for metric in self.metrics.values():
+            metric.values = {}
+
+    def _get(self, cls, name, help, labelnames, **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(self, name, help, labelnames, **kwargs)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames=()) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def on_collect(self, collector: Callable[[], None]):
+        """Registers a callable run before every snapshot, used to copy totals kept by other objects into metrics."""
+        self.collectors.append(collector)
+
+    def snapshot(self) -> list[dict]:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception:
+                continue  # A broken collector should not take down /metrics
+        with self.lock:
+            return [metric._dump() for metric in self.metrics.values()]
+
+    def flush(self, force: bool = False):
+        """Writes this worker's metrics file, at most once per flush interval unless forced."""
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now < self._next_flush:
+            return
+        self._next_flush = now + self.flush_interval
+        path = os.path.join(self.directory, f"metrics_{os.getpid()}.json")
+        temp_path = f"{path}.{threading.get_ident()}.tmp"  # Threads never share a temp file
+        with open(temp_path, "w") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(temp_path, path)
+
+    def collect(self) -> list[dict]:
+        """Returns the metrics of every live worker added together."""
+        if not self.directory:
+            return self.snapshot()
+        self.flush(force=True)
+        merged: dict[str, dict] = {}
+        for file_name in os.listdir(self.directory):
+            if not (file_name.startswith("metrics_") and file_name.endswith(".json")):
+                continue
+            path = os.path.join(self.directory, file_name)
+            pid = int(file_name[len("metrics_") : -len(".json")])
+            if not _pid_alive(pid):
+                _remove(path)  # Counters reset when a worker is replaced, Prometheus handles resets
+                continue
+            try:
+                with open(path) as file:
+                    dumps = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for dump in dumps:
+                _merge(merged, dump)
+        return list(merged.values())
+
+    def render(self) -> str:
+        """Renders the merged metrics in the Prometheus text exposition format."""
+        lines = []
+        for dump in sorted(self.collect(), key=lambda dump: dump["name"]):
+            name = dump["name"]
+            lines.append(f"# HELP {name} {dump['help']}")
+            lines.append(f"# TYPE {name} {dump['type']}")
+            for labels, value in sorted(dump["samples"]):
+                label_pairs = list(zip(dump["labelnames"], labels))
+                if dump["type"] != "histogram":
+                    lines.append(f"{name}{_labels(label_pairs)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(dump["buckets"] + ["+Inf"], value[:-1]):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(label_pairs + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(label_pairs)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(label_pairs)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _merge(merged: dict, dump: dict):
+    target = merged.get(dump["name"])
+    if target is None:
+        merged[dump["name"]] = {**dump, "samples": [[labels, value] for labels, value in dump["samples"]]}
+        return
+    samples = {tuple(labels): value for labels, value in target["samples"]}
+    for labels, value in dump["samples"]:
+        key = tuple(labels)
+        if key not in samples:
+            samples[key] = value
+        elif isinstance(value, list):
+            samples[key] = [a + b for a, b in zip(samples[key], value)]
+        else:
+            samples[key] = samples[key] + value
+    target["samples"] = [[list(key), value] for key, value in samples.items()]
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+registry = Registry()
+
+request_duration = registry.histogram(
+    "portfolio_http_request_duration_seconds",
+    "Time taken to answer requests by endpoint and status.",
+    ("endpoint", "status"),
+)
+query_duration = registry.histogram(
+    "portfolio_db_query_duration_seconds",
+    "Time queries ran on their connection by the View_User method that issued them.",
+    ("method",),
+)
+connections_opened = registry.counter(
+    "portfolio_db_connections_opened_total", "New MySQL connections opened.", ("user",)
+)
@@ -0,0 +1,97 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+from utility_classes.custom_logger import log
+
+# Process wide cache of rendered public pages, served to anonymous visitors without touching MySQL or Jinja.
+# Entries are evicted least recently used first once their bodies, compressed copies included, go over max_bytes,
+# and an entry rendered at an older content version is never served.
+
+
+@dataclass(slots=True, frozen=True)
+class CachedPage:
+    """A rendered response, the content version it was rendered at and its compressed bodies."""
+
+    body: bytes
+    status: int
+    headers: tuple
+    version: Any
+    encoded: tuple = ()  # (encoding, body) pairs from compression.compressed_variants
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(body) for _, body in self.encoded)
+
+
+class PageCache:
+    """Byte bounded LRU cache of rendered pages keyed by path."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """Creates the page cache.
+
+        :param max_bytes: Total size of the cached bodies before the least recently used are evicted. 0 disables caching.
+        :type max_bytes: int
+        """
+        self.max_bytes = max_bytes
+        self.logger = log("PAGE CACHE")
+        self._lock = threading.Lock()
+        self._pages: OrderedDict[str, CachedPage] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, key: str, version: Any) -> Optional[CachedPage]:
+        """Returns the page cached under key if it was rendered at version, otherwise None.
+
+        :param key: Request path.
+        :type key: str
+        :param version: Current content version, pages rendered at another version are misses.
+        :rtype: CachedPage or None
+        """
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None or page.version != version:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key: str, page: CachedPage):
+        """Caches a page, evicting the least recently used pages until the cache fits in max_bytes.
+        Pages larger than max_bytes on their own are not cached.
+
+        :param key: Request path.
+        :type key: str
+        :param page: The rendered page.
+        :type page: CachedPage
+        """
+        if page.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._pages.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+            self._pages[key] = page
+            self.size += page.size
+            while self.size > self.max_bytes:
+                _, evicted = self._pages.popitem(last=False)
+                self.size -= evicted.size
+                self.evictions += 1
+
+    def clear(self):
+        """Drops every cached page. Call when the content version changes so old pages free their memory."""
+        with self._lock:
+            if self._pages:
+                self.logger.info("Page cache cleared, %s pages dropped", len(self._pages))
+            self._pages.clear()
+            self.size = 0
@@ -0,0 +1,176 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from flask import g, has_request_context
+
+# Per request database instrumentation.
+# MySQLBase records every query and new connection on the request's QueryStats (kept on flask.g),
+# the app writes the totals into the response log line and the Server-Timing header and checks them against the query budget.
+# Tests use assert_query_budget() to fail when a route issues too many queries or repeats a statement.
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\b\d+\b")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request issues more queries than its budget or repeats the same statement."""
+
+
+def statement_shape(query: str) -> str:
+    """Reduces a query to its shape so the same statement with different values compares equal.
+
+    :param query: SQL query text.
+    :type query: str
+    :return: Query with whitespace collapsed and literals replaced by ?.
+    :rtype: str
+    """
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", query)).strip()
+
+
+class QueryStats:
+    """Queries, database time, new connections and template render time for one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.acquire_time = 0.0
+        self.render_time = 0.0
+        self.connections = 0
+        self.shapes: dict[str, int] = {}
+        self._render_started: Optional[float] = None
+
+    def record_query(self, query: str, elapsed: float, acquire: float = 0.0):
+        self.queries += 1
+        self.db_time += elapsed
+        self.acquire_time += acquire
+        shape = statement_shape(query)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def record_connection(self):
+        self.connections += 1
+
+    def start_render(self):
+        self._render_started = time.perf_counter()
+
+    def finish_render(self):
+        if self._render_started is not None:
+            self.render_time += time.perf_counter() - self._render_started
+            self._render_started = None
+
+    def repeated(self) -> dict[str, int]:
+        """Statement shapes run more than once in the request, the usual sign of an N+1 loop."""
+        return {shape: count for shape, count in self.shapes.items() if count > 1}
+
+    def problems(self, budget: Optional[int] = None, allow_repeats: bool = False) -> list[str]:
+        """Describes every way the request broke its budget. Empty if it did not.
+
+        :param budget: Most queries allowed, None for no limit.
+        :type budget: int or None
+        :param allow_repeats: If False any repeated statement shape is reported.
+        :type allow_repeats: bool
+        :rtype: list[str]
+        """
+        problems = []
+        if budget is not None and self.queries > budget:
+            problems.append(f"{self.queries} queries exceeds budget of {budget}")
+        if not allow_repeats:
+            for shape, count in self.repeated().items():
+                problems.append(f"statement ran {count} times: {shape}")
+        return problems
+
+    def server_timing(self, total: float) -> str:
+        """Builds a Server-Timing header value, durations in milliseconds.
+
+        :param total: Seconds the whole request took.
+        :type total: float
+        :rtype: str
+        """
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries", '
+            f"conn;dur={self.acquire_time * 1000:.2f}, "
+            f"render;dur={self.render_time * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+
+    def __str__(self):
+        return (
+            f"Queries: {self.queries} - DB time: {self.db_time:.3f}s - "
+            f"Connections: {self.connections}"
+        )
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Returns the QueryStats of the current request, creating it on first use. None outside a request."""
+    if not has_request_context():
+        return None
+    if "query_stats" not in g:
+        g.query_stats = QueryStats()
+    return g.query_stats
+
+
+def record_query(query: str, elapsed: float, acquire: float = 0.0):
+    stats = current_stats()
+    if stats is not None:
+        stats.record_query(query, elapsed, acquire)
+
+
+def record_connection():
+    stats = current_stats()
+    if stats is not None:
+        stats.record_connection()
+
+
+def start_render(sender, **extra):  # before_render_template signal receiver
+    stats = current_stats()
+    if stats is not None:
+        stats.start_render()
+
+
+def finish_render(sender, **extra):  # template_rendered signal receiver
+    stats = current_stats()
+    if stats is not None:
+        stats.finish_render()
+
+
+_watchers: list[list] = []
+_watchers_lock = threading.Lock()
+
+
+def finish_request(path: str, stats: QueryStats):
+    """Hands a finished request's stats to every active assert_query_budget block."""
+    with _watchers_lock:
+        for watcher in _watchers:
+            watcher.append((path, stats))
+
+
+@contextmanager
+def assert_query_budget(budget: Optional[int] = None, allow_repeats: bool = False):
+    """Fails with QueryBudgetExceeded if any request made inside the block breaks the budget.
+
+    Usage in tests:
+        with assert_query_budget(2):
+            client.get("/portfolio/design")
+
+    :param budget: Most queries allowed per request, None for no limit.
+    :type budget: int or None
+    :param allow_repeats: If False a request that runs the same statement shape twice fails.
+    :type allow_repeats: bool
+    :return: List of (path, QueryStats) for the requests made inside the block.
+    :raises QueryBudgetExceeded: If a request broke the budget.
+    """
+    requests: list = []
+    with _watchers_lock:
+        _watchers.append(requests)
+    try:
+        yield requests
+    finally:
+        with _watchers_lock:
+            _watchers.remove(requests)
+
+    failures = []
+    for path, stats in requests:
+        failures.extend(f"{path}: {problem}" for problem in stats.problems(budget, allow_repeats))
+    if failures:
+        raise QueryBudgetExceeded("Query budget exceeded:\n" + "\n".join(failures))
@@ -0,0 +1,19 @@
+import re
+
+# URL slugs for category and project titles.
+# Must match the slugify() function in sql-scripts/init-db.sql, which fills the slug columns on write.
+# A title whose slug is already taken is stored with -2, -3, ... added, links use the stored slug.
+
+_NOT_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(title) -> str:
+    """Turns a title into its URL slug. Apostrophes are dropped, every other run of characters
+    outside a-z and 0-9 becomes one hyphen. Slugs are unchanged by slugify, so it also normalizes slugs.
+
+    :param title: Title or slug to convert.
+    :type title: str
+    :return: Lower case slug, e.g. "Witch's Tea Party" becomes "witchs-tea-party".
+    :rtype: str
+    """
+    return _NOT_SLUG.sub("-", str(title).lower().replace("'", "")).strip("-")
@@ -0,0 +1,50 @@
+import hashlib
+import os
+from typing import Optional
+
+# Build free fingerprints for the static folder. Every file is hashed once at startup and url_for('static')
+# adds the hash as ?v=, so a URL only ever serves one version of a file and can be cached for a year.
+
+
+class StaticManifest:
+    """Content hash of every file in the static folder, taken when the manifest is created."""
+
+    def __init__(self, folder: str, length: int = 12):
+        """Hashes the static folder.
+
+        :param folder: Path of the static folder.
+        :type folder: str
+        :param length: Hex characters of each hash used in URLs.
+        :type length: int
+        """
+        self.folder = folder
+        self.hashes: dict[str, str] = {}
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(folder):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith((".gz", ".br")):  # Precompressed siblings are served in place of their file
+                    continue
+                path = os.path.join(root, name)
+                with open(path, "rb") as file:
+                    file_hash = hashlib.sha256(file.read()).hexdigest()[:length]
+                filename = os.path.relpath(path, folder).replace(os.sep, "/")
+                self.hashes[filename] = file_hash
+                digest.update(f"{filename}={file_hash}\0".encode("utf-8"))
+        self.digest = digest.hexdigest()  # Changes whenever any static URL changes
+
+    def hash_for(self, filename: str) -> Optional[str]:
+        """Returns the hash of a static file, or None if it was not in the folder at startup."""
+        return self.hashes.get(filename.lstrip("/"))
+
+    def is_current(self, filename: Optional[str], version: Optional[str]) -> bool:
+        """True if version is the hash of the file being served, so the response can be cached as immutable."""
+        return filename is not None and version is not None and self.hash_for(filename) == version
+
+    def url_defaults(self, endpoint: str, values: dict):
+        """Flask url_defaults callback, adds v=<hash> to every url_for('static') of a known file."""
+        if endpoint != "static" or "v" in values:
+            return
+        file_hash = self.hash_for(values.get("filename", ""))
+        if file_hash is not None:
+            values["v"] = file_hash